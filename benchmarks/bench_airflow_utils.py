@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Benchmark the AirflowUtils request paths against the local fake MWAA and Vault servers.
+
+Each scenario starts cold (Vault client, AWS client pool and secret cache cleared, fake Airflow state reset)
+so the per-operation Vault login and credential mint counts show how well they are amortised.
+
+    python benchmarks/bench_airflow_utils.py --latency 0.05 --output results.json
+    python benchmarks/bench_airflow_utils.py --latency 0.05 --baseline results.json
+
+Results are written as JSON so runs can be compared across commits.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+import httpx
+
+from fakes import FakeServerConstants, create_mwaa_app, create_vault_app, serve, write_local_config
+from utils import CommonUtils, CommonUtilsConstants, RateLimitUtils, configure_logging
+from airflow import AirflowUtils, AirflowSnapshotUtils
+
+ENVIRONMENT = "dev"
+REGION = "us"
+TARGET = FakeServerConstants.FAKE_ENVIRONMENT_NAME.format(index=0)
+RESTORE_TARGET = FakeServerConstants.FAKE_ENVIRONMENT_NAME.format(index=1)
+RESULTS_FORMAT_VERSION = 1
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(percentile / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _succeeded(result: Any) -> bool:
+    """True if a library call reported success"""
+    return isinstance(result, dict) and result.get("status") == CommonUtilsConstants.SUCCESS_KEY
+
+
+def _git_commit() -> Optional[str]:
+    """Current git commit of the project, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Bench:
+    """Fake servers plus the counters needed to attribute calls to a scenario"""
+
+    def __init__(self, mwaa_app, vault_app, mwaa_url: str):
+        self.mwaa_app = mwaa_app
+        self.vault_app = vault_app
+        self.mwaa_url = mwaa_url
+
+    def reset(self) -> None:
+        """Start a scenario cold"""
+        httpx.post(self.mwaa_url + FakeServerConstants.FAKE_RESET_PATH)
+        CommonUtils.reset_vault_client()
+        CommonUtils.clear_client_pool()
+        CommonUtils.invalidate_secret()
+        # Each scenario's MWAA limiter starts at its initial rate, not where the previous scenario left it
+        RateLimitUtils.reset_rate_limiters()
+
+    def counters(self) -> Dict[str, int]:
+        """Snapshot of the server-side call counters"""
+        return {
+            "vault_logins": self.vault_app.state.stats["logins"],
+            "credential_mints": self.vault_app.state.stats["credential_mints"],
+            "mwaa_calls": sum(self.mwaa_app.state.stats[name] for name in
+                              ("list_environments", "get_environment", "invoke_rest_api")),
+            "throttled": self.mwaa_app.state.stats["throttled"],
+        }
+
+    def run(self, name: str, operation: Callable[[], Any], iterations: int, items_per_operation: int = 1,
+            setup: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+        """
+        Time `iterations` calls of operation, then repeat one call under tracemalloc for peak memory
+
+        Returns:
+            dict: Throughput, latency percentiles, per-operation call counts and peak memory
+        """
+        self.reset()
+        if setup:
+            setup()
+        before = self.counters()
+        latencies, failures = [], 0
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call_started = time.perf_counter()
+            if not _succeeded(operation()):
+                failures += 1
+            latencies.append(time.perf_counter() - call_started)
+        elapsed = time.perf_counter() - started
+        after = self.counters()
+
+        tracemalloc.start()
+        operation()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        per_op = {key: round((after[key] - before[key]) / iterations, 3) for key in after}
+        latencies_ms = [latency * 1000 for latency in latencies]
+        return {
+            "operations": iterations,
+            "items_per_operation": items_per_operation,
+            "failures": failures,
+            "elapsed_seconds": round(elapsed, 4),
+            "throughput_ops_per_second": round(iterations / elapsed, 2),
+            "throughput_items_per_second": round(iterations * items_per_operation / elapsed, 2),
+            "latency_ms": {
+                "p50": round(_percentile(latencies_ms, 50), 3),
+                "p95": round(_percentile(latencies_ms, 95), 3),
+                "p99": round(_percentile(latencies_ms, 99), 3),
+                "mean": round(statistics.fmean(latencies_ms), 3),
+                "max": round(max(latencies_ms), 3),
+            },
+            "vault_logins_per_operation": per_op["vault_logins"],
+            "credential_mints_per_operation": per_op["credential_mints"],
+            "mwaa_calls_per_operation": per_op["mwaa_calls"],
+            "throttled_per_operation": per_op["throttled"],
+            "peak_memory_kb": round(peak_bytes / 1024, 1),
+        }
+
+
+def run_scenarios(bench: Bench, args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    """Run the selected scenarios and return their results by name"""
+    variables = {f"bench_variable_{index}": {"index": index, "payload": "x" * 64} for index in range(args.bulk_size)}
+    connections = {
+        str(index): {"conn_type": "postgres", "host": f"db{index}.example.com", "port": 5432,
+                     "login": "bench", "password": "secret", "schema": "public"}
+        for index in range(args.bulk_size)
+    }
+    snapshot_path = os.path.join(args.work_dir, "bench_snapshot.jsonl.gz")
+    counter = iter(range(10 ** 9))
+
+    def push_variables():
+        return AirflowUtils.bulk_create_variables(variables, ENVIRONMENT, REGION, TARGET,
+                                                  max_in_flight=args.concurrency)
+
+    def connection_batch(prefix: str = "bench_connection") -> Dict[str, Dict[str, Any]]:
+        # Airflow rejects re-creating an existing connection with 409, so repeated pushes use fresh IDs
+        return {f"{prefix}_{suffix}": connection for suffix, connection in connections.items()}
+
+    def push_connections(prefix: str = "bench_connection"):
+        return AirflowUtils.bulk_create_connections(connection_batch(prefix), ENVIRONMENT, REGION, TARGET,
+                                                    max_workers=args.concurrency)
+
+    def snapshot_round_trip():
+        exported = AirflowSnapshotUtils.export_snapshot(ENVIRONMENT, REGION, TARGET, snapshot_path)
+        if not _succeeded(exported):
+            return exported
+        return AirflowSnapshotUtils.import_snapshot(snapshot_path, ENVIRONMENT, REGION, RESTORE_TARGET,
+                                                    max_in_flight=args.concurrency)
+
+    scenarios = {
+        "list_all_mwaa_environments": dict(
+            operation=lambda: AirflowUtils.list_all_mwaa_environments(ENVIRONMENT, REGION,
+                                                                      max_workers=args.concurrency),
+            iterations=args.iterations, items_per_operation=args.environments),
+        "create_variable": dict(
+            operation=lambda: AirflowUtils.create_variable(f"bench_key_{next(counter)}", "value", ENVIRONMENT,
+                                                           REGION, TARGET),
+            iterations=args.iterations),
+        "create_connection": dict(
+            operation=lambda: AirflowUtils.create_connection(
+                f"bench_conn_{next(counter)}", "postgres", "benchmark", "db.example.com", "bench", "secret",
+                "public", 5432, "", ENVIRONMENT, REGION, TARGET),
+            iterations=args.iterations),
+        "bulk_create_variables": dict(
+            operation=push_variables, iterations=args.bulk_iterations, items_per_operation=args.bulk_size),
+        "bulk_create_connections": dict(
+            operation=lambda: push_connections(f"bulk_{next(counter)}"), iterations=args.bulk_iterations,
+            items_per_operation=args.bulk_size),
+        "sync_variables_unchanged": dict(
+            operation=lambda: AirflowUtils.sync_variables(variables, ENVIRONMENT, REGION, TARGET,
+                                                          max_workers=args.concurrency),
+            setup=push_variables, iterations=args.bulk_iterations, items_per_operation=args.bulk_size),
+        "sync_connections_unchanged": dict(
+            operation=lambda: AirflowUtils.sync_connections(connection_batch(), ENVIRONMENT, REGION, TARGET,
+                                                            max_workers=args.concurrency),
+            setup=push_connections, iterations=args.bulk_iterations, items_per_operation=args.bulk_size),
+        "snapshot_round_trip": dict(
+            operation=snapshot_round_trip, setup=push_variables, iterations=args.bulk_iterations, items_per_operation=args.bulk_size),
+    }
+
+    selected = args.scenarios or list(scenarios)
+    unknown = set(selected) - set(scenarios)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in selected:
+        print(f"Running {name}...", file=sys.stderr)
+        results[name] = bench.run(name, **scenarios[name])
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print throughput and p95 changes against a baseline results file"""
+    print(f"\nComparison against {baseline['meta'].get('git_commit')} ({baseline['meta'].get('timestamp')})")
+    print(f"{'scenario':32} {'ops/s':>10} {'Δ':>8} {'p95 ms':>10} {'Δ':>8}")
+    for name, current in results["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if not previous:
+            continue
+        ops, previous_ops = current["throughput_ops_per_second"], previous["throughput_ops_per_second"]
+        p95, previous_p95 = current["latency_ms"]["p95"], previous["latency_ms"]["p95"]
+        print(f"{name:32} {ops:>10.2f} {(ops / previous_ops - 1) * 100 if previous_ops else 0:>+7.1f}% "
+              f"{p95:>10.2f} {(p95 / previous_p95 - 1) * 100 if previous_p95 else 0:>+7.1f}%")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark AirflowUtils against local fake MWAA and Vault servers")
+    parser.add_argument("--latency", type=float, default=0.02, help="Injected MWAA latency per call in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random MWAA latency per call in seconds")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of MWAA calls throttled")
+    parser.add_argument("--environments", type=int, default=20, help="Number of fake MWAA environments")
+    parser.add_argument("--iterations", type=int, default=20, help="Calls per single-request scenario")
+    parser.add_argument("--bulk-size", type=int, default=200, help="Items per bulk/sync operation")
+    parser.add_argument("--bulk-iterations", type=int, default=3, help="Calls per bulk/sync scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="max_workers / max_in_flight for fan-out paths")
+    parser.add_argument("--log-level", default="OFF", help="Library log level during the run (default: OFF)")
+    parser.add_argument("--scenarios", nargs="*", help="Scenarios to run (default: all)")
+    parser.add_argument("--output", help="Write results JSON to this path (default: stdout)")
+    parser.add_argument("--baseline", help="Results JSON from an earlier run to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    configure_logging(level=args.log_level, stream=sys.stderr)
+    mwaa_app = create_mwaa_app(environment_count=max(args.environments, 2), faults={
+        FakeServerConstants.LATENCY_SECONDS_KEY: args.latency,
+        FakeServerConstants.LATENCY_JITTER_SECONDS_KEY: args.jitter,
+        FakeServerConstants.THROTTLE_RATE_KEY: args.throttle_rate,
+    })
+    vault_app = create_vault_app()
+
+    previous_config = os.environ.get(CommonUtilsConstants.CONFIG_FILE_PATH_ENV)
+    with tempfile.TemporaryDirectory() as work_dir, serve(mwaa_app) as mwaa_url, serve(vault_app) as vault_url:
+        args.work_dir = work_dir
+        os.environ[CommonUtilsConstants.CONFIG_FILE_PATH_ENV] = write_local_config(
+            os.path.join(work_dir, "config.json"), mwaa_url, vault_url, environment=ENVIRONMENT, region=REGION
+        )
+        try:
+            CommonUtils.get_config(force_reload=True)
+            scenarios = run_scenarios(Bench(mwaa_app, vault_app, mwaa_url), args)
+        finally:
+            if previous_config is None:
+                os.environ.pop(CommonUtilsConstants.CONFIG_FILE_PATH_ENV, None)
+            else:
+                os.environ[CommonUtilsConstants.CONFIG_FILE_PATH_ENV] = previous_config
+            CommonUtils.reset_vault_client()
+            CommonUtils.clear_client_pool()
+
+    results = {
+        "meta": {
+            "format_version": RESULTS_FORMAT_VERSION,
+            "git_commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {key: value for key, value in vars(args).items()
+                           if key not in ("output", "baseline", "work_dir")},
+        },
+        "scenarios": scenarios,
+    }
+
+    document = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(document + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(document)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            compare(results, json.load(baseline_file))
+    return results
+
+
+if __name__ == "__main__":
+    main()
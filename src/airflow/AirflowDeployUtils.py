@@ -0,0 +1,487 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+AirflowDeployUtils.py - Deploy DAGs, plugins and requirements to the S3 source bucket of an MWAA environment
+Tech Description: Delta sync of a local DAG tree to the environment's DagS3Path. Local files are hashed
+                  (MD5 and, above the multipart threshold, the multipart ETag S3 would compute) and compared
+                  against the object listing; a manifest kept in the bucket (outside DagS3Path) maps remote
+                  ETags to content hashes, so objects whose ETag is not an MD5 (SSE-KMS buckets) are not
+                  re-uploaded either. Only changed files are uploaded, concurrently and with multipart
+                  transfers for large files, and objects no longer present locally are deleted in batches.
+                  plugins.zip is built deterministically (sorted entries, fixed timestamps and permissions)
+                  and, like requirements.txt, identified by a SHA-256 of its content stored as object
+                  metadata; when the object version the environment points to already holds that content,
+                  both the upload and the (20+ minute) UpdateEnvironment are skipped.
+Pre_requisites: Requires AirflowUtilsConstants.py, CommonUtils.py and DLPLogSetup.py
+"""
+
+import base64
+import fnmatch
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils import CommonUtils, CommonUtilsConstants
+from utils.DLPLogSetup import get_logger
+from . import AirflowUtilsConstants
+
+logger = get_logger(__name__)
+
+
+def _source_location(mwaa_client, airflow_environment_name: str) -> Tuple[str, Dict[str, Any]]:
+    """Return (bucket name, Environment structure) of an MWAA environment"""
+    environment = mwaa_client.get_environment(Name=airflow_environment_name)[AirflowUtilsConstants.ENVIRONMENT_KEY]
+    bucket_arn = environment.get(AirflowUtilsConstants.SOURCE_BUCKET_ARN_KEY) or ""
+    if not bucket_arn.startswith(AirflowUtilsConstants.S3_ARN_PREFIX):
+        raise Exception(f"Environment {airflow_environment_name} has no source bucket: {bucket_arn!r}")
+    return bucket_arn[len(AirflowUtilsConstants.S3_ARN_PREFIX):], environment
+
+
+def _manifest_key(prefix: str) -> str:
+    """S3 key of the deploy manifest for the objects under prefix (kept outside every MWAA-synced path)"""
+    return f"{AirflowUtilsConstants.DEPLOY_MANIFEST_PREFIX}{prefix.strip('/') or 'root'}.json"
+
+
+def _excluded(relative_path: str, patterns: List[str]) -> bool:
+    """True if any component of the path matches an exclude pattern"""
+    return any(fnmatch.fnmatch(part, pattern) for part in relative_path.split("/") for pattern in patterns)
+
+
+def _iter_local_files(local_dir: str, patterns: List[str]) -> Iterator[Tuple[str, str]]:
+    """Yield (relative POSIX path, absolute path) for every non-excluded file, in sorted order"""
+    for root, dirs, files in os.walk(local_dir):
+        relative_root = os.path.relpath(root, local_dir).replace(os.sep, "/")
+        relative_root = "" if relative_root == "." else f"{relative_root}/"
+        dirs[:] = sorted(name for name in dirs if not _excluded(relative_root + name, patterns))
+        for name in sorted(files):
+            if not _excluded(relative_root + name, patterns):
+                yield relative_root + name, os.path.join(root, name)
+
+
+def _hash_file(path: str) -> Dict[str, Any]:
+    """
+    MD5 of a file and the ETag S3 gives it when uploaded with the configured multipart settings
+
+    Returns:
+        dict: {"path", "size", "md5", "etag"}
+    """
+    size = os.path.getsize(path)
+    md5 = hashlib.md5()
+    part_digests = []
+    part = hashlib.md5()
+    part_size = 0
+    with open(path, "rb") as source:
+        while True:
+            block = source.read(AirflowUtilsConstants.FILE_HASH_READ_SIZE)
+            if not block:
+                break
+            md5.update(block)
+            while block:
+                take = block[:AirflowUtilsConstants.S3_MULTIPART_CHUNKSIZE - part_size]
+                part.update(take)
+                part_size += len(take)
+                block = block[len(take):]
+                if part_size == AirflowUtilsConstants.S3_MULTIPART_CHUNKSIZE:
+                    part_digests.append(part.digest())
+                    part, part_size = hashlib.md5(), 0
+    if part_size:
+        part_digests.append(part.digest())
+
+    etag = md5.hexdigest()
+    if size >= AirflowUtilsConstants.S3_MULTIPART_THRESHOLD:
+        etag = f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+    return {"path": path, "size": size, "md5": md5.hexdigest(), "etag": etag}
+
+
+def _list_objects(s3_client, bucket: str, prefix: str) -> Dict[str, Dict[str, Any]]:
+    """Return {key relative to prefix: {"etag", "size"}} for every object under prefix"""
+    objects = {}
+    for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+        for item in page.get("Contents", []):
+            objects[item["Key"][len(prefix):]] = {"etag": item["ETag"].strip('"'), "size": item["Size"]}
+    return objects
+
+
+def _read_manifest(s3_client, bucket: str, key: str) -> Dict[str, Dict[str, Any]]:
+    """Return the files section of a deploy manifest, or {} when there is none"""
+    from botocore.exceptions import ClientError
+
+    try:
+        document = json.load(s3_client.get_object(Bucket=bucket, Key=key)["Body"])
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in AirflowUtilsConstants.S3_NOT_FOUND_ERROR_CODES:
+            return {}
+        raise
+    if document.get("version") != AirflowUtilsConstants.DEPLOY_MANIFEST_VERSION:
+        return {}
+    return document.get("files", {})
+
+
+def _unchanged(local: Dict[str, Any], remote: Optional[Dict[str, Any]],
+               recorded: Optional[Dict[str, Any]]) -> bool:
+    """True if the remote object already holds the local content"""
+    if remote is None or remote["size"] != local["size"]:
+        return False
+    if remote["etag"] == local["etag"]:
+        return True
+    return bool(recorded) and recorded.get("etag") == remote["etag"] and recorded.get("md5") == local["md5"]
+
+
+def _upload(s3_client, bucket: str, key: str, local: Dict[str, Any], transfer_config) -> str:
+    """Upload one file (multipart above the threshold) and return the ETag S3 assigned"""
+    if local["size"] < AirflowUtilsConstants.S3_MULTIPART_THRESHOLD:
+        with open(local["path"], "rb") as body:
+            response = s3_client.put_object(
+                Bucket=bucket, Key=key, Body=body,
+                ContentMD5=base64.b64encode(bytes.fromhex(local["md5"])).decode("ascii")
+            )
+        return response["ETag"].strip('"')
+    s3_client.upload_file(local["path"], bucket, key, Config=transfer_config)
+    return s3_client.head_object(Bucket=bucket, Key=key)["ETag"].strip('"')
+
+
+def _delete(s3_client, bucket: str, keys: List[str]) -> List[str]:
+    """Delete keys in DeleteObjects batches and return the keys S3 reported as failed"""
+    failed = []
+    for start in range(0, len(keys), AirflowUtilsConstants.S3_DELETE_BATCH_SIZE):
+        batch = keys[start:start + AirflowUtilsConstants.S3_DELETE_BATCH_SIZE]
+        response = s3_client.delete_objects(
+            Bucket=bucket, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+        )
+        failed.extend(error["Key"] for error in response.get("Errors", []))
+    return failed
+
+
+def sync_dags(
+    local_dir: str,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    delete_stale: bool = True,
+    dry_run: bool = False,
+    max_workers: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    exclude: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Make the DAG folder of an MWAA environment's source bucket match a local DAG tree
+
+    The bucket and DagS3Path come from get_environment. Files whose content is already in S3
+    (by ETag, or by the hash recorded in the deploy manifest) are skipped, so a push of a large
+    repository with few changes uploads only those few files.
+
+    Args:
+        local_dir (str): Local DAG folder (its contents map to DagS3Path)
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        airflow_environment_name (str): MWAA environment name
+        delete_stale (bool): Delete objects under DagS3Path that no longer exist locally
+        dry_run (bool): Compute and report the changes without applying them
+        max_workers (int): Maximum concurrent hashes and uploads
+        exclude (list): fnmatch patterns for path components to skip (default: DAG_SYNC_EXCLUDE_PATTERNS)
+
+    Returns:
+        dict: {"status", "result": {"bucket", "prefix", "uploaded", "deleted", "unchanged", "failed",
+               "bytes_uploaded", "dry_run", "elapsed_seconds"}, "error"}
+    """
+    started = time.perf_counter()
+    try:
+        if not os.path.isdir(local_dir):
+            raise Exception(f"DAG folder {local_dir} does not exist")
+        patterns = AirflowUtilsConstants.DAG_SYNC_EXCLUDE_PATTERNS if exclude is None else exclude
+
+        mwaa_client = CommonUtils.get_boto3_client(AirflowUtilsConstants.MWAA_KEY, environment, region)
+        s3_client = CommonUtils.get_boto3_client(AirflowUtilsConstants.S3_KEY, environment, region)
+        bucket, mwaa_environment = _source_location(mwaa_client, airflow_environment_name)
+        prefix = (mwaa_environment.get(AirflowUtilsConstants.DAG_S3_PATH_KEY)
+                  or AirflowUtilsConstants.DAG_S3_PATH).strip("/") + "/"
+        manifest_key = _manifest_key(prefix)
+        logger.info("Syncing %s to s3://%s/%s", local_dir, bucket, prefix)
+
+        local_files = dict(_iter_local_files(local_dir, patterns))
+        hashes = dict(zip(local_files, CommonUtils.bounded_map(_hash_file, local_files.values(), max_workers)))
+        remote = _list_objects(s3_client, bucket, prefix)
+        recorded = _read_manifest(s3_client, bucket, manifest_key)
+
+        uploads = [path for path, local in hashes.items()
+                   if not _unchanged(local, remote.get(path), recorded.get(path))]
+        deletes = sorted(set(remote) - set(hashes)) if delete_stale else []
+        failed = []
+        # ETags known to hold the local content: unchanged files now, successful uploads below
+        etags = {path: remote[path]["etag"] for path in hashes if path in remote and path not in uploads}
+
+        if not dry_run and (uploads or deletes):
+            from boto3.s3.transfer import TransferConfig
+
+            transfer_config = TransferConfig(
+                multipart_threshold=AirflowUtilsConstants.S3_MULTIPART_THRESHOLD,
+                multipart_chunksize=AirflowUtilsConstants.S3_MULTIPART_CHUNKSIZE,
+                max_concurrency=AirflowUtilsConstants.S3_TRANSFER_MAX_CONCURRENCY
+            )
+
+            def upload(path: str) -> Tuple[str, Optional[str], Optional[str]]:
+                try:
+                    return path, _upload(s3_client, bucket, prefix + path, hashes[path], transfer_config), None
+                except Exception as ex:
+                    return path, None, str(ex)
+
+            for path, etag, error in CommonUtils.bounded_map(upload, uploads, max_workers):
+                if error is None:
+                    etags[path] = etag
+                else:
+                    logger.error("Failed to upload %s: %s", path, error)
+                    failed.append({"path": path, "error": error})
+            failed.extend({"path": key[len(prefix):], "error": "delete failed"}
+                          for key in _delete(s3_client, bucket, [prefix + path for path in deletes]))
+
+        manifest = {path: {"md5": local["md5"], "size": local["size"], "etag": etags[path]}
+                    for path, local in hashes.items() if path in etags}
+        # A failed upload keeps its previous entry, which still describes the object left in S3
+        manifest.update({path: recorded[path] for path in uploads if path not in etags and path in recorded})
+        if not dry_run and manifest != recorded:
+            s3_client.put_object(Bucket=bucket, Key=manifest_key, Body=json.dumps({
+                "version": AirflowUtilsConstants.DEPLOY_MANIFEST_VERSION, "files": manifest
+            }, sort_keys=True).encode("utf-8"))
+
+        failed_paths = {item["path"] for item in failed}
+        logger.info("DAG sync of %s: %d uploaded, %d deleted, %d unchanged, %d failed",
+                    airflow_environment_name, len(uploads), len(deletes), len(hashes) - len(uploads), len(failed))
+        return {
+            "status": CommonUtilsConstants.SUCCESS_KEY if not failed else CommonUtilsConstants.FAILED_KEY,
+            "result": {
+                "bucket": bucket,
+                "prefix": prefix,
+                "uploaded": uploads,
+                "deleted": deletes,
+                "unchanged": len(hashes) - len(uploads),
+                "failed": failed,
+                "bytes_uploaded": 0 if dry_run else sum(
+                    hashes[path]["size"] for path in uploads if path not in failed_paths),
+                "dry_run": dry_run,
+                "elapsed_seconds": round(time.perf_counter() - started, 3)
+            },
+            "error": None if not failed else f"{len(failed)} DAG files failed to sync"
+        }
+
+    except Exception as ex:
+        logger.error("Unable to sync DAGs to %s: %s", airflow_environment_name, ex)
+        return {
+            "status": CommonUtilsConstants.FAILED_KEY,
+            "result": None,
+            "error": str(ex)
+        }
+
+
+
+def build_plugins_zip(plugins_dir: str, output_path: str, exclude: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Build a reproducible plugins.zip: the same files always give the same bytes and content hash
+
+    Entries are added in sorted order with a fixed timestamp, permissions and compression level. The
+    content hash covers each entry's path and SHA-256, so it does not depend on the zlib build.
+
+    Args:
+        plugins_dir (str): Local plugins folder (its contents become the zip root)
+        output_path (str): Where to write the zip
+        exclude (list): fnmatch patterns for path components to skip (default: DAG_SYNC_EXCLUDE_PATTERNS)
+
+    Returns:
+        dict: {"path", "sha256", "size", "files"}
+    """
+    if not os.path.isdir(plugins_dir):
+        raise Exception(f"Plugins folder {plugins_dir} does not exist")
+    patterns = AirflowUtilsConstants.DAG_SYNC_EXCLUDE_PATTERNS if exclude is None else exclude
+    content_hash = hashlib.sha256()
+    files = 0
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED,
+                         compresslevel=AirflowUtilsConstants.PLUGINS_ZIP_COMPRESS_LEVEL) as archive:
+        for relative_path, path in _iter_local_files(plugins_dir, patterns):
+            entry = zipfile.ZipInfo(relative_path, date_time=AirflowUtilsConstants.PLUGINS_ZIP_DATE_TIME)
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            entry.create_system = 3
+            entry.external_attr = (0o100000 | AirflowUtilsConstants.PLUGINS_ZIP_FILE_MODE) << 16
+            file_hash = hashlib.sha256()
+            with open(path, "rb") as source, archive.open(entry, "w", force_zip64=True) as target:
+                for block in iter(lambda: source.read(AirflowUtilsConstants.FILE_HASH_READ_SIZE), b""):
+                    file_hash.update(block)
+                    target.write(block)
+            content_hash.update(f"{relative_path}\0{file_hash.hexdigest()}\n".encode("utf-8"))
+            files += 1
+    return {"path": output_path, "sha256": content_hash.hexdigest(), "size": os.path.getsize(output_path),
+            "files": files}
+
+
+def _hash_artifact(path: str) -> Dict[str, Any]:
+    """Content hash of a file artifact such as requirements.txt: {"path", "sha256", "size"}"""
+    if not os.path.isfile(path):
+        raise Exception(f"File {path} does not exist")
+    content_hash = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(AirflowUtilsConstants.FILE_HASH_READ_SIZE), b""):
+            content_hash.update(block)
+    return {"path": path, "sha256": content_hash.hexdigest(), "size": os.path.getsize(path)}
+
+
+def _head_object(s3_client, bucket: str, key: str, version_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """HeadObject of a key (or one version of it), None when it does not exist"""
+    from botocore.exceptions import ClientError
+
+    try:
+        if version_id:
+            return s3_client.head_object(Bucket=bucket, Key=key, VersionId=version_id)
+        return s3_client.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in AirflowUtilsConstants.S3_NOT_FOUND_ERROR_CODES:
+            return None
+        raise
+
+
+def _upload_artifact(s3_client, bucket: str, key: str, artifact: Dict[str, Any], transfer_config) -> str:
+    """Upload an artifact with its content hash as metadata and return the new object version"""
+    metadata = {AirflowUtilsConstants.ARTIFACT_HASH_METADATA_KEY: artifact["sha256"]}
+    if artifact["size"] < AirflowUtilsConstants.S3_MULTIPART_THRESHOLD:
+        with open(artifact["path"], "rb") as body:
+            version_id = s3_client.put_object(
+                Bucket=bucket, Key=key, Body=body, Metadata=metadata,
+                ContentMD5=base64.b64encode(bytes.fromhex(_hash_file(artifact["path"])["md5"])).decode("ascii")
+            ).get("VersionId")
+    else:
+        s3_client.upload_file(artifact["path"], bucket, key, ExtraArgs={"Metadata": metadata},
+                              Config=transfer_config)
+        version_id = s3_client.head_object(Bucket=bucket, Key=key).get("VersionId")
+    if not version_id or version_id == "null":
+        raise Exception(f"Bucket {bucket} must have versioning enabled to deploy {key}")
+    return version_id
+
+
+def _deploy_artifact(s3_client, bucket: str, mwaa_environment: Dict[str, Any], path_key: str, version_key: str,
+                     default_path: str, artifact: Dict[str, Any], dry_run: bool, transfer_config) -> Dict[str, Any]:
+    """
+    Make sure the environment points at an object version holding the artifact's content
+
+    Returns:
+        dict: {"key", "version", "sha256", "action"}; action is "unchanged" (the current version already
+              matches), "reused" (the latest object matches but the environment points elsewhere) or
+              "uploaded"; version is None for a dry-run upload
+    """
+    key = mwaa_environment.get(path_key) or default_path
+    current_version = mwaa_environment.get(version_key)
+    hash_key = AirflowUtilsConstants.ARTIFACT_HASH_METADATA_KEY
+    outcome = {"key": key, "version": None, "sha256": artifact["sha256"], "action": "uploaded"}
+
+    if current_version and mwaa_environment.get(path_key) == key:
+        head = _head_object(s3_client, bucket, key, current_version)
+        if head and head.get("Metadata", {}).get(hash_key) == artifact["sha256"]:
+            return dict(outcome, version=current_version, action="unchanged")
+    head = _head_object(s3_client, bucket, key)
+    if head and head.get("Metadata", {}).get(hash_key) == artifact["sha256"] and head.get("VersionId"):
+        return dict(outcome, version=head["VersionId"], action="reused")
+    if not dry_run:
+        outcome["version"] = _upload_artifact(s3_client, bucket, key, artifact, transfer_config)
+    return outcome
+
+
+def deploy_artifacts(
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    plugins_dir: Optional[str] = None,
+    requirements_file: Optional[str] = None,
+    update_environment: bool = True,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Deploy plugins.zip and/or requirements.txt and point the MWAA environment at them
+
+    Each artifact is identified by a SHA-256 of its content. If the object version the environment
+    already uses has that hash, nothing is uploaded and the environment is not updated; if only the
+    latest object matches (e.g. a previous update was skipped) it is reused without uploading.
+    UpdateEnvironment is called once, with just the changed PluginsS3Path/RequirementsS3Path fields.
+
+    Args:
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        airflow_environment_name (str): MWAA environment name
+        plugins_dir (str): Local plugins folder to zip (skipped when None)
+        requirements_file (str): Local requirements.txt (skipped when None)
+        update_environment (bool): Call UpdateEnvironment when an artifact changed
+        dry_run (bool): Report what would change without uploading or updating
+
+    Returns:
+        dict: {"status", "result": {"bucket", "plugins", "requirements", "update_fields",
+               "environment_updated", "dry_run", "elapsed_seconds"}, "error"}
+    """
+    started = time.perf_counter()
+    try:
+        if plugins_dir is None and requirements_file is None:
+            raise Exception("Nothing to deploy: pass plugins_dir and/or requirements_file")
+
+        mwaa_client = CommonUtils.get_boto3_client(AirflowUtilsConstants.MWAA_KEY, environment, region)
+        s3_client = CommonUtils.get_boto3_client(AirflowUtilsConstants.S3_KEY, environment, region)
+        bucket, mwaa_environment = _source_location(mwaa_client, airflow_environment_name)
+
+        from boto3.s3.transfer import TransferConfig
+
+        transfer_config = TransferConfig(
+            multipart_threshold=AirflowUtilsConstants.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=AirflowUtilsConstants.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=AirflowUtilsConstants.S3_TRANSFER_MAX_CONCURRENCY
+        )
+        outcomes: Dict[str, Optional[Dict[str, Any]]] = {"plugins": None, "requirements": None}
+        update_fields: Dict[str, str] = {}
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            artifacts = []
+            if plugins_dir is not None:
+                plugins = build_plugins_zip(plugins_dir, os.path.join(work_dir, "plugins.zip"))
+                artifacts.append(("plugins", AirflowUtilsConstants.PLUGINS_S3_PATH_KEY,
+                                  AirflowUtilsConstants.PLUGINS_S3_OBJECT_VERSION_KEY,
+                                  AirflowUtilsConstants.PLUGINS_ZIP_S3_PATH, plugins))
+            if requirements_file is not None:
+                artifacts.append(("requirements", AirflowUtilsConstants.REQUIREMENTS_S3_PATH_KEY,
+                                  AirflowUtilsConstants.REQUIREMENTS_S3_OBJECT_VERSION_KEY,
+                                  AirflowUtilsConstants.REQUIREMENTS_S3_PATH, _hash_artifact(requirements_file)))
+
+            for name, path_key, version_key, default_path, artifact in artifacts:
+                outcome = _deploy_artifact(s3_client, bucket, mwaa_environment, path_key, version_key,
+                                           default_path, artifact, dry_run, transfer_config)
+                outcomes[name] = outcome
+                logger.info("%s of %s: %s (s3://%s/%s)", name, airflow_environment_name, outcome["action"],
+                            bucket, outcome["key"])
+                if outcome["action"] != "unchanged":
+                    update_fields[path_key] = outcome["key"]
+                    if outcome["version"]:
+                        update_fields[version_key] = outcome["version"]
+
+        environment_updated = False
+        if update_fields and update_environment and not dry_run:
+            mwaa_client.update_environment(Name=airflow_environment_name, **update_fields)
+            environment_updated = True
+            logger.info("Updated %s with %s", airflow_environment_name, sorted(update_fields))
+
+        return {
+            "status": CommonUtilsConstants.SUCCESS_KEY,
+            "result": {
+                "bucket": bucket,
+                "plugins": outcomes["plugins"],
+                "requirements": outcomes["requirements"],
+                "update_fields": update_fields,
+                "environment_updated": environment_updated,
+                "dry_run": dry_run,
+                "elapsed_seconds": round(time.perf_counter() - started, 3)
+            },
+            "error": None
+        }
+
+    except Exception as ex:
+        logger.error("Unable to deploy artifacts to %s: %s", airflow_environment_name, ex)
+        return {
+            "status": CommonUtilsConstants.FAILED_KEY,
+            "result": None,
+            "error": str(ex)
+        }
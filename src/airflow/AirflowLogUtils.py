@@ -0,0 +1,218 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+AirflowLogUtils.py - Read and tail the CloudWatch logs of an MWAA environment
+Tech Description: Resolves the Task, Scheduler, DAGProcessing, WebServer and Worker log groups (LOG_GROUPS)
+                  from the LoggingConfiguration returned by get_environment and reads them in parallel with
+                  filter_log_events, one thread per group. Events are handed to the caller through a bounded
+                  queue, so a generator over hours of logs holds at most LOG_EVENTS_BUFFER_SIZE events however
+                  fast the groups are read. In follow mode each group keeps polling, re-reading a short
+                  ingestion-lag window behind the newest event; the ids of the events emitted in that
+                  window are kept per log stream and re-read events with those ids are dropped, so late
+                  events (even with older timestamps), new streams and events sharing a timestamp are
+                  neither repeated nor lost.
+Pre_requisites: Requires AirflowUtils.py, AirflowUtilsConstants.py, CommonUtils.py and DLPLogSetup.py
+"""
+
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from utils import CommonUtils
+from utils.DLPLogSetup import get_logger
+from . import AirflowUtils, AirflowUtilsConstants
+
+logger = get_logger(__name__)
+
+# Queue item marking the end of one log group's events
+_GROUP_DONE = object()
+
+
+def _epoch_millis(value: Union[int, float, datetime]) -> int:
+    """CloudWatch timestamp (milliseconds since the epoch) of a datetime or an epoch-milliseconds number"""
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+def _log_group_name(arn: str) -> str:
+    """Log group name of a log group ARN (with or without the trailing ":*")"""
+    name = arn.split(AirflowUtilsConstants.LOG_GROUP_ARN_SEPARATOR, 1)[-1]
+    return name[:-2] if name.endswith(":*") else name
+
+
+def resolve_log_groups(mwaa_client, airflow_environment_name: str,
+                       groups: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Return {group: CloudWatch log group name} for the enabled log groups of an environment
+
+    Args:
+        mwaa_client: boto3 MWAA client
+        airflow_environment_name (str): MWAA environment name
+        groups (list): Entries of LOG_GROUPS to resolve (default: all)
+    """
+    environment = mwaa_client.get_environment(Name=airflow_environment_name)[AirflowUtilsConstants.ENVIRONMENT_KEY]
+    logging_configuration = environment.get(AirflowUtilsConstants.LOGGING_CONFIGURATION_KEY) or {}
+    log_groups = {}
+    for group in groups or AirflowUtilsConstants.LOG_GROUPS:
+        if group not in AirflowUtilsConstants.LOG_GROUP_CONFIGURATION_KEYS:
+            raise Exception(f"Invalid log group: {group}. Valid values: {AirflowUtilsConstants.LOG_GROUPS}")
+        settings = logging_configuration.get(AirflowUtilsConstants.LOG_GROUP_CONFIGURATION_KEYS[group]) or {}
+        arn = settings.get(AirflowUtilsConstants.CLOUDWATCH_LOG_GROUP_ARN_KEY)
+        if settings.get(AirflowUtilsConstants.LOG_ENABLED_KEY) and arn:
+            log_groups[group] = _log_group_name(arn)
+        else:
+            logger.warning("%s logs are not enabled for %s", group, airflow_environment_name)
+    return log_groups
+
+
+def _filter_log_events(logs_client, params: Dict[str, Any]) -> Dict[str, Any]:
+    """filter_log_events with backoff on throttling"""
+    from botocore.exceptions import ClientError
+
+    for attempt in range(AirflowUtilsConstants.DEFAULT_MAX_RETRIES + 1):
+        try:
+            return logs_client.filter_log_events(**params)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code not in AirflowUtilsConstants.LOG_RETRYABLE_ERROR_CODES or \
+                    attempt == AirflowUtilsConstants.DEFAULT_MAX_RETRIES:
+                raise
+            time.sleep(AirflowUtils._retry_delay(attempt))
+
+
+def _read_group(logs_client, group: str, log_group_name: str, params: Dict[str, Any], follow: bool,
+                poll_seconds: float, emit: Callable[[Any], bool], stop: threading.Event) -> None:
+    """Emit the events of one log group; in follow mode keep polling until stop is set"""
+    # Follow mode: stream -> {event id: timestamp} of the events emitted within the re-read window
+    seen: Dict[str, Dict[str, int]] = {}
+    newest = None
+    start_time = params.get("startTime")
+    while not stop.is_set():
+        request = dict(params, logGroupName=log_group_name)
+        if start_time is not None:
+            request["startTime"] = start_time
+        while True:
+            response = _filter_log_events(logs_client, request)
+            for event in response.get("events", []):
+                stream, timestamp, event_id = event["logStreamName"], event["timestamp"], event["eventId"]
+                if follow:
+                    stream_seen = seen.setdefault(stream, {})
+                    if event_id in stream_seen:
+                        continue
+                    stream_seen[event_id] = timestamp
+                    newest = timestamp if newest is None else max(newest, timestamp)
+                if not emit({"group": group, "log_group": log_group_name, "log_stream": stream,
+                             "timestamp": timestamp, "message": event["message"], "event_id": event_id}):
+                    return
+            if not response.get("nextToken") or stop.is_set():
+                break
+            request["nextToken"] = response["nextToken"]
+        if not follow:
+            return
+        # Events can be ingested late, also into new streams: re-read a lag window behind the newest event
+        # and forget the ids of events that have fallen out of it, as they will not be read again
+        if newest is not None:
+            lag = AirflowUtilsConstants.LOG_FOLLOW_INGESTION_LAG_SECONDS * 1000
+            start_time = max(params["startTime"], newest - lag)
+            for stream in list(seen):
+                seen[stream] = {event_id: timestamp for event_id, timestamp in seen[stream].items()
+                                if timestamp >= start_time}
+                if not seen[stream]:
+                    del seen[stream]
+        stop.wait(poll_seconds)
+
+
+def iter_log_events(
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    groups: Optional[List[str]] = None,
+    start_time: Optional[Union[int, float, datetime]] = None,
+    end_time: Optional[Union[int, float, datetime]] = None,
+    filter_pattern: Optional[str] = None,
+    log_stream_prefix: Optional[str] = None,
+    follow: bool = False,
+    poll_seconds: float = AirflowUtilsConstants.LOG_FOLLOW_POLL_SECONDS,
+    buffer_size: int = AirflowUtilsConstants.LOG_EVENTS_BUFFER_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the CloudWatch log events of an MWAA environment, reading its log groups in parallel
+
+    Events of one group arrive in timestamp order; groups are interleaved as they are read. Closing the
+    generator (or breaking out of the loop) stops the readers, which is how a follow is ended.
+
+    Args:
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        airflow_environment_name (str): MWAA environment name
+        groups (list): Entries of LOG_GROUPS to read (default: all enabled groups)
+        start_time: datetime or epoch milliseconds (default: LOG_DEFAULT_SINCE_SECONDS ago)
+        end_time: datetime or epoch milliseconds (default: now; not allowed with follow)
+        filter_pattern (str): CloudWatch Logs filter pattern
+        log_stream_prefix (str): Only read streams with this prefix (e.g. a DAG id for task logs)
+        follow (bool): Keep polling for new events until the generator is closed
+        poll_seconds (float): Delay between follow polls of a group
+        buffer_size (int): Maximum events held between the readers and the caller
+
+    Yields:
+        dict: {"group", "log_group", "log_stream", "timestamp", "message", "event_id"}
+
+    Raises:
+        Exception: If the log groups cannot be resolved or a group cannot be read
+    """
+    if follow and end_time is not None:
+        raise Exception("end_time cannot be combined with follow")
+    mwaa_client = CommonUtils.get_boto3_client(AirflowUtilsConstants.MWAA_KEY, environment, region)
+    logs_client = CommonUtils.get_boto3_client(AirflowUtilsConstants.LOGS_KEY, environment, region)
+    log_groups = resolve_log_groups(mwaa_client, airflow_environment_name, groups)
+
+    params: Dict[str, Any] = {"startTime": _epoch_millis(start_time) if start_time is not None else
+                              int((time.time() - AirflowUtilsConstants.LOG_DEFAULT_SINCE_SECONDS) * 1000)}
+    if end_time is not None:
+        params["endTime"] = _epoch_millis(end_time)
+    if filter_pattern:
+        params["filterPattern"] = filter_pattern
+    if log_stream_prefix:
+        params["logStreamNamePrefix"] = log_stream_prefix
+
+    events: queue.Queue = queue.Queue(maxsize=max(1, buffer_size))
+    stop = threading.Event()
+
+    def emit(item: Any) -> bool:
+        # Blocks while the buffer is full; gives up once the consumer has gone away
+        while not stop.is_set():
+            try:
+                events.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read(group: str, log_group_name: str) -> None:
+        try:
+            _read_group(logs_client, group, log_group_name, params, follow, poll_seconds, emit, stop)
+            emit(_GROUP_DONE)
+        except Exception as ex:
+            emit(Exception(f"Unable to read {group} logs of {airflow_environment_name}: {ex}"))
+
+    readers = [threading.Thread(target=read, args=item, daemon=True, name=f"logs-{item[0]}")
+               for item in log_groups.items()]
+    for reader in readers:
+        reader.start()
+    try:
+        remaining = len(readers)
+        while remaining:
+            item = events.get()
+            if item is _GROUP_DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
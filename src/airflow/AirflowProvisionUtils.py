@@ -0,0 +1,292 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+AirflowProvisionUtils.py - Declarative creation and update of MWAA environments
+Tech Description: Builds the complete CreateEnvironment request for an environment spec from the constants
+                  (ENVIRONMENT_CLASS sizes, REGION_DETAILS network configuration per tier,
+                  LOGGING_CONFIGURATIONS, WEEKLY_MAINTENANCE_WINDOW_START, WEB_SERVER_ACCESS_MODE), compares
+                  it with get_environment and sends CreateEnvironment for a missing environment or an
+                  UpdateEnvironment carrying only the fields that differ; tags are applied with TagResource.
+                  Many specs are provisioned in parallel on a bounded thread pool, optionally followed by one
+                  EnvironmentWaiter for the environments that were created or updated.
+Pre_requisites: Requires AirflowUtilsConstants.py, AirflowWaitUtils.py, CommonUtils.py and DLPLogSetup.py
+"""
+
+import copy
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from utils import CommonUtils, CommonUtilsConstants
+from utils.DLPLogSetup import get_logger
+from . import AirflowUtilsConstants
+
+logger = get_logger(__name__)
+
+# Spec keys copied to request fields when present
+_OPTIONAL_SPEC_FIELDS = {
+    "execution_role_arn": AirflowUtilsConstants.EXECUTION_ROLE_ARN_KEY,
+    "source_bucket_arn": AirflowUtilsConstants.SOURCE_BUCKET_ARN_KEY,
+    "airflow_version": AirflowUtilsConstants.AIRFLOW_VERSION_KEY,
+    "plugins_s3_path": AirflowUtilsConstants.PLUGINS_S3_PATH_KEY,
+    "requirements_s3_path": AirflowUtilsConstants.REQUIREMENTS_S3_PATH_KEY,
+    "airflow_configuration_options": AirflowUtilsConstants.AIRFLOW_CONFIGURATION_OPTIONS_KEY,
+    "kms_key": AirflowUtilsConstants.KMS_KEY_KEY,
+}
+
+
+def environment_name(region: str, apms_id: str, environment: str, sequence: str) -> str:
+    """
+    Standard MWAA environment name (AIRFLOW_ENVIRONMENT_NAME), e.g. MWAA1USVGA00000D000
+
+    Args:
+        region (str): Target region (us/eu/jp)
+        apms_id (str): Application id, with or without the APMS- prefix
+        environment (str): Target environment (dev/tst/prd)
+        sequence (str): Instance number within the application and tier
+    """
+    return AirflowUtilsConstants.AIRFLOW_ENVIRONMENT_NAME.format(
+        region=region.upper(),
+        location=AirflowUtilsConstants.REGION_DETAILS[region][AirflowUtilsConstants.LOCATION_CHAR_KEY],
+        apms_id=apms_id.replace(AirflowUtilsConstants.APMS_ID_VALIDATION, ""),
+        environment=AirflowUtilsConstants.ENVIRONMENT_NAME_LETTERS[environment],
+        id=sequence
+    )
+
+
+def _spec_name(spec: Dict[str, Any]) -> str:
+    """Environment name of a spec: its "name", or one built from "apms_id" and "sequence" """
+    if spec.get("name"):
+        return spec["name"]
+    if spec.get("apms_id") and spec.get("sequence") is not None:
+        return environment_name(spec["region"], spec["apms_id"], spec["environment"], str(spec["sequence"]))
+    raise Exception("Environment spec needs a name, or an apms_id and sequence")
+
+
+def build_environment_request(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the full CreateEnvironment request for an environment spec
+
+    Args:
+        spec (dict): {"environment": dev/tst/prd, "region": us/eu/jp, "size": small/medium/large,
+                      "name" (or "apms_id" and "sequence"), "execution_role_arn", "source_bucket_arn",
+                      optional "airflow_version", "dag_s3_path", "plugins_s3_path", "requirements_s3_path",
+                      "airflow_configuration_options", "kms_key", "tags", and "overrides" (raw request fields
+                      applied last)}
+
+    Returns:
+        dict: CreateEnvironment keyword arguments, including Name
+    """
+    environment, region = spec.get("environment"), spec.get("region")
+    if environment not in AirflowUtilsConstants.VALID_ENVIRONMENTS:
+        raise Exception(f"Invalid environment: {environment}. "
+                        f"Valid values: {AirflowUtilsConstants.VALID_ENVIRONMENTS}")
+    if region not in AirflowUtilsConstants.VALID_REGIONS:
+        raise Exception(f"Invalid region: {region}. Valid values: {AirflowUtilsConstants.VALID_REGIONS}")
+    size = spec.get("size", AirflowUtilsConstants.VALID_ENVIRONMENT_SIZE[0])
+    if size not in AirflowUtilsConstants.VALID_ENVIRONMENT_SIZE:
+        raise Exception(f"Invalid size: {size}. Valid values: {AirflowUtilsConstants.VALID_ENVIRONMENT_SIZE}")
+
+    request = {
+        AirflowUtilsConstants.NAME_KEY: _spec_name(spec),
+        **copy.deepcopy(AirflowUtilsConstants.ENVIRONMENT_CLASS[size]),
+        AirflowUtilsConstants.NETWORK_CONFIGURATION_KEY: copy.deepcopy(
+            AirflowUtilsConstants.REGION_DETAILS[region]["network_configuration"][environment]),
+        AirflowUtilsConstants.LOGGING_CONFIGURATION_KEY: copy.deepcopy(AirflowUtilsConstants.LOGGING_CONFIGURATIONS),
+        AirflowUtilsConstants.WEEKLY_MAINTENANCE_WINDOW_START_KEY:
+            AirflowUtilsConstants.WEEKLY_MAINTENANCE_WINDOW_START,
+        AirflowUtilsConstants.WEBSERVER_ACCESS_MODE_KEY: AirflowUtilsConstants.WEB_SERVER_ACCESS_MODE,
+        AirflowUtilsConstants.DAG_S3_PATH_KEY:
+            (spec.get("dag_s3_path") or AirflowUtilsConstants.DAG_S3_PATH).strip("/"),
+    }
+    request.update({field: spec[key] for key, field in _OPTIONAL_SPEC_FIELDS.items() if spec.get(key) is not None})
+    if spec.get("tags"):
+        request[AirflowUtilsConstants.TAGS_KEY] = dict(spec["tags"])
+    request.update(copy.deepcopy(spec.get("overrides") or {}))
+    return request
+
+
+def _same(field: str, desired: Any, current: Any) -> bool:
+    """True if a request field already has the desired value in a GetEnvironment structure"""
+    if field == AirflowUtilsConstants.DAG_S3_PATH_KEY:
+        return (current or "").strip("/") == desired.strip("/")
+    if field == AirflowUtilsConstants.LOGGING_CONFIGURATION_KEY:
+        # GetEnvironment adds CloudWatchLogGroupArn to each log type; compare only what can be set
+        current = current or {}
+        return all(all((current.get(log_type) or {}).get(key) == value for key, value in settings.items())
+                   for log_type, settings in desired.items())
+    if isinstance(desired, list):
+        return sorted(desired) == sorted(current or [])
+    return desired == current
+
+
+def diff_environment(request: Dict[str, Any], current: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Compare a CreateEnvironment request with a GetEnvironment "Environment" structure
+
+    Returns:
+        tuple: (UpdateEnvironment fields that differ, names of differing fields that only CreateEnvironment
+               can set, such as SubnetIds or KmsKey); Tags are compared separately
+    """
+    changes: Dict[str, Any] = {}
+    create_only: List[str] = []
+    for field, desired in request.items():
+        if field in (AirflowUtilsConstants.NAME_KEY, AirflowUtilsConstants.TAGS_KEY):
+            continue
+        if field == AirflowUtilsConstants.NETWORK_CONFIGURATION_KEY:
+            current_network = current.get(field) or {}
+            for network_field, value in desired.items():
+                if not _same(network_field, value, current_network.get(network_field)):
+                    if network_field in AirflowUtilsConstants.UPDATABLE_NETWORK_FIELDS:
+                        changes.setdefault(field, {})[network_field] = value
+                    else:
+                        create_only.append(network_field)
+        elif not _same(field, desired, current.get(field)):
+            if field in AirflowUtilsConstants.ENVIRONMENT_UPDATABLE_FIELDS:
+                changes[field] = desired
+            else:
+                create_only.append(field)
+    return changes, create_only
+
+
+def ensure_environment(spec: Dict[str, Any], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Create an MWAA environment, or update it so that it matches its spec
+
+    A missing environment is created from build_environment_request. An existing one is compared with
+    the request and only the differing fields are sent in one UpdateEnvironment (none at all when it
+    already matches, avoiding a 20+ minute UPDATING cycle); missing tags are added with TagResource.
+    Nothing is sent unless the environment is AVAILABLE: field changes fail, and missing tags are
+    reported under "deferred_tags" for a later run.
+
+    Args:
+        spec (dict): Environment spec (see build_environment_request)
+        dry_run (bool): Report the request that would be sent without sending it
+
+    Returns:
+        dict: {"status", "result": {"name", "action" (created/updated/unchanged), "changes", "tags",
+               "deferred_tags", "create_only_differences", "arn", "dry_run"}, "error"}
+    """
+    name = spec.get("name")
+    try:
+        request = build_environment_request(spec)
+        name = request[AirflowUtilsConstants.NAME_KEY]
+        mwaa_client = CommonUtils.get_boto3_client(AirflowUtilsConstants.MWAA_KEY, spec["environment"],
+                                                   spec["region"])
+        from botocore.exceptions import ClientError
+
+        try:
+            current = mwaa_client.get_environment(Name=name)[AirflowUtilsConstants.ENVIRONMENT_KEY]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != AirflowUtilsConstants.RESOURCE_NOT_FOUND_ERROR_CODE:
+                raise
+            current = None
+
+        if current is None:
+            for field in (AirflowUtilsConstants.EXECUTION_ROLE_ARN_KEY, AirflowUtilsConstants.SOURCE_BUCKET_ARN_KEY):
+                if not request.get(field):
+                    raise Exception(f"{field} is required to create environment {name}")
+            arn = None
+            if not dry_run:
+                arn = mwaa_client.create_environment(**request).get(AirflowUtilsConstants.ARN_KEY)
+                logger.info("Creating MWAA environment %s", name)
+            changes = {field: value for field, value in request.items() if field != AirflowUtilsConstants.NAME_KEY}
+            result = {"name": name, "action": AirflowUtilsConstants.PROVISION_CREATED, "changes": changes,
+                      "tags": request.get(AirflowUtilsConstants.TAGS_KEY, {}), "deferred_tags": {},
+                      "create_only_differences": [], "arn": arn, "dry_run": dry_run}
+            return {"status": CommonUtilsConstants.SUCCESS_KEY, "result": result, "error": None}
+
+        status = current.get(AirflowUtilsConstants.STATUS_KEY)
+        changes, create_only = diff_environment(request, current)
+        current_tags = current.get(AirflowUtilsConstants.TAGS_KEY) or {}
+        tags = {key: value for key, value in (request.get(AirflowUtilsConstants.TAGS_KEY) or {}).items()
+                if current_tags.get(key) != value}
+        if create_only:
+            logger.warning("%s differs from its spec in create-only fields %s; recreate it to apply them",
+                           name, create_only)
+        if changes and status != AirflowUtilsConstants.AIRFLOW_STATUS_AVAILABLE_KEY:
+            raise Exception(f"Environment {name} is {status}; cannot update {sorted(changes)}")
+        deferred_tags = {}
+        if tags and status != AirflowUtilsConstants.AIRFLOW_STATUS_AVAILABLE_KEY:
+            logger.warning("Environment %s is %s; not tagging it with %s until it is AVAILABLE",
+                           name, status, sorted(tags))
+            deferred_tags, tags = tags, {}
+
+        arn = current.get(AirflowUtilsConstants.ARN_KEY)
+        if not dry_run:
+            if tags:
+                mwaa_client.tag_resource(ResourceArn=arn, Tags=tags)
+            if changes:
+                mwaa_client.update_environment(Name=name, **changes)
+                logger.info("Updating MWAA environment %s: %s", name, sorted(changes))
+        action = AirflowUtilsConstants.PROVISION_UPDATED if changes else AirflowUtilsConstants.PROVISION_UNCHANGED
+        result = {"name": name, "action": action, "changes": changes, "tags": tags, "deferred_tags": deferred_tags,
+                  "create_only_differences": create_only, "arn": arn, "dry_run": dry_run}
+        return {"status": CommonUtilsConstants.SUCCESS_KEY, "result": result, "error": None}
+
+    except Exception as ex:
+        logger.error("Unable to provision MWAA environment %s: %s", name, ex)
+        return {
+            "status": CommonUtilsConstants.FAILED_KEY,
+            "result": {"name": name},
+            "error": str(ex)
+        }
+
+
+def ensure_environments(
+    specs: Iterable[Dict[str, Any]],
+    dry_run: bool = False,
+    max_workers: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    wait: bool = False,
+    timeout: float = AirflowUtilsConstants.TIMEOUT_KEY
+) -> Dict[str, Any]:
+    """
+    Run ensure_environment for many specs in parallel
+
+    Args:
+        specs: Environment specs (see build_environment_request)
+        dry_run (bool): Report the requests that would be sent without sending them
+        max_workers (int): Maximum environments provisioned concurrently
+        wait (bool): Wait (with one EnvironmentWaiter) until created/updated environments are AVAILABLE
+        timeout (float): Seconds to wait per environment when wait is set
+
+    Returns:
+        dict: {"status", "result": {"environments": [per-spec results], "created", "updated", "unchanged",
+               "failed", "wait"}, "error"}
+    """
+    from . import AirflowWaitUtils
+
+    waiter = AirflowWaitUtils.EnvironmentWaiter() if wait and not dry_run else None
+    environments = []
+    counts = {AirflowUtilsConstants.PROVISION_CREATED: 0, AirflowUtilsConstants.PROVISION_UPDATED: 0,
+              AirflowUtilsConstants.PROVISION_UNCHANGED: 0, "failed": 0}
+
+    def provision(spec: Dict[str, Any]) -> Tuple[Dict[str, Any], float, Dict[str, Any]]:
+        return spec, time.time(), ensure_environment(spec, dry_run)
+
+    for spec, requested_at, outcome in CommonUtils.bounded_map(provision, specs, max_workers):
+        if outcome["status"] == CommonUtilsConstants.SUCCESS_KEY:
+            action = outcome["result"]["action"]
+            counts[action] += 1
+            environments.append(outcome["result"])
+            if waiter is not None and action != AirflowUtilsConstants.PROVISION_UNCHANGED:
+                # An updated environment is still AVAILABLE until MWAA starts the update
+                waiter.add(spec["environment"], spec["region"], outcome["result"]["name"], timeout=timeout,
+                           require_transition=action == AirflowUtilsConstants.PROVISION_UPDATED,
+                           since=requested_at)
+        else:
+            counts["failed"] += 1
+            environments.append(dict(outcome["result"] or {}, error=outcome["error"]))
+
+    error = f"{counts['failed']} environments failed to provision" if counts["failed"] else None
+    wait_result = None
+    if waiter is not None:
+        waited = waiter.wait()
+        wait_result = waited["result"]
+        error = error or waited["error"]
+    return {
+        "status": CommonUtilsConstants.SUCCESS_KEY if not error else CommonUtilsConstants.FAILED_KEY,
+        "result": dict(counts, environments=environments, wait=wait_result),
+        "error": error
+    }
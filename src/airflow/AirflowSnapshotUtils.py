@@ -0,0 +1,420 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+AirflowSnapshotUtils.py - Export and import snapshots of an MWAA environment's Airflow metadata
+Tech Description: Streams every variable, connection and pool of a source MWAA environment into a gzip'd
+                  JSON Lines snapshot with per-record and whole-file SHA-256 checksums, and replays a
+                  verified snapshot into a target environment through the bulk write path with flat
+                  memory use
+Pre_requisites: Requires AirflowUtils.py, AirflowUtilsConstants.py, CommonUtils.py and DLPLogSetup.py
+
+Snapshot layout (one compact JSON document per line):
+    {"type": "header", "format": "mwaa-snapshot", "version": 1, "source": {...}, "created_at": "..."}
+    {"type": "variable" | "connection" | "pool", "data": {...}, "sha256": "<sha256 of data>"}
+    ...
+    {"type": "footer", "counts": {...}, "sha256": "<sha256 over all record lines>"}
+"""
+
+import gzip
+import hashlib
+import itertools
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from utils import CommonUtils, CommonUtilsConstants
+from utils.DLPLogSetup import get_logger
+from . import AirflowUtils, AirflowUtilsConstants
+
+logger = get_logger(__name__)
+
+
+def _dumps(document: Dict[str, Any]) -> str:
+    """Serialize a document as compact, key-sorted JSON so checksums are stable"""
+    return json.dumps(document, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def _checksum(data: Dict[str, Any]) -> str:
+    """SHA-256 of a record's canonical JSON"""
+    return hashlib.sha256(_dumps(data).encode("utf-8")).hexdigest()
+
+
+def _iter_connections(mwaa_client, airflow_environment_name: str, include_details: bool,
+                      max_workers: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yield connections; with include_details each one is re-read individually so that
+    fields missing from the listing (such as extra) are captured. Passwords are never
+    returned by the Airflow REST API and cannot be exported.
+    """
+    listing = AirflowUtils._iter_rest_collection(
+        mwaa_client,
+        airflow_environment_name,
+        AirflowUtilsConstants.CONNECTIONS_PATH,
+        AirflowUtilsConstants.CONNECTIONS_RESPONSE_KEY
+    )
+    if not include_details:
+        yield from listing
+        return
+
+    def get_connection(connection: Dict[str, Any]) -> Dict[str, Any]:
+        connection_id = connection[AirflowUtilsConstants.CONNECTION_ID_PAYLOAD_KEY]
+        http_status, content, _ = AirflowUtils._invoke_rest_api_with_retry(
+            mwaa_client,
+            airflow_environment_name,
+            f"{AirflowUtilsConstants.CONNECTIONS_PATH}/{quote(connection_id, safe='')}",
+            AirflowUtilsConstants.GET_METHOD
+        )
+        if http_status != AirflowUtilsConstants.HTTP_STATUS_OK or not content:
+            return connection
+        return json.loads(content)
+
+    yield from CommonUtils.bounded_map(get_connection, listing, max_workers)
+
+
+def _skip_masked(variables: Iterable[Dict[str, Any]], masked: List[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Drop variables whose value is the REST API's mask and record their keys. The real value of a
+    sensitive variable cannot be read back, and writing the mask would overwrite the secret.
+    """
+    for variable in variables:
+        if variable.get(AirflowUtilsConstants.VARIABLE_VALUE_KEY) == AirflowUtilsConstants.MASKED_VARIABLE_VALUE:
+            masked.append(variable[AirflowUtilsConstants.VARIABLE_KEY_KEY])
+        else:
+            yield variable
+
+
+def _iter_source_records(mwaa_client, airflow_environment_name: str, include_connection_details: bool,
+                         max_workers: int, masked: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (record type, data) for every variable, connection and pool, grouped by type. Masked
+    variables are left out and their keys appended to masked.
+    """
+    for variable in _skip_masked(AirflowUtils._iter_rest_collection(
+        mwaa_client,
+        airflow_environment_name,
+        AirflowUtilsConstants.VARIABLES_PATH,
+        AirflowUtilsConstants.VARIABLES_RESPONSE_KEY
+    ), masked):
+        yield AirflowUtilsConstants.SNAPSHOT_VARIABLE_TYPE, variable
+
+    for connection in _iter_connections(mwaa_client, airflow_environment_name, include_connection_details,
+                                        max_workers):
+        yield AirflowUtilsConstants.SNAPSHOT_CONNECTION_TYPE, connection
+
+    for pool in AirflowUtils._iter_rest_collection(
+        mwaa_client,
+        airflow_environment_name,
+        AirflowUtilsConstants.POOLS_PATH,
+        AirflowUtilsConstants.POOLS_RESPONSE_KEY
+    ):
+        yield AirflowUtilsConstants.SNAPSHOT_POOL_TYPE, {
+            field: pool[field] for field in AirflowUtilsConstants.POOL_PAYLOAD_FIELDS if field in pool
+        }
+
+
+def export_snapshot(
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    file_path: str,
+    include_connection_details: bool = True,
+    max_workers: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY
+) -> Dict[str, Any]:
+    """
+    Export all variables, connections and pools of an MWAA environment to a snapshot file
+
+    Listings are streamed page by page straight into the gzip writer, so memory use does
+    not grow with the number of records. Sensitive variables, whose values the REST API
+    returns masked, are not exported; their keys are listed in the footer and the result
+    so they can be restored by hand.
+
+    Args:
+        environment (str): Source environment (dev/tst/prd)
+        region (str): Source region (us/eu/jp)
+        airflow_environment_name (str): Source MWAA environment name
+        file_path (str): Snapshot file to write (conventionally *.jsonl.gz)
+        include_connection_details (bool): Re-read each connection to capture extra
+        max_workers (int): Maximum concurrent connection detail requests
+
+    Returns:
+        dict: {"status", "result": {"file", "counts", "masked", "sha256", "elapsed_seconds"}, "error"}
+    """
+    started = time.perf_counter()
+    masked = []
+    try:
+        mwaa_client = CommonUtils.get_boto3_client(
+            AirflowUtilsConstants.MWAA_KEY, environment, region
+        )
+        logger.info("Exporting snapshot of %s to %s", airflow_environment_name, file_path)
+
+        counts = {record_type: 0 for record_type in AirflowUtilsConstants.SNAPSHOT_RECORD_TYPES}
+        digest = hashlib.sha256()
+        with gzip.open(file_path, "wt", encoding="utf-8") as snapshot_file:
+            snapshot_file.write(_dumps({
+                "type": AirflowUtilsConstants.SNAPSHOT_HEADER_TYPE,
+                "format": AirflowUtilsConstants.SNAPSHOT_FORMAT,
+                "version": AirflowUtilsConstants.SNAPSHOT_VERSION,
+                "source": {
+                    "environment": environment,
+                    "region": region,
+                    "airflow_environment_name": airflow_environment_name
+                },
+                "created_at": datetime.now(timezone.utc).isoformat()
+            }) + "\n")
+
+            for record_type, data in _iter_source_records(
+                mwaa_client, airflow_environment_name, include_connection_details, max_workers, masked
+            ):
+                line = _dumps({"type": record_type, "data": data, "sha256": _checksum(data)}) + "\n"
+                digest.update(line.encode("utf-8"))
+                snapshot_file.write(line)
+                counts[record_type] += 1
+
+            snapshot_file.write(_dumps({
+                "type": AirflowUtilsConstants.SNAPSHOT_FOOTER_TYPE,
+                "counts": counts,
+                "masked": masked,
+                "sha256": digest.hexdigest()
+            }) + "\n")
+
+        logger.info("Exported snapshot with %s", counts)
+        if masked:
+            logger.warning("%d masked variables were not exported: %s", len(masked), ", ".join(masked))
+        return {
+            "status": CommonUtilsConstants.SUCCESS_KEY,
+            "result": {
+                "file": file_path,
+                "counts": counts,
+                "masked": masked,
+                "sha256": digest.hexdigest(),
+                "elapsed_seconds": round(time.perf_counter() - started, 3)
+            },
+            "error": None
+        }
+
+    except Exception as ex:
+        logger.error("Unable to export snapshot: %s", ex)
+        return {"status": CommonUtilsConstants.FAILED_KEY, "result": None, "error": str(ex)}
+
+
+def read_snapshot_header(file_path: str) -> Dict[str, Any]:
+    """Return the header record of a snapshot file"""
+    with gzip.open(file_path, "rt", encoding="utf-8") as snapshot_file:
+        header = json.loads(snapshot_file.readline())
+    if (header.get("type") != AirflowUtilsConstants.SNAPSHOT_HEADER_TYPE
+            or header.get("format") != AirflowUtilsConstants.SNAPSHOT_FORMAT):
+        raise Exception(f"{file_path} is not an MWAA snapshot")
+    if header.get("version") != AirflowUtilsConstants.SNAPSHOT_VERSION:
+        raise Exception(f"Unsupported snapshot version: {header.get('version')}")
+    return header
+
+
+def iter_snapshot(file_path: str, verify: bool = True) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream (record type, data) pairs from a snapshot file
+
+    With verify, each record's checksum is checked before it is yielded and the whole-file
+    checksum and counts are checked against the footer once the last record has been read,
+    which also detects truncated files. Records yielded before a late failure have already
+    been consumed; call verify_snapshot first when acting on them cannot be undone.
+
+    Raises:
+        Exception: If the file is not a supported snapshot or a checksum does not match
+    """
+    read_snapshot_header(file_path)
+    counts = {record_type: 0 for record_type in AirflowUtilsConstants.SNAPSHOT_RECORD_TYPES}
+    digest = hashlib.sha256()
+    footer = None
+
+    with gzip.open(file_path, "rt", encoding="utf-8") as snapshot_file:
+        next(snapshot_file)
+        for line_number, line in enumerate(snapshot_file, start=2):
+            record = json.loads(line)
+            if record.get("type") == AirflowUtilsConstants.SNAPSHOT_FOOTER_TYPE:
+                footer = record
+                break
+
+            if verify:
+                if _checksum(record["data"]) != record.get("sha256"):
+                    raise Exception(f"Checksum mismatch in {file_path} at line {line_number}")
+                digest.update(line.encode("utf-8"))
+            counts[record["type"]] = counts.get(record["type"], 0) + 1
+            yield record["type"], record["data"]
+
+    if verify:
+        if footer is None:
+            raise Exception(f"Snapshot {file_path} is truncated (no footer)")
+        if footer.get("sha256") != digest.hexdigest() or footer.get("counts") != counts:
+            raise Exception(f"Snapshot {file_path} failed whole-file verification")
+
+
+def verify_snapshot(file_path: str) -> Dict[str, int]:
+    """
+    Read a whole snapshot file and check every record checksum, the footer counts and the
+    whole-file checksum, without keeping records in memory
+
+    Returns:
+        dict: Record count per type
+
+    Raises:
+        Exception: If the file is not a supported snapshot, is truncated or a checksum does not match
+    """
+    counts: Dict[str, int] = {}
+    for record_type, _ in iter_snapshot(file_path, verify=True):
+        counts[record_type] = counts.get(record_type, 0) + 1
+    return counts
+
+
+def _upsert(mwaa_client, airflow_environment_name: str, path: str, identifier: str, body: Dict[str, Any],
+            max_retries: int) -> Dict[str, Any]:
+    """Create an item under path, or update it when it already exists (e.g. default_pool or a repeat restore)"""
+    row = AirflowUtils._apply_change(
+        mwaa_client,
+        airflow_environment_name,
+        (AirflowUtilsConstants.SYNC_CREATE, identifier, AirflowUtilsConstants.POST_METHOD, path, body),
+        max_retries
+    )
+    if row["http_status"] == AirflowUtilsConstants.HTTP_STATUS_CONFLICT:
+        row = AirflowUtils._apply_change(
+            mwaa_client,
+            airflow_environment_name,
+            (AirflowUtilsConstants.SYNC_UPDATE, identifier, AirflowUtilsConstants.PATCH_METHOD,
+             f"{path}/{quote(identifier, safe='')}", body),
+            max_retries
+        )
+    return row
+
+
+def _iter_replay_results(
+    mwaa_client,
+    airflow_environment_name: str,
+    record_type: str,
+    records: Iterable[Dict[str, Any]],
+    max_in_flight: int,
+    max_retries: int
+) -> Iterator[Dict[str, Any]]:
+    """Route a run of same-typed records to the matching bulk write path"""
+    if record_type == AirflowUtilsConstants.SNAPSHOT_VARIABLE_TYPE:
+        return AirflowUtils._iter_variable_results(
+            mwaa_client,
+            airflow_environment_name,
+            ((variable[AirflowUtilsConstants.VARIABLE_KEY_KEY], variable.get(AirflowUtilsConstants.VARIABLE_VALUE_KEY))
+             for variable in records),
+            max_in_flight,
+            max_retries
+        )
+    if record_type == AirflowUtilsConstants.SNAPSHOT_CONNECTION_TYPE:
+        return CommonUtils.bounded_map(
+            lambda connection: _upsert(
+                mwaa_client, airflow_environment_name, AirflowUtilsConstants.CONNECTIONS_PATH,
+                connection[AirflowUtilsConstants.CONNECTION_ID_PAYLOAD_KEY], connection, max_retries
+            ),
+            AirflowUtils._load_connections(records),
+            max_in_flight
+        )
+    return CommonUtils.bounded_map(
+        lambda pool: _upsert(
+            mwaa_client, airflow_environment_name, AirflowUtilsConstants.POOLS_PATH,
+            pool[AirflowUtilsConstants.POOL_NAME_KEY], pool, max_retries
+        ),
+        records,
+        max_in_flight
+    )
+
+
+def import_snapshot(
+    file_path: str,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    record_types: Optional[List[str]] = None,
+    max_in_flight: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES,
+    verify: bool = True
+) -> Dict[str, Any]:
+    """
+    Replay a snapshot into a target MWAA environment through the bulk write path
+
+    With verify the whole file is checked (verify_snapshot) before the first write, so a
+    truncated or tampered snapshot is rejected without touching the target. Records are then
+    streamed from the file into the bulk writers, so memory stays flat; only counts and the
+    first SNAPSHOT_MAX_REPORTED_FAILURES failures are kept, and they are returned even when
+    the replay stops on an error. Variables holding the REST API's mask (from snapshots taken
+    before masked variables were left out) are never written, so they cannot overwrite a
+    secret in the target; their keys are listed in the result.
+
+    Args:
+        file_path (str): Snapshot file written by export_snapshot
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        airflow_environment_name (str): Target MWAA environment name
+        record_types (list): Subset of SNAPSHOT_RECORD_TYPES to replay (default: all)
+        max_in_flight (int): Maximum number of concurrent write requests
+        max_retries (int): Maximum retries per record for transient failures
+        verify (bool): Verify record and file checksums before replaying
+
+    Returns:
+        dict: {"status", "result": {"source", "counts": {type: {"succeeded", "failed"}},
+               "masked", "failures", "elapsed_seconds"}, "error"}
+    """
+    started = time.perf_counter()
+    header = {}
+    record_types = record_types or AirflowUtilsConstants.SNAPSHOT_RECORD_TYPES
+    counts = {record_type: {"succeeded": 0, "failed": 0} for record_type in record_types}
+    failures = []
+    masked = []
+
+    def result() -> Dict[str, Any]:
+        return {
+            "source": header.get("source"),
+            "counts": counts,
+            "masked": masked,
+            "failures": failures,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
+
+    try:
+        header = read_snapshot_header(file_path)
+        if verify:
+            verify_snapshot(file_path)
+        mwaa_client = CommonUtils.get_boto3_client(
+            AirflowUtilsConstants.MWAA_KEY, environment, region
+        )
+        logger.info("Replaying snapshot %s into %s", file_path, airflow_environment_name)
+
+        for record_type, group in itertools.groupby(iter_snapshot(file_path, verify), key=lambda record: record[0]):
+            records = (data for _, data in group)
+            if record_type not in counts:
+                for _ in records:
+                    pass
+                continue
+            if record_type == AirflowUtilsConstants.SNAPSHOT_VARIABLE_TYPE:
+                records = _skip_masked(records, masked)
+
+            for row in _iter_replay_results(
+                mwaa_client, airflow_environment_name, record_type, records, max_in_flight, max_retries
+            ):
+                if row["status"] == CommonUtilsConstants.SUCCESS_KEY:
+                    counts[record_type]["succeeded"] += 1
+                else:
+                    counts[record_type]["failed"] += 1
+                    if len(failures) < AirflowUtilsConstants.SNAPSHOT_MAX_REPORTED_FAILURES:
+                        failures.append(dict(row, type=record_type))
+
+        failed = sum(count["failed"] for count in counts.values())
+        logger.info("Replayed snapshot: %s", counts)
+        if masked:
+            logger.warning("%d masked variables were not written: %s", len(masked), ", ".join(masked))
+        return {
+            "status": CommonUtilsConstants.SUCCESS_KEY if not failed else CommonUtilsConstants.FAILED_KEY,
+            "result": result(),
+            "error": None if not failed else f"{failed} snapshot records failed to import"
+        }
+
+    except Exception as ex:
+        logger.error("Unable to import snapshot: %s", ex)
+        return {"status": CommonUtilsConstants.FAILED_KEY, "result": result(), "error": str(ex)}
@@ -5,30 +5,184 @@ __author__ = "ZS Associates"
 """
 AirflowUtils.py - AWS MWAA (Managed Workflows for Apache Airflow) Utilities
 Tech Description: This utility provides functions for managing AWS MWAA environments
-Pre_requisites: Requires AirflowUtilsConstants.py and CommonUtils.py
+Pre_requisites: Requires AirflowUtilsConstants.py, CommonUtils.py and DLPLogSetup.py
 """
 
-import traceback
 import json
-from botocore.exceptions import ClientError
-from typing import Dict, List, Any, Optional
+import random
+import time
+from typing import Dict, Iterable, Iterator, List, Any, NamedTuple, Optional, Tuple
+from urllib.parse import quote
 
 # Import from parent utils directory
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+_SRC_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+if _SRC_DIR not in map(os.path.normpath, sys.path):
+    sys.path.append(_SRC_DIR)
 
-from utils import CommonUtils, CommonUtilsConstants
+from utils import CommonUtils, CommonUtilsConstants, JsonStreamUtils, MetricsUtils, RateLimitUtils
+from utils.DLPLogSetup import get_logger
 from . import AirflowUtilsConstants
 
+logger = get_logger(__name__)
 
-def list_all_mwaa_environments(environment: str, region: str) -> Dict[str, Any]:
+# Settings for MWAA rate limiters created from now on (see set_mwaa_rate_limit)
+_rate_limit_settings = {
+    "rate": AirflowUtilsConstants.MWAA_RATE_LIMIT_INITIAL,
+    "burst": AirflowUtilsConstants.MWAA_RATE_LIMIT_BURST,
+    "min_rate": AirflowUtilsConstants.MWAA_RATE_LIMIT_MIN,
+    "max_rate": AirflowUtilsConstants.MWAA_RATE_LIMIT_MAX,
+}
+
+
+def _environment_info(env_name: str, env_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the reported fields from a GetEnvironment "Environment" structure"""
+    return {
+        "name": env_name,
+        "status": env_info.get(AirflowUtilsConstants.STATUS_KEY),
+        "airflow_version": env_info.get(AirflowUtilsConstants.AIRFLOW_VERSION_KEY),
+        "environment_class": env_info.get(AirflowUtilsConstants.ENVIRONMENT_CLASS_KEY),
+        "max_workers": env_info.get(AirflowUtilsConstants.MAX_WORKERS_KEY),
+        "min_workers": env_info.get(AirflowUtilsConstants.MIN_WORKERS_KEY),
+        "schedulers": env_info.get(AirflowUtilsConstants.SCHEDULERS_KEY),
+        "webserver_access_mode": env_info.get(AirflowUtilsConstants.WEBSERVER_ACCESS_MODE_KEY),
+        "created_at": str(env_info.get(AirflowUtilsConstants.CREATED_AT_KEY, "")),
+        "source_bucket_arn": env_info.get(AirflowUtilsConstants.SOURCE_BUCKET_ARN_KEY),
+        "dag_s3_path": env_info.get(AirflowUtilsConstants.DAG_S3_PATH_KEY),
+        "execution_role_arn": env_info.get(AirflowUtilsConstants.EXECUTION_ROLE_ARN_KEY),
+        "service_role_arn": env_info.get(AirflowUtilsConstants.SERVICE_ROLE_ARN_KEY),
+        "webserver_url": env_info.get(AirflowUtilsConstants.WEBSERVER_URL_KEY),
+        "arn": env_info.get(AirflowUtilsConstants.ARN_KEY),
+        "tags": env_info.get(AirflowUtilsConstants.TAGS_KEY, {}),
+        "weekly_maintenance_window": env_info.get("WeeklyMaintenanceWindowStart"),
+        "kms_key": env_info.get("KmsKey"),
+        "requirements_s3_path": env_info.get("RequirementsS3Path"),
+        "plugins_s3_path": env_info.get("PluginsS3Path")
+    }
+
+
+def _get_environment_details(mwaa_client, env_name: str) -> Dict[str, Any]:
+    """
+    Fetch the details of a single MWAA environment
+    
+    Args:
+        mwaa_client: boto3 MWAA client
+        env_name (str): MWAA environment name
+    
+    Returns:
+        dict: Environment details, or a record with status UNKNOWN and an error message
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        logger.debug("Getting details for environment: %s", env_name)
+        env_details = mwaa_client.get_environment(Name=env_name)
+        
+        env_info = env_details.get(AirflowUtilsConstants.ENVIRONMENT_KEY, {})
+        
+        # Extract comprehensive information
+        return _environment_info(env_name, env_info)
+        
+    except ClientError as e:
+        logger.warning("Could not get details for environment %s: %s", env_name, e)
+        return {
+            "name": env_name,
+            "status": "UNKNOWN",
+            "error": f"Could not fetch details: {str(e)}"
+        }
+    except Exception as e:
+        logger.warning("Unexpected error getting details for %s: %s", env_name, e)
+        return {
+            "name": env_name,
+            "status": "UNKNOWN", 
+            "error": f"Unexpected error: {str(e)}"
+        }
+
+
+def _validate_target(environment: str, region: str) -> Optional[str]:
+    """Return an error message when environment or region is not a valid MWAA target, else None"""
+    if environment not in AirflowUtilsConstants.VALID_ENVIRONMENTS:
+        return f"Invalid environment: {environment}. Valid values: {AirflowUtilsConstants.VALID_ENVIRONMENTS}"
+    
+    if region not in AirflowUtilsConstants.VALID_REGIONS:
+        return f"Invalid region: {region}. Valid values: {AirflowUtilsConstants.VALID_REGIONS}"
+    
+    return None
+
+
+def _iter_environment_names(mwaa_client) -> Iterator[str]:
+    """Yield MWAA environment names page by page, following NextToken lazily"""
+    next_token = None
+    while True:
+        params = {AirflowUtilsConstants.MAX_RESULTS_KEY: AirflowUtilsConstants.DEFAULT_MAX_RESULTS}
+        if next_token:
+            params[AirflowUtilsConstants.NEXT_TOKEN_KEY] = next_token
+        
+        logger.debug("Calling list_environments API")
+        response = mwaa_client.list_environments(**params)
+        
+        environment_names = response.get(AirflowUtilsConstants.ENVIRONMENTS_KEY, [])
+        logger.debug("Found %d MWAA environments in page", len(environment_names))
+        yield from environment_names
+        
+        next_token = response.get(AirflowUtilsConstants.NEXT_TOKEN_KEY)
+        if not next_token:
+            break
+
+
+def iter_mwaa_environments(
+    environment: str,
+    region: str,
+    max_workers: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yields detailed records for every MWAA environment in the account/region
+    
+    Pages of list_environments are fetched only as the caller consumes records, and the
+    get_environment calls for each page run concurrently on a bounded worker pool.
+    
+    Args:
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        max_workers (int): Maximum number of concurrent get_environment calls
+    
+    Yields:
+        dict: Environment details in listing order (see _get_environment_details)
+    
+    Raises:
+        Exception: If the target is invalid or the listing itself fails
+    """
+    validation_error = _validate_target(environment, region)
+    if validation_error:
+        raise Exception(validation_error)
+    
+    # Get MWAA client using CommonUtils
+    mwaa_client = CommonUtils.get_boto3_client(
+        AirflowUtilsConstants.MWAA_KEY, 
+        environment, 
+        region
+    )
+    
+    yield from CommonUtils.bounded_map(
+        lambda env_name: _get_environment_details(mwaa_client, env_name),
+        _iter_environment_names(mwaa_client),
+        max_workers
+    )
+
+
+def list_all_mwaa_environments(
+    environment: str,
+    region: str,
+    max_workers: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY
+) -> Dict[str, Any]:
     """
     Lists all MWAA environments in the specified AWS account/region with comprehensive details
     
     Args:
         environment (str): Target environment (dev/tst/prd)
         region (str): Target region (us/eu/jp)
+        max_workers (int): Maximum number of concurrent get_environment calls
     
     Returns:
         dict: Response in the format:
@@ -43,86 +197,20 @@ def list_all_mwaa_environments(environment: str, region: str) -> Dict[str, Any]:
                   "error": "<Error message if FAILED>"
               }
     """
+    from botocore.exceptions import ClientError
+
     try:
-        print(f"Starting to list MWAA environments for environment: {environment}, region: {region}")
+        logger.info("Starting to list MWAA environments for environment: %s, region: %s", environment, region)
         
         # Validate inputs
-        if environment not in AirflowUtilsConstants.VALID_ENVIRONMENTS:
-            return {
-                CommonUtilsConstants.STATUS_KEY: CommonUtilsConstants.FAILED_KEY,
-                "error": f"Invalid environment: {environment}. Valid values: {AirflowUtilsConstants.VALID_ENVIRONMENTS}"
-            }
-        
-        if region not in AirflowUtilsConstants.VALID_REGIONS:
+        validation_error = _validate_target(environment, region)
+        if validation_error:
             return {
                 CommonUtilsConstants.STATUS_KEY: CommonUtilsConstants.FAILED_KEY,
-                "error": f"Invalid region: {region}. Valid values: {AirflowUtilsConstants.VALID_REGIONS}"
+                "error": validation_error
             }
         
-        # Get MWAA client using CommonUtils
-        mwaa_client = CommonUtils.get_boto3_client(
-            AirflowUtilsConstants.MWAA_KEY, 
-            environment, 
-            region
-        )
-        
-        # List all MWAA environments
-        print("Calling list_environments API")
-        response = mwaa_client.list_environments(MaxResults=AirflowUtilsConstants.DEFAULT_MAX_RESULTS)
-        
-        environment_names = response.get(AirflowUtilsConstants.ENVIRONMENTS_KEY, [])
-        print(f"Found {len(environment_names)} MWAA environments")
-        
-        # Get detailed information for each environment
-        detailed_environments = []
-        
-        for env_name in environment_names:
-            try:
-                print(f"Getting details for environment: {env_name}")
-                env_details = mwaa_client.get_environment(Name=env_name)
-                
-                env_info = env_details.get(AirflowUtilsConstants.ENVIRONMENT_KEY, {})
-                
-                # Extract comprehensive information
-                environment_info = {
-                    "name": env_name,
-                    "status": env_info.get(AirflowUtilsConstants.STATUS_KEY),
-                    "airflow_version": env_info.get(AirflowUtilsConstants.AIRFLOW_VERSION_KEY),
-                    "environment_class": env_info.get(AirflowUtilsConstants.ENVIRONMENT_CLASS_KEY),
-                    "max_workers": env_info.get(AirflowUtilsConstants.MAX_WORKERS_KEY),
-                    "min_workers": env_info.get(AirflowUtilsConstants.MIN_WORKERS_KEY),
-                    "schedulers": env_info.get(AirflowUtilsConstants.SCHEDULERS_KEY),
-                    "webserver_access_mode": env_info.get(AirflowUtilsConstants.WEBSERVER_ACCESS_MODE_KEY),
-                    "created_at": str(env_info.get(AirflowUtilsConstants.CREATED_AT_KEY, "")),
-                    "source_bucket_arn": env_info.get(AirflowUtilsConstants.SOURCE_BUCKET_ARN_KEY),
-                    "dag_s3_path": env_info.get(AirflowUtilsConstants.DAG_S3_PATH_KEY),
-                    "execution_role_arn": env_info.get(AirflowUtilsConstants.EXECUTION_ROLE_ARN_KEY),
-                    "service_role_arn": env_info.get(AirflowUtilsConstants.SERVICE_ROLE_ARN_KEY),
-                    "webserver_url": env_info.get(AirflowUtilsConstants.WEBSERVER_URL_KEY),
-                    "arn": env_info.get(AirflowUtilsConstants.ARN_KEY),
-                    "tags": env_info.get(AirflowUtilsConstants.TAGS_KEY, {}),
-                    "weekly_maintenance_window": env_info.get("WeeklyMaintenanceWindowStart"),
-                    "kms_key": env_info.get("KmsKey"),
-                    "requirements_s3_path": env_info.get("RequirementsS3Path"),
-                    "plugins_s3_path": env_info.get("PluginsS3Path")
-                }
-                
-                detailed_environments.append(environment_info)
-                
-            except ClientError as e:
-                print(f"Could not get details for environment {env_name}: {str(e)}")
-                detailed_environments.append({
-                    "name": env_name,
-                    "status": "UNKNOWN",
-                    "error": f"Could not fetch details: {str(e)}"
-                })
-            except Exception as e:
-                print(f"Unexpected error getting details for {env_name}: {str(e)}")
-                detailed_environments.append({
-                    "name": env_name,
-                    "status": "UNKNOWN", 
-                    "error": f"Unexpected error: {str(e)}"
-                })
+        detailed_environments = list(iter_mwaa_environments(environment, region, max_workers))
         
         result = {
             "environments": detailed_environments,
@@ -132,7 +220,7 @@ def list_all_mwaa_environments(environment: str, region: str) -> Dict[str, Any]:
             "region_details": AirflowUtilsConstants.REGION_DETAILS[region]
         }
         
-        print(f"Successfully listed {len(detailed_environments)} MWAA environments")
+        logger.info("Successfully listed %d MWAA environments", len(detailed_environments))
         
         return {
             CommonUtilsConstants.STATUS_KEY: CommonUtilsConstants.SUCCESS_KEY,
@@ -141,8 +229,7 @@ def list_all_mwaa_environments(environment: str, region: str) -> Dict[str, Any]:
         
     except ClientError as e:
         error_message = f"AWS Client Error while listing MWAA environments: {str(e)}"
-        print(error_message)
-        print(traceback.format_exc())
+        logger.exception(error_message)
         
         return {
             CommonUtilsConstants.STATUS_KEY: CommonUtilsConstants.FAILED_KEY,
@@ -151,8 +238,7 @@ def list_all_mwaa_environments(environment: str, region: str) -> Dict[str, Any]:
         
     except Exception as e:
         error_message = f"Error while listing MWAA environments: {str(e)}"
-        print(error_message)
-        print(traceback.format_exc())
+        logger.exception(error_message)
         
         return {
             CommonUtilsConstants.STATUS_KEY: CommonUtilsConstants.FAILED_KEY,
@@ -160,61 +246,241 @@ def list_all_mwaa_environments(environment: str, region: str) -> Dict[str, Any]:
         }
 
 
+def _read_response_content(response: Dict[str, Any]) -> Optional[str]:
+    """Return the Airflow REST API response of an invoke_rest_api call as text"""
+    resp_body = response.get(AirflowUtilsConstants.RESPONSE_BODY_KEY)
+    if resp_body:
+        return resp_body.read().decode("utf-8")
+    if response.get(AirflowUtilsConstants.REST_API_RESPONSE_KEY) is not None:
+        return json.dumps(response[AirflowUtilsConstants.REST_API_RESPONSE_KEY])
+    return None
+
+
+def _response_payload(response: Dict[str, Any]) -> Any:
+    """Return the undecoded Airflow REST API response: a streaming body or the parsed RestApiResponse"""
+    return response.get(AirflowUtilsConstants.RESPONSE_BODY_KEY) or \
+        response.get(AirflowUtilsConstants.REST_API_RESPONSE_KEY)
+
+
+class _RestApiResult(NamedTuple):
+    """Outcome of one invoke_rest_api call"""
+    http_status: Any
+    content: Any
+    retry_after: Optional[float]
+    aws_retries: int
+
+
+def _retry_signals(response: Dict[str, Any]) -> Tuple[Optional[float], int]:
+    """Retry-After seconds and botocore retry attempts from a response or ClientError.response"""
+    metadata = response.get(AirflowUtilsConstants.RESPONSE_METADATA_KEY, {})
+    headers = metadata.get(AirflowUtilsConstants.HTTP_HEADERS_KEY, {})
+    return (RateLimitUtils.parse_retry_after(headers.get(CommonUtilsConstants.RETRY_AFTER_HEADER)),
+            metadata.get(AirflowUtilsConstants.RETRY_ATTEMPTS_KEY, 0))
+
+
+def _call_rest_api(
+    mwaa_client,
+    airflow_environment_name: str,
+    path: str,
+    method: str,
+    body: Optional[Dict[str, Any]] = None,
+    query_parameters: Optional[Dict[str, Any]] = None,
+    stream_response: bool = False
+) -> _RestApiResult:
+    """
+    Call the Airflow REST API of an MWAA environment through invoke_rest_api
+    
+    Airflow-side errors (RestApiClientException/RestApiServerException) are returned as their
+    HTTP status code instead of being raised, so callers can treat every outcome uniformly.
+    With stream_response, a successful response's content is left undecoded (see _response_payload)
+    for JsonStreamUtils.iter_json_response; error content is always text.
+    
+    Returns:
+        _RestApiResult: Airflow HTTP status, response content as text or None, and the Retry-After
+                        and botocore retry count seen on the way
+    """
+    request_params = {
+        "Name": airflow_environment_name,
+        "Path": path,
+        "Method": method
+    }
+    if body is not None:
+        request_params["Body"] = body
+    if query_parameters:
+        request_params["QueryParameters"] = query_parameters
+
+    from botocore.exceptions import ClientError
+
+    try:
+        response = mwaa_client.invoke_rest_api(**request_params)
+    except ClientError as e:
+        if AirflowUtilsConstants.REST_API_STATUS_CODE_KEY not in e.response:
+            raise
+        return _RestApiResult(e.response[AirflowUtilsConstants.REST_API_STATUS_CODE_KEY],
+                              _read_response_content(e.response), *_retry_signals(e.response))
+
+    http_status = response.get(
+        AirflowUtilsConstants.REST_API_STATUS_CODE_KEY,
+        response.get(AirflowUtilsConstants.RESPONSE_METADATA_KEY, {}).get(
+            AirflowUtilsConstants.HTTP_STATUS_CODE_KEY, 'Unknown')
+    )
+    content = _response_payload(response) if stream_response else _read_response_content(response)
+    return _RestApiResult(http_status, content, *_retry_signals(response))
+
+
+def _retry_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff delay for the given retry attempt"""
+    ceiling = min(AirflowUtilsConstants.RETRY_MAX_DELAY_SECONDS,
+                  AirflowUtilsConstants.RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def _retry_wait(attempt: int, retry_after: Optional[float], throttled: bool) -> float:
+    """
+    Seconds a caller sleeps before retrying attempt: none when a throttle's Retry-After already paused the
+    shared limiter, the Retry-After of any other retryable response (e.g. a 500 or 504), else backoff
+    """
+    if throttled and retry_after:
+        return 0.0
+    if retry_after is not None:
+        return retry_after
+    return _retry_delay(attempt - 1)
+
+
+def _mwaa_rate_limiter(aws_region: str, airflow_environment_name: str) -> RateLimitUtils.AdaptiveRateLimiter:
+    """Adaptive rate limiter shared by every caller (threads and coroutines) of one MWAA environment"""
+    return RateLimitUtils.get_rate_limiter((aws_region, airflow_environment_name), **_rate_limit_settings)
+
+
+def set_mwaa_rate_limit(max_rate: Optional[float] = None, initial_rate: Optional[float] = None) -> None:
+    """
+    Change the request rate of MWAA REST API rate limiters created from now on
+
+    Args:
+        max_rate (float): Ceiling in requests per second per MWAA environment (default: MWAA_RATE_LIMIT_MAX)
+        initial_rate (float): Starting rate (default: MWAA_RATE_LIMIT_INITIAL, capped at max_rate)
+    """
+    max_rate = float(max_rate or AirflowUtilsConstants.MWAA_RATE_LIMIT_MAX)
+    if max_rate <= 0:
+        raise Exception(f"ERROR::Invalid MWAA rate limit: {max_rate}")
+    initial_rate = min(float(initial_rate or AirflowUtilsConstants.MWAA_RATE_LIMIT_INITIAL), max_rate)
+    _rate_limit_settings.update(
+        rate=initial_rate,
+        burst=min(AirflowUtilsConstants.MWAA_RATE_LIMIT_BURST, max(1.0, max_rate)),
+        min_rate=min(AirflowUtilsConstants.MWAA_RATE_LIMIT_MIN, max_rate),
+        max_rate=max_rate
+    )
+
+
+def _invoke_rest_api_with_retry(
+    mwaa_client,
+    airflow_environment_name: str,
+    path: str,
+    method: str,
+    body: Optional[Dict[str, Any]] = None,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES,
+    query_parameters: Optional[Dict[str, Any]] = None,
+    stream_response: bool = False
+) -> Tuple[Any, Any, int]:
+    """
+    Call the Airflow REST API through the environment's shared rate limiter, retrying throttled
+    and 5xx responses
+    
+    429/503 responses and throttling errors (including ones botocore already retried) slow the
+    shared limiter down; other responses let it speed up. A throttle's Retry-After pauses the limiter
+    for every caller, a Retry-After on any other retryable response delays this caller's retry, and
+    retries without one back off exponentially with full jitter.
+    AWS-side client errors are returned with a None status and the error text as content.
+    stream_response is passed to _call_rest_api.
+    
+    Returns:
+        tuple: (http_status, response content, number of attempts made)
+    """
+    from botocore.exceptions import ClientError
+
+    limiter = _mwaa_rate_limiter(mwaa_client.meta.region_name, airflow_environment_name)
+    attempt = 0
+    while True:
+        attempt += 1
+        limiter.acquire()
+        try:
+            result = _call_rest_api(mwaa_client, airflow_environment_name, path, method, body, query_parameters,
+                                    stream_response)
+            http_status, content, retry_after = result.http_status, result.content, result.retry_after
+            throttled = http_status in AirflowUtilsConstants.THROTTLE_STATUS_CODES or result.aws_retries > 0
+            retryable = http_status in AirflowUtilsConstants.RETRYABLE_STATUS_CODES
+        except ClientError as e:
+            http_status, content = None, str(e)
+            error_code = e.response.get("Error", {}).get("Code")
+            retry_after = _retry_signals(e.response)[0]
+            throttled = error_code in AirflowUtilsConstants.THROTTLING_ERROR_CODES
+            retryable = error_code in AirflowUtilsConstants.RETRYABLE_ERROR_CODES
+
+        if throttled:
+            limiter.on_throttle(retry_after)
+        elif not retryable:
+            limiter.on_success()
+
+        if not retryable or attempt > max_retries:
+            return http_status, content, attempt
+        MetricsUtils.record_client_retry(mwaa_client, AirflowUtilsConstants.INVOKE_REST_API_OPERATION)
+        wait = _retry_wait(attempt, retry_after, throttled)
+        if wait > 0:
+            time.sleep(wait)
+
+
 def create_variable(
     key: str,
     value: str,
     environment: str,
     region: str,
-    airflow_environment_name: str
+    airflow_environment_name: str,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES
 ) -> dict:
     """
     Create or update a variable in an MWAA environment via the REST API.
-    Prints result to the terminal.
+    Throttled and 5xx responses are retried up to max_retries times through the
+    environment's shared rate limiter. Logs the result.
     """
     try:
         mwaa_client = CommonUtils.get_boto3_client(
             AirflowUtilsConstants.MWAA_KEY, environment, region
         )
-        request_params = {
-            "Name": airflow_environment_name,
-            "Path": "/variables",
-            "Method": "POST",
-            "Body": {
-                "key": key,
-                "value": value,
-            }
+        body = {
+            "key": key,
+            "value": value,
         }
-        print(f"Creating variable with params: {request_params}")
+        logger.debug("Creating variable with params: %s", body)
 
-        response = mwaa_client.invoke_rest_api(**request_params)
-        http_status = response.get('ResponseMetadata', {}).get('HTTPStatusCode', 'Unknown')
-        print(f"HTTP Status: {http_status}")
-
-        resp_body = response.get("ResponseBody")
-        if resp_body:
-            try:
-                content = resp_body.read().decode("utf-8")
-                print(f"Response Body: {content}")
-            except Exception as e:
-                print(f"Could not read response body: {e}")
-                content = None
+        http_status, content, _ = _invoke_rest_api_with_retry(
+            mwaa_client,
+            airflow_environment_name,
+            AirflowUtilsConstants.VARIABLES_PATH,
+            AirflowUtilsConstants.POST_METHOD,
+            body,
+            max_retries
+        )
+        logger.debug("HTTP Status: %s", http_status)
+
+        if content is not None:
+            logger.debug("Response Body: %s", content)
         else:
-            content = None
-            print("No response body from API.")
+            logger.debug("No response body from API.")
 
-        if http_status == 200:
-            print("✅ Variable created/updated successfully.")
+        if http_status == AirflowUtilsConstants.HTTP_STATUS_OK:
+            logger.info("Variable %s created/updated successfully.", key)
         else:
-            print("❌ Failed to create/update variable.")
+            logger.error("Failed to create/update variable %s: HTTP %s", key, http_status)
 
         return {
-            "status": "success" if http_status == 200 else "failed",
+            "status": "success" if http_status == AirflowUtilsConstants.HTTP_STATUS_OK else "failed",
             "result": content,
-            "error": None if http_status == 200 else f"API returned status {http_status}"
+            "error": (None if http_status == AirflowUtilsConstants.HTTP_STATUS_OK
+                      else content if http_status is None else f"API returned status {http_status}")
         }
 
     except Exception as ex:
-        print(f"❌ Unable to create variable in Airflow: {ex}")
+        logger.error("Unable to create variable in Airflow: %s", ex)
         return {
             "status": "failed",
             "result": None,
@@ -233,10 +499,12 @@ def create_connection(
     extra: str,
     environment: str,
     region: str,
-    airflow_environment_name: str
+    airflow_environment_name: str,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES
 ) -> dict:
     """
     Create or update a connection in MWAA via Airflow REST API with explicit parameters.
+    Throttled and 5xx responses are retried through the environment's shared rate limiter.
 
     Args:
         connection_id: Connection ID
@@ -251,6 +519,7 @@ def create_connection(
         environment: Deployment environment (e.g., 'dev', 'prd')
         region: AWS region (e.g., 'us-east-1')
         airflow_environment_name: MWAA environment name
+        max_retries: Maximum retries of throttled/5xx responses
 
     Returns:
         dict with 'status', 'result', and 'error'
@@ -272,33 +541,744 @@ def create_connection(
             AirflowUtilsConstants.MWAA_KEY, environment, region
         )
 
-        request_params = {
-            "Name": airflow_environment_name,
-            "Path": "/connections",
-            "Method": "POST",
-            "Body": payload
-        }
-
-        print(f"Sending create connection request with payload: {payload}")
+        logger.debug("Sending create connection request with payload: %s", payload)
 
-        response = mwaa_client.invoke_rest_api(**request_params)
-
-        http_status = response.get('ResponseMetadata', {}).get('HTTPStatusCode', 'Unknown')
-        print(f"HTTP response code: {http_status}")
+        http_status, content, _ = _invoke_rest_api_with_retry(
+            mwaa_client,
+            airflow_environment_name,
+            AirflowUtilsConstants.CONNECTIONS_PATH,
+            AirflowUtilsConstants.POST_METHOD,
+            payload,
+            max_retries
+        )
+        logger.debug("HTTP response code: %s", http_status)
 
-        resp_body = response.get("ResponseBody")
-        content = None
-        if resp_body:
-            content = resp_body.read().decode("utf-8")
-            print(f"Response body: {content}")
+        if content is not None:
+            logger.debug("Response body: %s", content)
 
-        if http_status == 200:
-            print("✅ Connection created or updated successfully.")
+        if http_status == AirflowUtilsConstants.HTTP_STATUS_OK:
+            logger.info("Connection %s created or updated successfully.", connection_id)
             return {"status": "success", "result": content, "error": None}
         else:
-            print("❌ Failed to create or update connection.")
-            return {"status": "failed", "result": content, "error": f"HTTP {http_status}"}
+            logger.error("Failed to create or update connection %s: HTTP %s", connection_id, http_status)
+            return {"status": "failed", "result": content,
+                    "error": content if http_status is None else f"HTTP {http_status}"}
 
     except Exception as e:
-        print(f"❌ Exception during creating connection: {e}")
+        logger.error("Exception during creating connection %s: %s", connection_id, e)
         return {"status": "failed", "result": None, "error": str(e)}
+
+
+def _load_variables(mapping_or_file: Any) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (key, value) pairs from a dict, a JSON file or an iterable of records
+    
+    Accepted inputs:
+        - dict of {key: value}
+        - path to a JSON file holding either an `airflow variables export` mapping,
+          a list of {"key", "value"} records or a REST API listing with a "variables" list
+        - iterable of (key, value) tuples or {"key", "value"} records
+    """
+    if isinstance(mapping_or_file, (str, os.PathLike)):
+        with open(mapping_or_file, encoding="utf-8") as variables_file:
+            mapping_or_file = json.load(variables_file)
+
+    if isinstance(mapping_or_file, dict):
+        records = mapping_or_file.get(AirflowUtilsConstants.VARIABLES_RESPONSE_KEY)
+        if isinstance(records, list):
+            mapping_or_file = records
+        else:
+            yield from mapping_or_file.items()
+            return
+
+    for record in mapping_or_file:
+        if isinstance(record, dict):
+            yield (record[AirflowUtilsConstants.VARIABLE_KEY_KEY],
+                   record.get(AirflowUtilsConstants.VARIABLE_VALUE_KEY))
+        else:
+            key, value = record
+            yield key, value
+
+
+def _push_variable(mwaa_client, airflow_environment_name: str, key: str, value: Any,
+                   max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES) -> Dict[str, Any]:
+    """Create or update one variable, retrying transient failures, and return its result row"""
+    started = time.perf_counter()
+    attempts = 0
+    # Airflow stores variable values as text; exports hold JSON values as decoded objects
+    if not isinstance(value, str):
+        value = json.dumps(value)
+    try:
+        http_status, content, attempts = _invoke_rest_api_with_retry(
+            mwaa_client,
+            airflow_environment_name,
+            AirflowUtilsConstants.VARIABLES_PATH,
+            AirflowUtilsConstants.POST_METHOD,
+            {"key": key, "value": value},
+            max_retries
+        )
+        succeeded = http_status == AirflowUtilsConstants.HTTP_STATUS_OK
+        error = None if succeeded else f"API returned status {http_status}: {content}"
+    except Exception as ex:
+        http_status, succeeded, error = None, False, str(ex)
+        attempts = attempts or 1
+
+    return {
+        "key": key,
+        "status": CommonUtilsConstants.SUCCESS_KEY if succeeded else CommonUtilsConstants.FAILED_KEY,
+        "http_status": http_status,
+        "attempts": attempts,
+        "error": error,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+def _iter_variable_results(
+    mwaa_client,
+    airflow_environment_name: str,
+    variables: Iterable[Tuple[str, Any]],
+    max_in_flight: int,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES
+) -> Iterator[Dict[str, Any]]:
+    """Push variables through one client with at most max_in_flight requests outstanding"""
+    return CommonUtils.bounded_map(
+        lambda item: _push_variable(mwaa_client, airflow_environment_name, item[0], item[1], max_retries),
+        variables,
+        max_in_flight
+    )
+
+
+def bulk_create_variables(
+    mapping_or_file: Any,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    max_in_flight: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES
+) -> Dict[str, Any]:
+    """
+    Create or update many variables in an MWAA environment via the REST API
+    
+    All requests share one MWAA client and run concurrently with at most max_in_flight
+    requests outstanding, paced by the environment's adaptive rate limiter. Input is
+    consumed lazily.
+    
+    Args:
+        mapping_or_file: dict of variables, path to a JSON file (e.g. `airflow variables export`)
+                         or iterable of (key, value) pairs / {"key", "value"} records
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        airflow_environment_name (str): MWAA environment name
+        max_in_flight (int): Maximum number of concurrent requests
+        max_retries (int): Maximum retries per variable for throttled/5xx responses
+    
+    Returns:
+        dict: Response in the format:
+              {
+                  "status": "success/failed",
+                  "result": {
+                      "items": [{"key", "status", "http_status", "attempts", "error", "elapsed_ms"}, ...],
+                      "total": number_of_variables,
+                      "succeeded": number_succeeded,
+                      "failed": number_failed,
+                      "retries": total_retries,
+                      "elapsed_seconds": wall_clock_seconds
+                  },
+                  "error": "<Error message if failed>"
+              }
+    """
+    started = time.perf_counter()
+    try:
+        mwaa_client = CommonUtils.get_boto3_client(
+            AirflowUtilsConstants.MWAA_KEY, environment, region
+        )
+        logger.info("Pushing variables to %s with up to %d requests in flight", airflow_environment_name, max_in_flight)
+
+        items = list(_iter_variable_results(
+            mwaa_client, airflow_environment_name, _load_variables(mapping_or_file), max_in_flight, max_retries
+        ))
+        failed = sum(1 for item in items if item["status"] != CommonUtilsConstants.SUCCESS_KEY)
+        retries = sum(max(item["attempts"] - 1, 0) for item in items)
+        elapsed = round(time.perf_counter() - started, 3)
+        logger.info("Pushed %d/%d variables in %ss (%d retries)", len(items) - failed, len(items), elapsed, retries)
+
+        return {
+            "status": CommonUtilsConstants.SUCCESS_KEY if not failed else CommonUtilsConstants.FAILED_KEY,
+            "result": {
+                "items": items,
+                "total": len(items),
+                "succeeded": len(items) - failed,
+                "failed": failed,
+                "retries": retries,
+                "elapsed_seconds": elapsed
+            },
+            "error": None if not failed else f"{failed} of {len(items)} variables failed"
+        }
+
+    except Exception as ex:
+        logger.error("Unable to bulk create variables in Airflow: %s", ex)
+        return {
+            "status": CommonUtilsConstants.FAILED_KEY,
+            "result": None,
+            "error": str(ex)
+        }
+
+
+def _load_connections(connections_or_file: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Yield Airflow REST API connection payloads from records or an export file
+    
+    Accepted inputs:
+        - path to a JSON or YAML file written by `airflow connections export`
+          ({conn_id: {conn_type, host, ...}}) or holding a list of records
+        - the same mapping as a dict, or a REST API listing with a "connections" list
+        - iterable of records with a "connection_id" or "conn_id" field
+    """
+    if isinstance(connections_or_file, (str, os.PathLike)):
+        with open(connections_or_file, encoding="utf-8") as connections_file:
+            if str(connections_or_file).lower().endswith((".yaml", ".yml")):
+                import yaml
+
+                connections_or_file = yaml.safe_load(connections_file) or {}
+            else:
+                connections_or_file = json.load(connections_file)
+
+    if isinstance(connections_or_file, dict):
+        records = connections_or_file.get(AirflowUtilsConstants.CONNECTIONS_RESPONSE_KEY)
+        if isinstance(records, list):
+            connections_or_file = records
+        else:
+            connections_or_file = (
+                dict(record or {}, connection_id=conn_id) for conn_id, record in connections_or_file.items()
+            )
+
+    for record in connections_or_file:
+        payload = {
+            AirflowUtilsConstants.CONNECTION_ID_PAYLOAD_KEY: record.get(
+                AirflowUtilsConstants.CONNECTION_ID_PAYLOAD_KEY,
+                record.get(AirflowUtilsConstants.CONNECTION_ID_KEY))
+        }
+        for field in AirflowUtilsConstants.CONNECTION_PAYLOAD_FIELDS:
+            if record.get(field) is not None:
+                payload[field] = record[field]
+        if isinstance(payload.get(AirflowUtilsConstants.EXTRA_KEY), dict):
+            payload[AirflowUtilsConstants.EXTRA_KEY] = json.dumps(payload[AirflowUtilsConstants.EXTRA_KEY])
+        yield payload
+
+
+def _push_connection(
+    mwaa_client,
+    airflow_environment_name: str,
+    payload: Dict[str, Any],
+    max_retries: int
+) -> Dict[str, Any]:
+    """Create one connection, retrying transient failures, and return its report row"""
+    started = time.perf_counter()
+    attempts = 0
+    try:
+        http_status, content, attempts = _invoke_rest_api_with_retry(
+            mwaa_client,
+            airflow_environment_name,
+            AirflowUtilsConstants.CONNECTIONS_PATH,
+            AirflowUtilsConstants.POST_METHOD,
+            payload,
+            max_retries
+        )
+        succeeded = http_status == AirflowUtilsConstants.HTTP_STATUS_OK
+        error = None if succeeded else f"HTTP {http_status}: {content}"
+    except Exception as ex:
+        http_status, succeeded, error = None, False, str(ex)
+        attempts = attempts or 1
+
+    return {
+        "connection_id": payload[AirflowUtilsConstants.CONNECTION_ID_PAYLOAD_KEY],
+        "status": CommonUtilsConstants.SUCCESS_KEY if succeeded else CommonUtilsConstants.FAILED_KEY,
+        "http_status": http_status,
+        "attempts": attempts,
+        "error": error,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+def _iter_connection_results(
+    mwaa_client,
+    airflow_environment_name: str,
+    payloads: Iterable[Dict[str, Any]],
+    max_workers: int,
+    max_retries: int
+) -> Iterator[Dict[str, Any]]:
+    """Push connection payloads through one client on a bounded worker pool"""
+    return CommonUtils.bounded_map(
+        lambda payload: _push_connection(mwaa_client, airflow_environment_name, payload, max_retries),
+        payloads,
+        max_workers
+    )
+
+
+def bulk_create_connections(
+    connections_or_file: Any,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    max_workers: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES
+) -> Dict[str, Any]:
+    """
+    Create many connections in an MWAA environment via the REST API
+    
+    All requests share one MWAA client and run on a bounded worker pool. Throttled (429)
+    and 5xx responses are retried with jittered exponential backoff.
+    
+    Args:
+        connections_or_file: list of connection records, a connections export mapping or
+                             a path to an `airflow connections export` JSON/YAML file
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        airflow_environment_name (str): MWAA environment name
+        max_workers (int): Maximum number of concurrent requests
+        max_retries (int): Maximum retries per connection for transient failures
+    
+    Returns:
+        dict: Response in the format:
+              {
+                  "status": "success/failed",
+                  "result": {
+                      "items": [{"connection_id", "status", "http_status", "attempts",
+                                 "error", "elapsed_ms"}, ...],
+                      "total": number_of_connections,
+                      "succeeded": number_succeeded,
+                      "failed": number_failed,
+                      "retries": total_retries,
+                      "elapsed_seconds": wall_clock_seconds
+                  },
+                  "error": "<Error message if failed>"
+              }
+    """
+    started = time.perf_counter()
+    try:
+        mwaa_client = CommonUtils.get_boto3_client(
+            AirflowUtilsConstants.MWAA_KEY, environment, region
+        )
+        logger.info("Pushing connections to %s with %d workers", airflow_environment_name, max_workers)
+
+        items = list(_iter_connection_results(
+            mwaa_client, airflow_environment_name, _load_connections(connections_or_file), max_workers, max_retries
+        ))
+        failed = sum(1 for item in items if item["status"] != CommonUtilsConstants.SUCCESS_KEY)
+        retries = sum(max(item["attempts"] - 1, 0) for item in items)
+        elapsed = round(time.perf_counter() - started, 3)
+        logger.info("Pushed %d/%d connections in %ss (%d retries)", len(items) - failed, len(items), elapsed, retries)
+
+        return {
+            "status": CommonUtilsConstants.SUCCESS_KEY if not failed else CommonUtilsConstants.FAILED_KEY,
+            "result": {
+                "items": items,
+                "total": len(items),
+                "succeeded": len(items) - failed,
+                "failed": failed,
+                "retries": retries,
+                "elapsed_seconds": elapsed
+            },
+            "error": None if not failed else f"{failed} of {len(items)} connections failed"
+        }
+
+    except Exception as ex:
+        logger.error("Unable to bulk create connections in Airflow: %s", ex)
+        return {
+            "status": CommonUtilsConstants.FAILED_KEY,
+            "result": None,
+            "error": str(ex)
+        }
+
+
+def _iter_rest_collection(
+    mwaa_client,
+    airflow_environment_name: str,
+    path: str,
+    response_key: str,
+    page_size: int = AirflowUtilsConstants.DEFAULT_PAGE_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every item of an Airflow REST API collection (e.g. /variables), following limit/offset
+    
+    Items are yielded as they are decoded: a page is never re-serialized, and a streamed response
+    body is parsed incrementally, so memory stays bounded by one page whatever the collection size.
+    
+    Raises:
+        Exception: If a page cannot be fetched
+    """
+    offset = 0
+    while True:
+        http_status, content, _ = _invoke_rest_api_with_retry(
+            mwaa_client,
+            airflow_environment_name,
+            path,
+            AirflowUtilsConstants.GET_METHOD,
+            query_parameters={
+                AirflowUtilsConstants.LIMIT_KEY: page_size,
+                AirflowUtilsConstants.OFFSET_KEY: offset
+            },
+            stream_response=True
+        )
+        if http_status != AirflowUtilsConstants.HTTP_STATUS_OK:
+            raise Exception(f"GET {path} returned status {http_status}: {content}")
+
+        page_fields = {}
+        count = 0
+        for item in JsonStreamUtils.iter_json_response(content, response_key, page_fields):
+            count += 1
+            yield item
+
+        offset += count
+        if count < page_size or offset >= page_fields.get(AirflowUtilsConstants.TOTAL_ENTRIES_KEY, offset + 1):
+            break
+
+
+def _apply_change(
+    mwaa_client,
+    airflow_environment_name: str,
+    change: Tuple[str, str, str, str, Optional[Dict[str, Any]]],
+    max_retries: int
+) -> Dict[str, Any]:
+    """Send one (action, id, method, path, body) change and return its report row"""
+    action, identifier, method, path, body = change
+    started = time.perf_counter()
+    try:
+        http_status, content, attempts = _invoke_rest_api_with_retry(
+            mwaa_client, airflow_environment_name, path, method, body, max_retries
+        )
+        succeeded = http_status in (AirflowUtilsConstants.HTTP_STATUS_OK, AirflowUtilsConstants.HTTP_STATUS_NO_CONTENT)
+        error = None if succeeded else f"HTTP {http_status}: {content}"
+    except Exception as ex:
+        http_status, attempts, succeeded, error = None, 1, False, str(ex)
+
+    return {
+        "id": identifier,
+        "action": action,
+        "status": CommonUtilsConstants.SUCCESS_KEY if succeeded else CommonUtilsConstants.FAILED_KEY,
+        "http_status": http_status,
+        "attempts": attempts,
+        "error": error,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+def _sync(
+    kind: str,
+    mwaa_client,
+    airflow_environment_name: str,
+    changes: List[Tuple[str, str, str, str, Optional[Dict[str, Any]]]],
+    unchanged: int,
+    dry_run: bool,
+    max_workers: int,
+    max_retries: int,
+    started: float,
+    masked: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Apply a computed diff (unless dry_run) and build the sync report. masked lists ids whose current
+    value could not be compared and that were not written; like failed writes, they make the sync fail.
+    """
+    planned = {
+        action: [change[1] for change in changes if change[0] == action]
+        for action in (AirflowUtilsConstants.SYNC_CREATE,
+                       AirflowUtilsConstants.SYNC_UPDATE,
+                       AirflowUtilsConstants.SYNC_DELETE)
+    }
+    logger.info("%s diff for %s: %d to create, %d to update, %d to delete, %d unchanged",
+                kind, airflow_environment_name, len(planned[AirflowUtilsConstants.SYNC_CREATE]),
+                len(planned[AirflowUtilsConstants.SYNC_UPDATE]), len(planned[AirflowUtilsConstants.SYNC_DELETE]),
+                unchanged)
+
+    items = []
+    if not dry_run:
+        items = list(CommonUtils.bounded_map(
+            lambda change: _apply_change(mwaa_client, airflow_environment_name, change, max_retries),
+            changes,
+            max_workers
+        ))
+    failed = sum(1 for item in items if item["status"] != CommonUtilsConstants.SUCCESS_KEY)
+    masked = masked or []
+    errors = []
+    if failed:
+        errors.append(f"{failed} of {len(items)} {kind.lower()} changes failed")
+    if masked:
+        errors.append(f"{len(masked)} masked {kind.lower()} could not be compared and were not written "
+                      f"(overwrite_masked writes them)")
+
+    return {
+        "status": CommonUtilsConstants.SUCCESS_KEY if not errors else CommonUtilsConstants.FAILED_KEY,
+        "result": {
+            "created": planned[AirflowUtilsConstants.SYNC_CREATE],
+            "updated": planned[AirflowUtilsConstants.SYNC_UPDATE],
+            "deleted": planned[AirflowUtilsConstants.SYNC_DELETE],
+            "unchanged": unchanged,
+            "masked": masked,
+            "items": items,
+            "failed": failed,
+            "dry_run": dry_run,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        },
+        "error": "; ".join(errors) or None
+    }
+
+
+def sync_variables(
+    desired: Any,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    delete_missing: bool = False,
+    dry_run: bool = False,
+    max_workers: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES,
+    overwrite_masked: bool = False
+) -> Dict[str, Any]:
+    """
+    Make the variables of an MWAA environment match a desired state
+    
+    Reads the current variables through the REST API, diffs them against the desired state
+    and sends only the creates (POST), updates (PATCH) and, with delete_missing, deletes
+    needed. A repeat run with nothing changed costs only the listing calls. Variables with
+    sensitive keys come back masked ("***"), so their values cannot be compared. By default
+    they are left alone, reported under "masked" and the sync fails, since it cannot confirm
+    they match; with overwrite_masked they are always written (PATCH).
+    
+    Args:
+        desired: Desired variables, in any form accepted by bulk_create_variables
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        airflow_environment_name (str): MWAA environment name
+        delete_missing (bool): Delete variables that are not in the desired state
+        dry_run (bool): Compute and report the diff without applying it
+        max_workers (int): Maximum number of concurrent write requests
+        max_retries (int): Maximum retries per change for transient failures
+        overwrite_masked (bool): Write the desired value of every masked variable
+    
+    Returns:
+        dict: {"status", "result": {"created", "updated", "deleted", "unchanged", "masked", "items",
+               "failed", "dry_run", "elapsed_seconds"}, "error"}
+    """
+    started = time.perf_counter()
+    try:
+        mwaa_client = CommonUtils.get_boto3_client(
+            AirflowUtilsConstants.MWAA_KEY, environment, region
+        )
+        wanted = {
+            key: value if isinstance(value, str) else json.dumps(value)
+            for key, value in _load_variables(desired)
+        }
+        current = {
+            variable[AirflowUtilsConstants.VARIABLE_KEY_KEY]: variable.get(AirflowUtilsConstants.VARIABLE_VALUE_KEY)
+            for variable in _iter_rest_collection(
+                mwaa_client,
+                airflow_environment_name,
+                AirflowUtilsConstants.VARIABLES_PATH,
+                AirflowUtilsConstants.VARIABLES_RESPONSE_KEY
+            )
+        }
+
+        changes = []
+        masked = []
+        unchanged = 0
+        for key, value in wanted.items():
+            body = {AirflowUtilsConstants.VARIABLE_KEY_KEY: key, AirflowUtilsConstants.VARIABLE_VALUE_KEY: value}
+            if key not in current:
+                changes.append((AirflowUtilsConstants.SYNC_CREATE, key, AirflowUtilsConstants.POST_METHOD,
+                                AirflowUtilsConstants.VARIABLES_PATH, body))
+            elif current[key] == AirflowUtilsConstants.MASKED_VARIABLE_VALUE != value and not overwrite_masked:
+                masked.append(key)
+            elif current[key] != value:
+                changes.append((AirflowUtilsConstants.SYNC_UPDATE, key, AirflowUtilsConstants.PATCH_METHOD,
+                                f"{AirflowUtilsConstants.VARIABLES_PATH}/{quote(key, safe='')}", body))
+            else:
+                unchanged += 1
+        if delete_missing:
+            for key in current.keys() - wanted.keys():
+                changes.append((AirflowUtilsConstants.SYNC_DELETE, key, AirflowUtilsConstants.DELETE_METHOD,
+                                f"{AirflowUtilsConstants.VARIABLES_PATH}/{quote(key, safe='')}", None))
+
+        if masked:
+            logger.warning("%d variables in %s are masked and were not written: %s",
+                           len(masked), airflow_environment_name, ", ".join(masked))
+        return _sync("Variables", mwaa_client, airflow_environment_name, changes, unchanged,
+                     dry_run, max_workers, max_retries, started, masked)
+
+    except Exception as ex:
+        logger.error("Unable to sync variables in Airflow: %s", ex)
+        return {
+            "status": CommonUtilsConstants.FAILED_KEY,
+            "result": None,
+            "error": str(ex)
+        }
+
+
+def sync_connections(
+    desired: Any,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    delete_missing: bool = False,
+    dry_run: bool = False,
+    max_workers: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES
+) -> Dict[str, Any]:
+    """
+    Make the connections of an MWAA environment match a desired state
+    
+    Works like sync_variables. The Airflow REST API never returns passwords (and older
+    versions omit extra from listings), so only the fields present in the listing are
+    compared; change a non-returned field by deleting and re-creating the connection.
+    
+    Args:
+        desired: Desired connections, in any form accepted by bulk_create_connections
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        airflow_environment_name (str): MWAA environment name
+        delete_missing (bool): Delete connections that are not in the desired state
+        dry_run (bool): Compute and report the diff without applying it
+        max_workers (int): Maximum number of concurrent write requests
+        max_retries (int): Maximum retries per change for transient failures
+    
+    Returns:
+        dict: {"status", "result": {"created", "updated", "deleted", "unchanged", "masked" (always empty),
+               "items", "failed", "dry_run", "elapsed_seconds"}, "error"}
+    """
+    started = time.perf_counter()
+    try:
+        mwaa_client = CommonUtils.get_boto3_client(
+            AirflowUtilsConstants.MWAA_KEY, environment, region
+        )
+        wanted = {
+            payload[AirflowUtilsConstants.CONNECTION_ID_PAYLOAD_KEY]: payload
+            for payload in _load_connections(desired)
+        }
+        current = {
+            connection[AirflowUtilsConstants.CONNECTION_ID_PAYLOAD_KEY]: connection
+            for connection in _iter_rest_collection(
+                mwaa_client,
+                airflow_environment_name,
+                AirflowUtilsConstants.CONNECTIONS_PATH,
+                AirflowUtilsConstants.CONNECTIONS_RESPONSE_KEY
+            )
+        }
+
+        changes = []
+        unchanged = 0
+        for connection_id, payload in wanted.items():
+            path = f"{AirflowUtilsConstants.CONNECTIONS_PATH}/{quote(connection_id, safe='')}"
+            existing = current.get(connection_id)
+            if existing is None:
+                changes.append((AirflowUtilsConstants.SYNC_CREATE, connection_id, AirflowUtilsConstants.POST_METHOD,
+                                AirflowUtilsConstants.CONNECTIONS_PATH, payload))
+            elif any(field in existing and existing[field] != value for field, value in payload.items()):
+                changes.append((AirflowUtilsConstants.SYNC_UPDATE, connection_id, AirflowUtilsConstants.PATCH_METHOD,
+                                path, payload))
+            else:
+                unchanged += 1
+        if delete_missing:
+            for connection_id in current.keys() - wanted.keys():
+                changes.append((AirflowUtilsConstants.SYNC_DELETE, connection_id, AirflowUtilsConstants.DELETE_METHOD,
+                                f"{AirflowUtilsConstants.CONNECTIONS_PATH}/{quote(connection_id, safe='')}", None))
+
+        return _sync("Connections", mwaa_client, airflow_environment_name, changes, unchanged,
+                     dry_run, max_workers, max_retries, started)
+
+    except Exception as ex:
+        logger.error("Unable to sync connections in Airflow: %s", ex)
+        return {
+            "status": CommonUtilsConstants.FAILED_KEY,
+            "result": None,
+            "error": str(ex)
+        }
+
+
+def _inventory_target(target: Tuple[str, str], max_workers: int) -> Dict[str, Any]:
+    """List one (environment, region) target and time it"""
+    environment, region = target
+    started = time.perf_counter()
+    response = list_all_mwaa_environments(environment, region, max_workers)
+    succeeded = response.get(CommonUtilsConstants.STATUS_KEY) == CommonUtilsConstants.SUCCESS_KEY
+    environments = response.get(CommonUtilsConstants.RESULT_KEY, {}).get("environments", []) if succeeded else []
+
+    return {
+        "environment": environment,
+        "region": region,
+        "status": CommonUtilsConstants.SUCCESS_KEY if succeeded else CommonUtilsConstants.FAILED_KEY,
+        "count": len(environments),
+        "failed_details": sum(1 for env in environments if "error" in env),
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        "error": None if succeeded else response.get("error"),
+        "environments": environments
+    }
+
+
+def get_mwaa_inventory(
+    targets: Optional[List[Tuple[str, str]]] = None,
+    max_workers: Optional[int] = None,
+    max_detail_workers: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY
+) -> Dict[str, Any]:
+    """
+    Lists MWAA environments across many (environment, region) targets in parallel
+    
+    Each target uses its own pooled MWAA client, so the nine dev/tst/prd x us/eu/jp
+    combinations are queried concurrently instead of one after another.
+    
+    Args:
+        targets (list): (environment, region) pairs; defaults to every combination of
+                        VALID_ENVIRONMENTS and VALID_REGIONS
+        max_workers (int): Maximum number of targets queried at once (default: all)
+        max_detail_workers (int): Maximum concurrent get_environment calls per target
+    
+    Returns:
+        dict: Response in the format:
+              {
+                  "status": "success/failed",
+                  "result": {
+                      "environments": [environment details + "target_environment"/"target_region"],
+                      "count": total_number_of_environments,
+                      "targets": [{"environment", "region", "status", "count", "failed_details",
+                                   "latency_ms", "error"}, ...],
+                      "elapsed_seconds": wall_clock_seconds
+                  },
+                  "error": "<Summary of failed targets if any failed>"
+              }
+    """
+    started = time.perf_counter()
+    if targets is None:
+        targets = [
+            (environment, region)
+            for environment in AirflowUtilsConstants.VALID_ENVIRONMENTS
+            for region in AirflowUtilsConstants.VALID_REGIONS
+        ]
+    logger.info("Building MWAA inventory for %d targets", len(targets))
+
+    environments = []
+    target_reports = []
+    for report in CommonUtils.bounded_map(
+        lambda target: _inventory_target(target, max_detail_workers),
+        targets,
+        max_workers or len(targets) or 1
+    ):
+        for env in report.pop("environments"):
+            env["target_environment"] = report["environment"]
+            env["target_region"] = report["region"]
+            environments.append(env)
+        target_reports.append(report)
+
+    failed = [report for report in target_reports if report["status"] != CommonUtilsConstants.SUCCESS_KEY]
+    logger.info("Inventory found %d environments across %d targets (%d failed)",
+                len(environments), len(targets), len(failed))
+
+    return {
+        CommonUtilsConstants.STATUS_KEY: CommonUtilsConstants.SUCCESS_KEY if not failed else CommonUtilsConstants.FAILED_KEY,
+        CommonUtilsConstants.RESULT_KEY: {
+            "environments": environments,
+            "count": len(environments),
+            "targets": target_reports,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        },
+        "error": None if not failed else "; ".join(
+            f"{report['environment']}/{report['region']}: {report['error']}" for report in failed
+        )
+    }
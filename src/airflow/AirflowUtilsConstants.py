@@ -173,6 +173,7 @@ CONNECTIONS_PATH = "/connections"
 GET_METHOD = "GET"
 POST_METHOD = "POST"
 PUT_METHOD = "PUT"
+PATCH_METHOD = "PATCH"
 DELETE_METHOD = "DELETE"
 
 # Response Keys
@@ -186,6 +187,12 @@ STATUS_CREATING = "CREATING"
 STATUS_DELETING = "DELETING"
 STATUS_UPDATING = "UPDATING"
 STATUS_UPDATE_FAILED = "UPDATE_FAILED"
+STATUS_DELETED = "DELETED"
+STATUS_UNAVAILABLE = "UNAVAILABLE"
+STATUS_ROLLING_BACK = "ROLLING_BACK"
+STATUS_CREATING_SNAPSHOT = "CREATING_SNAPSHOT"
+STATUS_PENDING = "PENDING"
+STATUS_MAINTENANCE = "MAINTENANCE"
 
 # Environment Details Keys
 NAME_KEY = "Name"
@@ -280,3 +287,157 @@ ENVIRONMENT_NAME_KEY = "environment_name"
 NEXT_TOKEN_KEY = "NextToken"
 MAX_RESULTS_KEY = "MaxResults"
 DEFAULT_MAX_RESULTS = 25
+
+# Concurrency
+DEFAULT_MAX_CONCURRENCY = 8
+
+# MWAA REST API response keys
+REST_API_STATUS_CODE_KEY = "RestApiStatusCode"
+REST_API_RESPONSE_KEY = "RestApiResponse"
+RESPONSE_BODY_KEY = "ResponseBody"
+RESPONSE_METADATA_KEY = "ResponseMetadata"
+HTTP_STATUS_CODE_KEY = "HTTPStatusCode"
+HTTP_STATUS_OK = 200
+
+# Retry
+RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+RETRYABLE_ERROR_CODES = ["ThrottlingException", "TooManyRequestsException", "InternalServerException"]
+DEFAULT_MAX_RETRIES = 5
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 20
+THROTTLE_STATUS_CODES = [429, 503]
+THROTTLING_ERROR_CODES = ["ThrottlingException", "TooManyRequestsException"]
+HTTP_HEADERS_KEY = "HTTPHeaders"
+RETRY_ATTEMPTS_KEY = "RetryAttempts"
+
+# Client-side rate limit per MWAA environment (requests per second), adapted to throttling
+MWAA_RATE_LIMIT_INITIAL = 20.0
+MWAA_RATE_LIMIT_BURST = 20.0
+MWAA_RATE_LIMIT_MIN = 0.5
+MWAA_RATE_LIMIT_MAX = 200.0
+
+# Connection payload fields accepted by the Airflow REST API
+CONNECTION_PAYLOAD_FIELDS = ["conn_type", "description", "host", "login", "password", "schema", "port", "extra"]
+CONNECTION_ID_PAYLOAD_KEY = "connection_id"
+
+# Airflow REST API listing and sync
+LIMIT_KEY = "limit"
+OFFSET_KEY = "offset"
+TOTAL_ENTRIES_KEY = "total_entries"
+DEFAULT_PAGE_SIZE = 100
+HTTP_STATUS_NO_CONTENT = 204
+SYNC_CREATE = "create"
+SYNC_UPDATE = "update"
+SYNC_DELETE = "delete"
+# Value the Airflow REST API returns for variables with sensitive keys (secrets masker)
+MASKED_VARIABLE_VALUE = "***"
+
+# MWAA HTTP API (used by the async helpers)
+MWAA_SIGNING_NAME = "airflow"
+MWAA_API_HOST_PREFIX = "api."
+MWAA_ENV_HOST_PREFIX = "env."
+ENVIRONMENTS_API_PATH = "/environments"
+RESTAPI_API_PATH = "/restapi"
+AMZN_ERROR_TYPE_HEADER = "x-amzn-ErrorType"
+DEFAULT_HTTP_TIMEOUT_SECONDS = 60
+
+# Pools
+POOLS_PATH = "/pools"
+POOLS_RESPONSE_KEY = "pools"
+POOL_NAME_KEY = "name"
+POOL_PAYLOAD_FIELDS = ["name", "slots", "description", "include_deferred"]
+HTTP_STATUS_CONFLICT = 409
+
+# Snapshots
+SNAPSHOT_FORMAT = "mwaa-snapshot"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER_TYPE = "header"
+SNAPSHOT_FOOTER_TYPE = "footer"
+SNAPSHOT_VARIABLE_TYPE = "variable"
+SNAPSHOT_CONNECTION_TYPE = "connection"
+SNAPSHOT_POOL_TYPE = "pool"
+SNAPSHOT_RECORD_TYPES = ["variable", "connection", "pool"]
+SNAPSHOT_MAX_REPORTED_FAILURES = 100
+
+# Metrics operation names (match the "<service>.<operation>" names recorded for boto3 calls)
+INVOKE_REST_API_OPERATION = "mwaa.invoke_rest_api"
+GET_ENVIRONMENT_OPERATION = "mwaa.get_environment"
+LIST_ENVIRONMENTS_OPERATION = "mwaa.list_environments"
+
+# DAG deployment to the MWAA source bucket
+S3_KEY = "s3"
+S3_ARN_PREFIX = "arn:aws:s3:::"
+DEPLOY_MANIFEST_PREFIX = ".mwaa-deploy/"
+DEPLOY_MANIFEST_VERSION = 1
+DAG_SYNC_EXCLUDE_PATTERNS = [".git", "__pycache__", "*.pyc", ".DS_Store"]
+S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+S3_TRANSFER_MAX_CONCURRENCY = 4
+S3_DELETE_BATCH_SIZE = 1000
+FILE_HASH_READ_SIZE = 1024 * 1024
+S3_NOT_FOUND_ERROR_CODES = ["NoSuchKey", "404", "NotFound"]
+
+# Plugins and requirements artifacts (content-addressed through S3 object metadata)
+PLUGINS_S3_PATH_KEY = "PluginsS3Path"
+PLUGINS_S3_OBJECT_VERSION_KEY = "PluginsS3ObjectVersion"
+REQUIREMENTS_S3_PATH_KEY = "RequirementsS3Path"
+REQUIREMENTS_S3_OBJECT_VERSION_KEY = "RequirementsS3ObjectVersion"
+PLUGINS_ZIP_S3_PATH = f"{PLUGINS_S3_PATH}.zip"
+ARTIFACT_HASH_METADATA_KEY = "content-sha256"
+PLUGINS_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+PLUGINS_ZIP_FILE_MODE = 0o644
+PLUGINS_ZIP_COMPRESS_LEVEL = 9
+
+# Environment provisioning (CreateEnvironment / UpdateEnvironment request fields)
+LOGGING_CONFIGURATION_KEY = "LoggingConfiguration"
+WEEKLY_MAINTENANCE_WINDOW_START_KEY = "WeeklyMaintenanceWindowStart"
+AIRFLOW_CONFIGURATION_OPTIONS_KEY = "AirflowConfigurationOptions"
+MIN_WEBSERVERS_KEY = "MinWebservers"
+MAX_WEBSERVERS_KEY = "MaxWebservers"
+KMS_KEY_KEY = "KmsKey"
+LOG_LEVEL_KEY = "LogLevel"
+LOG_ENABLED_KEY = "Enabled"
+ENVIRONMENT_UPDATABLE_FIELDS = [
+    "ExecutionRoleArn", "AirflowConfigurationOptions", "AirflowVersion", "DagS3Path", "EnvironmentClass",
+    "LoggingConfiguration", "MaxWorkers", "MinWorkers", "MaxWebservers", "MinWebservers", "NetworkConfiguration",
+    "PluginsS3Path", "PluginsS3ObjectVersion", "RequirementsS3Path", "RequirementsS3ObjectVersion", "Schedulers",
+    "SourceBucketArn", "StartupScriptS3Path", "StartupScriptS3ObjectVersion", "WebserverAccessMode",
+    "WeeklyMaintenanceWindowStart"
+]
+# Fields that can only be set by CreateEnvironment (NetworkConfiguration updates take only SecurityGroupIds)
+ENVIRONMENT_CREATE_ONLY_FIELDS = ["KmsKey", "EndpointManagement"]
+UPDATABLE_NETWORK_FIELDS = ["SecurityGroupIds"]
+ENVIRONMENT_NAME_LETTERS = {"dev": "D", "tst": "T", "prd": "P"}
+PROVISION_CREATED = "created"
+PROVISION_UPDATED = "updated"
+PROVISION_UNCHANGED = "unchanged"
+RESOURCE_NOT_FOUND_ERROR_CODE = "ResourceNotFoundException"
+
+# Environment status waiter
+WAITER_TRANSITIONAL_STATUSES = [STATUS_CREATING, STATUS_UPDATING, STATUS_DELETING, STATUS_ROLLING_BACK,
+                                STATUS_CREATING_SNAPSHOT, STATUS_PENDING, STATUS_MAINTENANCE]
+WAITER_FAILED_STATUSES = [AIRFLOW_STATUS_FAILED_KEY, STATUS_UPDATE_FAILED, STATUS_UNAVAILABLE, STATUS_DELETED]
+WAITER_MIN_POLL_SECONDS = 5.0
+WAITER_MAX_POLL_SECONDS = 60.0
+WAITER_BACKOFF = 1.5
+LAST_UPDATE_FAILED = "FAILED"
+WAIT_SUCCEEDED = "succeeded"
+WAIT_FAILED = "failed"
+WAIT_TIMED_OUT = "timed_out"
+
+# CloudWatch log retrieval (boto3 names the CloudWatch Logs service "logs")
+LOGS_KEY = "logs"
+LOG_GROUP_CONFIGURATION_KEYS = {
+    "Task": "TaskLogs",
+    "Scheduler": "SchedulerLogs",
+    "DAGProcessing": "DagProcessingLogs",
+    "WebServer": "WebserverLogs",
+    "Worker": "WorkerLogs"
+}
+CLOUDWATCH_LOG_GROUP_ARN_KEY = "CloudWatchLogGroupArn"
+LOG_GROUP_ARN_SEPARATOR = ":log-group:"
+LOG_DEFAULT_SINCE_SECONDS = 3600
+LOG_EVENTS_BUFFER_SIZE = 1000
+LOG_FOLLOW_POLL_SECONDS = 2.0
+LOG_FOLLOW_INGESTION_LAG_SECONDS = 30
+LOG_RETRYABLE_ERROR_CODES = ["ThrottlingException", "ServiceUnavailableException", "LimitExceededException"]
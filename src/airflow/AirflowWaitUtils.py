@@ -0,0 +1,327 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+AirflowWaitUtils.py - Wait for MWAA environments to finish CREATING, UPDATING or DELETING
+Tech Description: One waiter tracks any number of environments from the calling thread. Each environment
+                  is polled on its own adaptive schedule: right away, then at intervals that grow while the
+                  status stays the same and reset when it changes, and that back off further on throttling.
+                  Polls are grouped per account (environment tier and region): environments of an account
+                  that are nearly due are checked in the same round, and all deletions of an account are
+                  settled by one ListEnvironments call instead of one GetEnvironment each. Each environment
+                  has its own timeout and an optional callback run when it finishes; after an update, AVAILABLE
+                  only counts once the update is known to have run (require_transition).
+Pre_requisites: Requires AirflowUtils.py, AirflowUtilsConstants.py, CommonUtils.py and DLPLogSetup.py
+"""
+
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils import CommonUtils, CommonUtilsConstants
+from utils.DLPLogSetup import get_logger
+from . import AirflowUtils, AirflowUtilsConstants
+
+logger = get_logger(__name__)
+
+
+class _TrackedEnvironment:
+    """Wait state of one environment"""
+
+    def __init__(self, environment: str, region: str, name: str, target: str, timeout: float,
+                 callback: Optional[Callable[[Dict[str, Any]], None]], interval: float, now: float,
+                 require_transition: bool = False, since: Optional[float] = None):
+        self.environment = environment
+        self.region = region
+        self.name = name
+        self.target = target
+        self.callback = callback
+        self.require_transition = require_transition
+        self.since = since
+        self.started = now
+        self.deadline = now + timeout
+        self.interval = interval
+        self.next_poll = now
+        self.status: Optional[str] = None
+        self.seen_transition = False
+        self.polls = 0
+        self.outcome: Optional[str] = None
+        self.error: Optional[str] = None
+        self.finished: Optional[float] = None
+
+    def record(self) -> Dict[str, Any]:
+        """Result entry reported for this environment"""
+        return {
+            "name": self.name,
+            "environment": self.environment,
+            "region": self.region,
+            "target": self.target,
+            "status": self.status,
+            "outcome": self.outcome,
+            "error": self.error,
+            "polls": self.polls,
+            "elapsed_seconds": round((self.finished or self.started) - self.started, 3)
+        }
+
+
+def _updated_since(last_update: Dict[str, Any], since: Optional[float]) -> bool:
+    """Whether a LastUpdate structure describes an update created at or after since (epoch seconds)"""
+    created_at = last_update.get(AirflowUtilsConstants.CREATED_AT_KEY)
+    if created_at is None or since is None:
+        return False
+    if isinstance(created_at, datetime):
+        created_at = created_at.timestamp()
+    return float(created_at) >= since
+
+
+class EnvironmentWaiter:
+    """
+    Wait for many MWAA environments at once from a single thread
+
+    Usage:
+        waiter = EnvironmentWaiter()
+        waiter.add("dev", "us", "MWAA1USVGA00000D000")
+        waiter.add("dev", "us", "MWAA1USVGA00000D001", target=AirflowUtilsConstants.STATUS_DELETED)
+        result = waiter.wait()
+    """
+
+    def __init__(
+        self,
+        min_poll_seconds: float = AirflowUtilsConstants.WAITER_MIN_POLL_SECONDS,
+        max_poll_seconds: float = AirflowUtilsConstants.WAITER_MAX_POLL_SECONDS,
+        backoff: float = AirflowUtilsConstants.WAITER_BACKOFF,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.min_poll_seconds = min_poll_seconds
+        self.max_poll_seconds = max_poll_seconds
+        self.backoff = backoff
+        self._clock = clock
+        self._sleep = sleep
+        self._pending: List[_TrackedEnvironment] = []
+        self._finished: List[_TrackedEnvironment] = []
+        self.api_calls = Counter()
+
+    def add(
+        self,
+        environment: str,
+        region: str,
+        airflow_environment_name: str,
+        target: str = AirflowUtilsConstants.AIRFLOW_STATUS_AVAILABLE_KEY,
+        timeout: float = AirflowUtilsConstants.TIMEOUT_KEY,
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        require_transition: bool = False,
+        since: Optional[float] = None
+    ) -> None:
+        """
+        Track an environment until it reaches target
+
+        Args:
+            environment (str): Target environment (dev/tst/prd)
+            region (str): Target region (us/eu/jp)
+            airflow_environment_name (str): MWAA environment name
+            target (str): AVAILABLE (after a create/update) or DELETED
+            timeout (float): Seconds to wait for this environment
+            callback: Called with the environment's result entry when it finishes
+            require_transition (bool): Only accept AVAILABLE once the environment was seen in a transitional
+                                       status or its LastUpdate was created at or after since, so that the
+                                       status from before an update that has not started yet is not success
+            since (float): Epoch seconds the update was requested at (default: now)
+        """
+        if target not in (AirflowUtilsConstants.AIRFLOW_STATUS_AVAILABLE_KEY, AirflowUtilsConstants.STATUS_DELETED):
+            raise Exception(f"Invalid wait target: {target}")
+        self._pending.append(_TrackedEnvironment(environment, region, airflow_environment_name, target, timeout,
+                                                 callback, self.min_poll_seconds, self._clock(), require_transition,
+                                                 time.time() if since is None else since))
+
+    def _finish(self, tracked: _TrackedEnvironment, outcome: str, error: Optional[str] = None) -> None:
+        """Move an environment to the finished list and run its callback"""
+        tracked.outcome, tracked.error, tracked.finished = outcome, error, self._clock()
+        self._pending.remove(tracked)
+        self._finished.append(tracked)
+        logger.info("%s: %s (%s) after %d polls", tracked.name, outcome, tracked.status, tracked.polls)
+        if tracked.callback is not None:
+            try:
+                tracked.callback(tracked.record())
+            except Exception as ex:
+                logger.error("Wait callback for %s failed: %s", tracked.name, ex)
+
+    def _reschedule(self, tracked: _TrackedEnvironment, changed: bool, factor: float = 1.0) -> None:
+        """Schedule the next poll: soon after a status change, further apart while nothing changes"""
+        if changed:
+            tracked.interval = self.min_poll_seconds
+        else:
+            tracked.interval = min(self.max_poll_seconds, tracked.interval * self.backoff * factor)
+        tracked.next_poll = min(self._clock() + tracked.interval, tracked.deadline)
+
+    def _observe(self, tracked: _TrackedEnvironment, status: str, details: Optional[Dict[str, Any]] = None) -> None:
+        """Record a polled status and finish the environment when it reached a final state"""
+        changed = status != tracked.status
+        tracked.status = status
+        tracked.polls += 1
+        if status in AirflowUtilsConstants.WAITER_TRANSITIONAL_STATUSES:
+            tracked.seen_transition = True
+            self._reschedule(tracked, changed)
+            return
+
+        if tracked.target == AirflowUtilsConstants.STATUS_DELETED:
+            if status == AirflowUtilsConstants.STATUS_DELETED:
+                self._finish(tracked, AirflowUtilsConstants.WAIT_SUCCEEDED)
+            elif tracked.seen_transition:
+                self._finish(tracked, AirflowUtilsConstants.WAIT_FAILED, f"Environment is {status}")
+            else:
+                # The delete has not started yet
+                self._reschedule(tracked, changed)
+            return
+
+        if status == AirflowUtilsConstants.AIRFLOW_STATUS_AVAILABLE_KEY:
+            last_update = (details or {}).get(AirflowUtilsConstants.LAST_UPDATE_KEY) or {}
+            if not tracked.seen_transition and _updated_since(last_update, tracked.since):
+                # The whole update ran between two polls
+                tracked.seen_transition = True
+            if tracked.require_transition and not tracked.seen_transition:
+                # The update has not started yet
+                self._reschedule(tracked, changed)
+            elif tracked.seen_transition and last_update.get("Status") == AirflowUtilsConstants.LAST_UPDATE_FAILED:
+                self._finish(tracked, AirflowUtilsConstants.WAIT_FAILED,
+                             str(last_update.get("Error") or "Update failed and was rolled back"))
+            else:
+                self._finish(tracked, AirflowUtilsConstants.WAIT_SUCCEEDED)
+        elif status in AirflowUtilsConstants.WAITER_FAILED_STATUSES:
+            self._finish(tracked, AirflowUtilsConstants.WAIT_FAILED, f"Environment is {status}")
+        else:
+            self._reschedule(tracked, changed)
+
+    def _poll_account(self, account: Tuple[str, str], due: List[_TrackedEnvironment]) -> None:
+        """Check the due environments of one account, deletions with a single ListEnvironments"""
+        from botocore.exceptions import ClientError
+
+        mwaa_client = CommonUtils.get_boto3_client(AirflowUtilsConstants.MWAA_KEY, *account)
+        deletions = [tracked for tracked in due if tracked.target == AirflowUtilsConstants.STATUS_DELETED]
+        remaining = [tracked for tracked in due if tracked not in deletions]
+        try:
+            if deletions:
+                self.api_calls["list_environments"] += 1
+                existing = set(AirflowUtils._iter_environment_names(mwaa_client))
+                for tracked in deletions:
+                    if tracked.name in existing:
+                        # Still listed: keep its last known status (DELETING once the delete started)
+                        self._observe(tracked, tracked.status or AirflowUtilsConstants.STATUS_DELETING)
+                    else:
+                        self._observe(tracked, AirflowUtilsConstants.STATUS_DELETED)
+
+            for tracked in remaining:
+                self.api_calls["get_environment"] += 1
+                try:
+                    details = mwaa_client.get_environment(Name=tracked.name)[AirflowUtilsConstants.ENVIRONMENT_KEY]
+                except ClientError as e:
+                    if e.response.get("Error", {}).get("Code") != AirflowUtilsConstants.RESOURCE_NOT_FOUND_ERROR_CODE:
+                        raise
+                    self._observe(tracked, AirflowUtilsConstants.STATUS_DELETED)
+                else:
+                    self._observe(tracked, details.get(AirflowUtilsConstants.STATUS_KEY), details)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            throttled = code in AirflowUtilsConstants.RETRYABLE_ERROR_CODES
+            self.api_calls["throttled" if throttled else "errors"] += 1
+            logger.warning("Status check for %s/%s failed (%s); backing off", account[0], account[1], code)
+            # Leave the rest of this account's round for later, further apart
+            for tracked in due:
+                if tracked in self._pending and tracked.next_poll <= self._clock():
+                    self._reschedule(tracked, False, 2.0 if throttled else 1.0)
+
+    def poll(self) -> float:
+        """
+        Run one polling round and time out overdue environments
+
+        Returns:
+            float: Seconds until the next environment is due (0 when nothing is pending)
+        """
+        now = self._clock()
+        due_accounts = {(tracked.environment, tracked.region) for tracked in self._pending
+                        if tracked.next_poll <= now}
+        for account in sorted(due_accounts):
+            # Environments of the account due within min_poll_seconds join this round
+            due = [tracked for tracked in self._pending if (tracked.environment, tracked.region) == account
+                   and tracked.next_poll <= now + self.min_poll_seconds]
+            try:
+                self._poll_account(account, due)
+            except Exception as ex:
+                logger.error("Status check for %s/%s failed: %s", account[0], account[1], ex)
+                self.api_calls["errors"] += 1
+                for tracked in due:
+                    if tracked in self._pending:
+                        self._reschedule(tracked, False)
+
+        now = self._clock()
+        for tracked in [tracked for tracked in self._pending if now >= tracked.deadline]:
+            self._finish(tracked, AirflowUtilsConstants.WAIT_TIMED_OUT,
+                         f"Timed out waiting for {tracked.target} (last status {tracked.status})")
+        if not self._pending:
+            return 0.0
+        return max(0.0, min(tracked.next_poll for tracked in self._pending) - self._clock())
+
+    def wait(self) -> Dict[str, Any]:
+        """
+        Poll until every tracked environment succeeded, failed or timed out
+
+        Returns:
+            dict: {"status", "result": {"environments": [per-environment results], "succeeded", "failed",
+                   "timed_out", "api_calls"}, "error"}
+        """
+        while self._pending:
+            delay = self.poll()
+            if self._pending and delay > 0:
+                self._sleep(delay)
+
+        environments = [tracked.record() for tracked in self._finished]
+        counts = Counter(environment["outcome"] for environment in environments)
+        unsuccessful = len(environments) - counts[AirflowUtilsConstants.WAIT_SUCCEEDED]
+        return {
+            "status": CommonUtilsConstants.SUCCESS_KEY if not unsuccessful else CommonUtilsConstants.FAILED_KEY,
+            "result": {
+                "environments": environments,
+                "succeeded": counts[AirflowUtilsConstants.WAIT_SUCCEEDED],
+                "failed": counts[AirflowUtilsConstants.WAIT_FAILED],
+                "timed_out": counts[AirflowUtilsConstants.WAIT_TIMED_OUT],
+                "api_calls": dict(self.api_calls)
+            },
+            "error": None if not unsuccessful else f"{unsuccessful} environments did not reach their target"
+        }
+
+
+def wait_for_environments(
+    targets: Iterable[Dict[str, Any]],
+    timeout: float = AirflowUtilsConstants.TIMEOUT_KEY,
+    callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    min_poll_seconds: float = AirflowUtilsConstants.WAITER_MIN_POLL_SECONDS,
+    max_poll_seconds: float = AirflowUtilsConstants.WAITER_MAX_POLL_SECONDS
+) -> Dict[str, Any]:
+    """
+    Wait for a set of environments with one EnvironmentWaiter
+
+    Args:
+        targets: Dicts with "environment", "region", "name" and optionally "target" (AVAILABLE/DELETED),
+                 "timeout" (seconds, overriding timeout), "require_transition" and "since" (see
+                 EnvironmentWaiter.add)
+        timeout (float): Default seconds to wait per environment
+        callback: Called with each environment's result entry when it finishes
+        min_poll_seconds (float): Poll interval after a status change
+        max_poll_seconds (float): Longest interval between polls of one environment
+
+    Returns:
+        dict: EnvironmentWaiter.wait() result
+    """
+    waiter = EnvironmentWaiter(min_poll_seconds, max_poll_seconds)
+    try:
+        for target in targets:
+            waiter.add(target["environment"], target["region"], target["name"],
+                       target.get("target", AirflowUtilsConstants.AIRFLOW_STATUS_AVAILABLE_KEY),
+                       target.get("timeout", timeout), callback, target.get("require_transition", False),
+                       target.get("since"))
+    except Exception as ex:
+        logger.error("Unable to wait for MWAA environments: %s", ex)
+        return {"status": CommonUtilsConstants.FAILED_KEY, "result": None, "error": str(ex)}
+    return waiter.wait()
@@ -1,17 +1,85 @@
 """
 Airflow utilities package for AWS MWAA management
+
+Names are imported from their modules on first access (module __getattr__), so importing the
+package or AirflowUtilsConstants does not load boto3, hvac or botocore.
 """
 
-from .AirflowUtils import (
-    list_all_mwaa_environments,
-    create_variable,
-    create_connection
-)
+import importlib
+
+# Public name -> module that defines it
+_LAZY_ATTRIBUTES = {
+    **dict.fromkeys([
+        'list_all_mwaa_environments',
+        'iter_mwaa_environments',
+        'get_mwaa_inventory',
+        'create_variable',
+        'bulk_create_variables',
+        'create_connection',
+        'bulk_create_connections',
+        'sync_variables',
+        'sync_connections',
+        'set_mwaa_rate_limit'
+    ], 'AirflowUtils'),
+    **dict.fromkeys([
+        'export_snapshot',
+        'import_snapshot',
+        'iter_snapshot',
+        'verify_snapshot'
+    ], 'AirflowSnapshotUtils'),
+    **dict.fromkeys(['sync_dags', 'build_plugins_zip', 'deploy_artifacts'], 'AirflowDeployUtils'),
+    **dict.fromkeys([
+        'build_environment_request',
+        'ensure_environment',
+        'ensure_environments'
+    ], 'AirflowProvisionUtils'),
+    **dict.fromkeys(['EnvironmentWaiter', 'wait_for_environments'], 'AirflowWaitUtils'),
+    **dict.fromkeys(['iter_log_events', 'resolve_log_groups'], 'AirflowLogUtils'),
+}
+
+_SUBMODULES = ['AirflowUtils', 'AirflowUtilsConstants', 'AirflowSnapshotUtils', 'AirflowDeployUtils',
+               'AirflowProvisionUtils', 'AirflowWaitUtils', 'AirflowLogUtils', 'aio']
+
+
+def __getattr__(name):
+    """Import a public name (or submodule) on first access and cache it on the package"""
+    if name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
-from . import AirflowUtilsConstants
 
 __all__ = [
     'list_all_mwaa_environments',
+    'iter_mwaa_environments',
+    'get_mwaa_inventory',
     'create_variable',
-    'create_connection'
+    'bulk_create_variables',
+    'create_connection',
+    'bulk_create_connections',
+    'sync_variables',
+    'sync_connections',
+    'set_mwaa_rate_limit',
+    'export_snapshot',
+    'import_snapshot',
+    'iter_snapshot',
+    'verify_snapshot',
+    'sync_dags',
+    'build_plugins_zip',
+    'deploy_artifacts',
+    'build_environment_request',
+    'ensure_environment',
+    'ensure_environments',
+    'EnvironmentWaiter',
+    'wait_for_environments',
+    'iter_log_events',
+    'resolve_log_groups'
 ]
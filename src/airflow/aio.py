@@ -0,0 +1,525 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+aio.py - Asyncio variants of the AWS MWAA REST helpers
+Tech Description: Sends MWAA ListEnvironments, GetEnvironment and InvokeRestApi requests from an event loop
+                  with httpx, SigV4-signed with the pooled Vault-issued credentials, and bounds fan-out with
+                  a semaphore so the helpers can be awaited from FastAPI handlers without blocking the loop
+Pre_requisites: Requires AirflowUtils.py, AirflowUtilsConstants.py, CommonUtils.py and DLPLogSetup.py
+"""
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, NamedTuple, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit, urlunsplit
+
+import httpx
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import RefreshableCredentials
+
+from utils import CommonUtils, CommonUtilsConstants, MetricsUtils, RateLimitUtils
+from utils.DLPLogSetup import get_logger
+from . import AirflowUtils, AirflowUtilsConstants
+
+logger = get_logger(__name__)
+
+
+class _MwaaTarget(NamedTuple):
+    """Signing credentials and endpoints for one (environment, region) pair"""
+    environment: str
+    region: str
+    credentials: RefreshableCredentials
+    aws_region: str
+    api_url: str
+    env_url: str
+
+
+def _with_host_prefix(endpoint_url: str, prefix: str, inject: bool) -> str:
+    """Apply a botocore hostPrefix (e.g. "api.") to an endpoint URL"""
+    if not inject:
+        return endpoint_url.rstrip("/")
+    parts = urlsplit(endpoint_url)
+    return urlunsplit((parts.scheme, prefix + parts.netloc, parts.path.rstrip("/"), "", ""))
+
+
+def _resolve_target_sync(environment: str, region: str) -> _MwaaTarget:
+    """Resolve pooled credentials and MWAA endpoints; may block on a Vault call on first use"""
+    mwaa_client = CommonUtils.get_boto3_client(AirflowUtilsConstants.MWAA_KEY, environment, region)
+    inject = mwaa_client.meta.config.inject_host_prefix
+    return _MwaaTarget(
+        environment=environment,
+        region=region,
+        credentials=CommonUtils.get_aws_credentials(environment),
+        aws_region=mwaa_client.meta.region_name,
+        api_url=_with_host_prefix(mwaa_client.meta.endpoint_url, AirflowUtilsConstants.MWAA_API_HOST_PREFIX, inject),
+        env_url=_with_host_prefix(mwaa_client.meta.endpoint_url, AirflowUtilsConstants.MWAA_ENV_HOST_PREFIX, inject)
+    )
+
+
+async def _resolve_target(environment: str, region: str) -> _MwaaTarget:
+    """Resolve the target off the event loop, once per public call"""
+    return await asyncio.get_running_loop().run_in_executor(None, _resolve_target_sync, environment, region)
+
+
+@asynccontextmanager
+async def _http_client(http_client: Optional[httpx.AsyncClient]) -> AsyncIterator[httpx.AsyncClient]:
+    """Use the caller's AsyncClient, or a temporary one closed on exit"""
+    if http_client is not None:
+        yield http_client
+        return
+    async with httpx.AsyncClient(timeout=AirflowUtilsConstants.DEFAULT_HTTP_TIMEOUT_SECONDS) as client:
+        yield client
+
+
+async def _send(
+    http_client: httpx.AsyncClient,
+    target: _MwaaTarget,
+    operation: str,
+    method: str,
+    url: str,
+    body: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None
+) -> httpx.Response:
+    """Sign a request with SigV4 and send it, recorded as operation in the call metrics"""
+    if params:
+        url = f"{url}?{urlencode(params)}"
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    request = AWSRequest(method=method, url=url, data=data, headers={"Content-Type": "application/json"})
+    # Frozen per request so a fan-out that outlives the STS lease signs with the renewed credentials
+    SigV4Auth(target.credentials.get_frozen_credentials(), AirflowUtilsConstants.MWAA_SIGNING_NAME, target.aws_region).add_auth(request)
+    with MetricsUtils.track(operation, target.environment, target.region) as call:
+        call.request_bytes = len(data)
+        response = await http_client.request(method, url, content=data, headers=dict(request.headers.items()))
+        call.response_bytes = len(response.content)
+        if not response.is_success:
+            call.fail(f"HTTP {response.status_code}")
+    return response
+
+
+class _MwaaApiError(Exception):
+    """Non-2xx MWAA API response, with the AWS error type and any Retry-After"""
+
+    def __init__(self, response: httpx.Response):
+        self.error_type = response.headers.get(AirflowUtilsConstants.AMZN_ERROR_TYPE_HEADER, "").split(":")[0]
+        self.retry_after = RateLimitUtils.parse_retry_after(
+            response.headers.get(CommonUtilsConstants.RETRY_AFTER_HEADER))
+        super().__init__(f"MWAA API returned HTTP {response.status_code} {self.error_type}: {response.text}")
+
+
+def _raise_for_aws_error(response: httpx.Response) -> None:
+    """Raise an _MwaaApiError carrying the AWS error type for non-2xx MWAA API responses"""
+    if not response.is_success:
+        raise _MwaaApiError(response)
+
+
+async def _call_rest_api(
+    http_client: httpx.AsyncClient,
+    target: _MwaaTarget,
+    airflow_environment_name: str,
+    path: str,
+    method: str,
+    body: Optional[Dict[str, Any]] = None,
+    query_parameters: Optional[Dict[str, Any]] = None
+) -> AirflowUtils._RestApiResult:
+    """
+    Async counterpart of AirflowUtils._call_rest_api
+
+    Raises:
+        _MwaaApiError: For AWS-side errors (no Airflow status in the response)
+    """
+    request_body = {"Path": path, "Method": method}
+    if body is not None:
+        request_body["Body"] = body
+    if query_parameters:
+        request_body["QueryParameters"] = query_parameters
+
+    response = await _send(
+        http_client,
+        target,
+        AirflowUtilsConstants.INVOKE_REST_API_OPERATION,
+        AirflowUtilsConstants.POST_METHOD,
+        f"{target.env_url}{AirflowUtilsConstants.RESTAPI_API_PATH}/{quote(airflow_environment_name, safe='')}",
+        request_body
+    )
+    try:
+        data = response.json()
+    except ValueError:
+        data = {}
+    if AirflowUtilsConstants.REST_API_STATUS_CODE_KEY not in data:
+        _raise_for_aws_error(response)
+
+    rest_api_response = data.get(AirflowUtilsConstants.REST_API_RESPONSE_KEY)
+    content = json.dumps(rest_api_response) if rest_api_response is not None else None
+    return AirflowUtils._RestApiResult(
+        data.get(AirflowUtilsConstants.REST_API_STATUS_CODE_KEY, response.status_code),
+        content,
+        RateLimitUtils.parse_retry_after(response.headers.get(CommonUtilsConstants.RETRY_AFTER_HEADER)),
+        0
+    )
+
+
+async def _invoke_rest_api_with_retry(
+    http_client: httpx.AsyncClient,
+    target: _MwaaTarget,
+    airflow_environment_name: str,
+    path: str,
+    method: str,
+    body: Optional[Dict[str, Any]] = None,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES
+) -> Tuple[Any, Optional[str], int]:
+    """
+    Async counterpart of AirflowUtils._invoke_rest_api_with_retry, sharing its per-environment rate limiter
+
+    Returns:
+        tuple: (http_status, response content, number of attempts made)
+    """
+    limiter = AirflowUtils._mwaa_rate_limiter(target.aws_region, airflow_environment_name)
+    attempt = 0
+    while True:
+        attempt += 1
+        wait = limiter.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        try:
+            result = await _call_rest_api(http_client, target, airflow_environment_name, path, method, body)
+            http_status, content, retry_after = result.http_status, result.content, result.retry_after
+            throttled = http_status in AirflowUtilsConstants.THROTTLE_STATUS_CODES
+            retryable = http_status in AirflowUtilsConstants.RETRYABLE_STATUS_CODES
+        except _MwaaApiError as e:
+            http_status, content, retry_after = None, str(e), e.retry_after
+            throttled = e.error_type in AirflowUtilsConstants.THROTTLING_ERROR_CODES
+            retryable = e.error_type in AirflowUtilsConstants.RETRYABLE_ERROR_CODES
+
+        if throttled:
+            limiter.on_throttle(retry_after)
+        elif not retryable:
+            limiter.on_success()
+
+        if not retryable or attempt > max_retries:
+            return http_status, content, attempt
+        wait = AirflowUtils._retry_wait(attempt, retry_after, throttled)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+async def create_variable(
+    key: str,
+    value: str,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES
+) -> dict:
+    """
+    Create or update a variable in an MWAA environment via the REST API without blocking the loop.
+
+    Returns:
+        dict with 'status', 'result', and 'error' (same as AirflowUtils.create_variable)
+    """
+    try:
+        target = await _resolve_target(environment, region)
+        async with _http_client(http_client) as client:
+            http_status, content, _ = await _invoke_rest_api_with_retry(
+                client,
+                target,
+                airflow_environment_name,
+                AirflowUtilsConstants.VARIABLES_PATH,
+                AirflowUtilsConstants.POST_METHOD,
+                {"key": key, "value": value},
+                max_retries
+            )
+        succeeded = http_status == AirflowUtilsConstants.HTTP_STATUS_OK
+        return {
+            "status": "success" if succeeded else "failed",
+            "result": content,
+            "error": None if succeeded else content if http_status is None else f"API returned status {http_status}"
+        }
+
+    except Exception as ex:
+        logger.error("Unable to create variable in Airflow: %s", ex)
+        return {"status": "failed", "result": None, "error": str(ex)}
+
+
+async def create_connection(
+    connection_id: str,
+    conn_type: str,
+    description: str,
+    host: str,
+    login: str,
+    password: str,
+    schema: str,
+    port: int,
+    extra: str,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES
+) -> dict:
+    """
+    Create or update a connection in MWAA via the Airflow REST API without blocking the loop.
+
+    Returns:
+        dict with 'status', 'result', and 'error' (same as AirflowUtils.create_connection)
+    """
+    payload = {
+        "connection_id": connection_id,
+        "conn_type": conn_type,
+        "description": description,
+        "host": host,
+        "login": login,
+        "password": password,
+        "schema": schema,
+        "port": port,
+        "extra": extra
+    }
+
+    try:
+        target = await _resolve_target(environment, region)
+        async with _http_client(http_client) as client:
+            http_status, content, _ = await _invoke_rest_api_with_retry(
+                client,
+                target,
+                airflow_environment_name,
+                AirflowUtilsConstants.CONNECTIONS_PATH,
+                AirflowUtilsConstants.POST_METHOD,
+                payload,
+                max_retries
+            )
+        if http_status == AirflowUtilsConstants.HTTP_STATUS_OK:
+            return {"status": "success", "result": content, "error": None}
+        return {"status": "failed", "result": content,
+                "error": content if http_status is None else f"HTTP {http_status}"}
+
+    except Exception as e:
+        logger.error("Exception during creating connection %s: %s", connection_id, e)
+        return {"status": "failed", "result": None, "error": str(e)}
+
+
+async def _get_environment_details(
+    http_client: httpx.AsyncClient,
+    target: _MwaaTarget,
+    env_name: str,
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Async counterpart of AirflowUtils._get_environment_details"""
+    async with semaphore:
+        try:
+            response = await _send(
+                http_client,
+                target,
+                AirflowUtilsConstants.GET_ENVIRONMENT_OPERATION,
+                AirflowUtilsConstants.GET_METHOD,
+                f"{target.api_url}{AirflowUtilsConstants.ENVIRONMENTS_API_PATH}/{quote(env_name, safe='')}"
+            )
+            _raise_for_aws_error(response)
+            env_info = response.json().get(AirflowUtilsConstants.ENVIRONMENT_KEY, {})
+            return AirflowUtils._environment_info(env_name, env_info)
+        except Exception as e:
+            logger.warning("Could not get details for environment %s: %s", env_name, e)
+            return {
+                "name": env_name,
+                "status": "UNKNOWN",
+                "error": f"Could not fetch details: {str(e)}"
+            }
+
+
+async def list_environments(
+    environment: str,
+    region: str,
+    max_concurrency: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    http_client: Optional[httpx.AsyncClient] = None
+) -> Dict[str, Any]:
+    """
+    Lists all MWAA environments with details, fetching details concurrently from the event loop
+
+    Args:
+        environment (str): Target environment (dev/tst/prd)
+        region (str): Target region (us/eu/jp)
+        max_concurrency (int): Maximum number of concurrent GetEnvironment requests
+        http_client (httpx.AsyncClient): Optional shared client
+
+    Returns:
+        dict: Same format as AirflowUtils.list_all_mwaa_environments
+    """
+    validation_error = AirflowUtils._validate_target(environment, region)
+    if validation_error:
+        return {
+            CommonUtilsConstants.STATUS_KEY: CommonUtilsConstants.FAILED_KEY,
+            "error": validation_error
+        }
+
+    try:
+        target = await _resolve_target(environment, region)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        tasks = []
+        async with _http_client(http_client) as client:
+            next_token = None
+            while True:
+                params = {AirflowUtilsConstants.MAX_RESULTS_KEY: AirflowUtilsConstants.DEFAULT_MAX_RESULTS}
+                if next_token:
+                    params[AirflowUtilsConstants.NEXT_TOKEN_KEY] = next_token
+                response = await _send(
+                    client,
+                    target,
+                    AirflowUtilsConstants.LIST_ENVIRONMENTS_OPERATION,
+                    AirflowUtilsConstants.GET_METHOD,
+                    f"{target.api_url}{AirflowUtilsConstants.ENVIRONMENTS_API_PATH}",
+                    params=params
+                )
+                _raise_for_aws_error(response)
+                page = response.json()
+                # Detail requests for this page start while the next page is being listed
+                tasks.extend(
+                    asyncio.ensure_future(_get_environment_details(client, target, env_name, semaphore))
+                    for env_name in page.get(AirflowUtilsConstants.ENVIRONMENTS_KEY, [])
+                )
+                next_token = page.get(AirflowUtilsConstants.NEXT_TOKEN_KEY)
+                if not next_token:
+                    break
+            detailed_environments = list(await asyncio.gather(*tasks))
+
+        return {
+            CommonUtilsConstants.STATUS_KEY: CommonUtilsConstants.SUCCESS_KEY,
+            CommonUtilsConstants.RESULT_KEY: {
+                "environments": detailed_environments,
+                "count": len(detailed_environments),
+                "region": AirflowUtilsConstants.REGION_DETAILS[region]["region_name"],
+                "target_environment": environment,
+                "region_details": AirflowUtilsConstants.REGION_DETAILS[region]
+            }
+        }
+
+    except Exception as e:
+        error_message = f"Error while listing MWAA environments: {str(e)}"
+        logger.error(error_message)
+        return {
+            CommonUtilsConstants.STATUS_KEY: CommonUtilsConstants.FAILED_KEY,
+            "error": error_message
+        }
+
+
+async def _push(
+    http_client: httpx.AsyncClient,
+    target: _MwaaTarget,
+    airflow_environment_name: str,
+    path: str,
+    body: Dict[str, Any],
+    max_retries: int,
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """POST one item through the shared rate limiter, retrying throttled and 5xx responses"""
+    attempts = 0
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            http_status, content, attempts = await _invoke_rest_api_with_retry(
+                http_client, target, airflow_environment_name, path, AirflowUtilsConstants.POST_METHOD, body,
+                max_retries
+            )
+            error = None if http_status == AirflowUtilsConstants.HTTP_STATUS_OK else f"HTTP {http_status}: {content}"
+        except Exception as ex:
+            http_status, error = None, str(ex)
+            attempts = attempts or 1
+
+    return {
+        "status": CommonUtilsConstants.SUCCESS_KEY if error is None else CommonUtilsConstants.FAILED_KEY,
+        "http_status": http_status,
+        "attempts": attempts,
+        "error": error,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+def _bulk_report(kind: str, items: list, started: float) -> Dict[str, Any]:
+    """Build the bulk result dict shared with the blocking bulk helpers"""
+    failed = sum(1 for item in items if item["status"] != CommonUtilsConstants.SUCCESS_KEY)
+    return {
+        "status": CommonUtilsConstants.SUCCESS_KEY if not failed else CommonUtilsConstants.FAILED_KEY,
+        "result": {
+            "items": items,
+            "total": len(items),
+            "succeeded": len(items) - failed,
+            "failed": failed,
+            "retries": sum(max(item["attempts"] - 1, 0) for item in items),
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        },
+        "error": None if not failed else f"{failed} of {len(items)} {kind} failed"
+    }
+
+
+async def bulk_create_variables(
+    mapping_or_file: Any,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    max_in_flight: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES,
+    http_client: Optional[httpx.AsyncClient] = None
+) -> Dict[str, Any]:
+    """
+    Async counterpart of AirflowUtils.bulk_create_variables with a semaphore-bounded fan-out
+
+    Returns:
+        dict: Same format as AirflowUtils.bulk_create_variables (items also carry "attempts")
+    """
+    started = time.perf_counter()
+    try:
+        target = await _resolve_target(environment, region)
+        variables = await asyncio.to_thread(lambda: list(AirflowUtils._load_variables(mapping_or_file)))
+        semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+        async def push(key: str, value: Any) -> Dict[str, Any]:
+            body = {"key": key, "value": value if isinstance(value, str) else json.dumps(value)}
+            row = await _push(client, target, airflow_environment_name, AirflowUtilsConstants.VARIABLES_PATH,
+                              body, max_retries, semaphore)
+            return {"key": key, **row}
+
+        async with _http_client(http_client) as client:
+            items = list(await asyncio.gather(*(push(key, value) for key, value in variables)))
+        return _bulk_report("variables", items, started)
+
+    except Exception as ex:
+        logger.error("Unable to bulk create variables in Airflow: %s", ex)
+        return {"status": CommonUtilsConstants.FAILED_KEY, "result": None, "error": str(ex)}
+
+
+async def bulk_create_connections(
+    connections_or_file: Any,
+    environment: str,
+    region: str,
+    airflow_environment_name: str,
+    max_in_flight: int = AirflowUtilsConstants.DEFAULT_MAX_CONCURRENCY,
+    max_retries: int = AirflowUtilsConstants.DEFAULT_MAX_RETRIES,
+    http_client: Optional[httpx.AsyncClient] = None
+) -> Dict[str, Any]:
+    """
+    Async counterpart of AirflowUtils.bulk_create_connections with a semaphore-bounded fan-out
+
+    Returns:
+        dict: Same format as AirflowUtils.bulk_create_connections
+    """
+    started = time.perf_counter()
+    try:
+        target = await _resolve_target(environment, region)
+        payloads = await asyncio.to_thread(lambda: list(AirflowUtils._load_connections(connections_or_file)))
+        semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+        async def push(payload: Dict[str, Any]) -> Dict[str, Any]:
+            row = await _push(client, target, airflow_environment_name, AirflowUtilsConstants.CONNECTIONS_PATH,
+                              payload, max_retries, semaphore)
+            return {"connection_id": payload[AirflowUtilsConstants.CONNECTION_ID_PAYLOAD_KEY], **row}
+
+        async with _http_client(http_client) as client:
+            items = list(await asyncio.gather(*(push(payload) for payload in payloads)))
+        return _bulk_report("connections", items, started)
+
+    except Exception as ex:
+        logger.error("Unable to bulk create connections in Airflow: %s", ex)
+        return {"status": CommonUtilsConstants.FAILED_KEY, "result": None, "error": str(ex)}
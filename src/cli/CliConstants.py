@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+CliConstants.py - Constants for the mwaa-migrate command line
+"""
+
+PROG_NAME = "mwaa-migrate"
+
+# Output formats
+OUTPUT_JSON = "json"
+OUTPUT_NDJSON = "ndjson"
+OUTPUT_FORMATS = [OUTPUT_JSON, OUTPUT_NDJSON]
+JSON_INDENT = 2
+
+# Defaults (kept here rather than read from AirflowUtilsConstants so --help needs no AWS imports)
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_LOG_LEVEL = "WARNING"
+DEFAULT_WAIT_TIMEOUT_SECONDS = 2700
+
+# Subcommands
+LIST_COMMAND = "list"
+PUSH_VARIABLES_COMMAND = "push-vars"
+PUSH_CONNECTIONS_COMMAND = "push-conns"
+SYNC_COMMAND = "sync"
+PUSH_DAGS_COMMAND = "push-dags"
+PUSH_ARTIFACTS_COMMAND = "push-artifacts"
+PROVISION_COMMAND = "provision"
+WAIT_COMMAND = "wait"
+LOGS_COMMAND = "logs"
+SNAPSHOT_COMMAND = "snapshot"
+RESTORE_COMMAND = "restore"
+
+# sync targets
+SYNC_VARIABLES = "vars"
+SYNC_CONNECTIONS = "conns"
+SYNC_KINDS = [SYNC_VARIABLES, SYNC_CONNECTIONS]
+
+# wait targets
+WAIT_TARGETS = ["AVAILABLE", "DELETED"]
+
+# logs options (LOG_GROUPS of AirflowUtilsConstants)
+LOG_GROUPS = ["Task", "Scheduler", "DAGProcessing", "WebServer", "Worker"]
+DEFAULT_LOG_SINCE = "1h"
+TIME_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Process exit codes
+EXIT_SUCCESS = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+# NDJSON summary line type
+SUMMARY_TYPE = "summary"
@@ -0,0 +1,392 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+MwaaMigrateCLI.py - mwaa-migrate command line for bulk MWAA operations
+Tech Description: argparse front end over the airflow package with the subcommands list, push-vars,
+                  push-conns, sync, push-dags, push-artifacts, provision, wait, logs, snapshot and restore. Only the
+                  standard library is imported at module level; boto3, hvac and the Airflow utilities are
+                  imported by the subcommand that needs them, so --help, argument errors and dry runs of
+                  snapshot files start in milliseconds.
+                  Results are printed as one JSON document or as NDJSON (one line per item plus a summary).
+Pre_requisites: Requires CliConstants.py; the utils and airflow packages for the subcommands
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO
+
+# Import constants
+from . import CliConstants
+
+
+def _write_json(document: Any, stream: TextIO, indent: Optional[int] = None) -> None:
+    """Write one JSON document followed by a newline"""
+    stream.write(json.dumps(document, default=str, indent=indent) + "\n")
+
+
+def _emit(args: argparse.Namespace, result: Dict[str, Any], items_key: str = "items") -> int:
+    """
+    Print a status dict in the selected output format and return the exit code
+
+    NDJSON prints each entry of result["result"][items_key] on its own line, then the result without the
+    items as a final {"type": "summary", ...} line.
+    """
+    if args.output == CliConstants.OUTPUT_NDJSON:
+        body = result.get("result") or {}
+        items = body.get(items_key) if isinstance(body, dict) else None
+        for item in items or []:
+            _write_json(item, args.stream)
+        summary = dict(result, result={key: value for key, value in body.items() if key != items_key}
+                       if isinstance(body, dict) else body)
+        _write_json(dict(summary, type=CliConstants.SUMMARY_TYPE), args.stream)
+    else:
+        _write_json(result, args.stream, CliConstants.JSON_INDENT)
+    return CliConstants.EXIT_SUCCESS if result.get("status") == "success" else CliConstants.EXIT_FAILED
+
+
+def _prepare(args: argparse.Namespace) -> None:
+    """Import the utilities, send their logs to stderr and apply --rate"""
+    from utils.DLPLogSetup import configure_logging
+    from airflow import AirflowUtils
+
+    configure_logging(level=args.log_level, stream=sys.stderr)
+    if args.rate:
+        AirflowUtils.set_mwaa_rate_limit(max_rate=args.rate, initial_rate=args.rate)
+
+
+def _dry_run_result(items: List[Dict[str, Any]], **details) -> Dict[str, Any]:
+    """Status dict reporting what a dry run would send"""
+    return {"status": "success", "result": dict(details, items=items, total=len(items), dry_run=True),
+            "error": None}
+
+
+def _list(args: argparse.Namespace) -> int:
+    """List MWAA environments; NDJSON streams each environment as soon as it is described"""
+    _prepare(args)
+    from airflow import AirflowUtils
+
+    if args.output == CliConstants.OUTPUT_JSON:
+        return _emit(args, AirflowUtils.list_all_mwaa_environments(args.environment, args.region,
+                                                                   args.concurrency), "environments")
+    count = 0
+    try:
+        for record in AirflowUtils.iter_mwaa_environments(args.environment, args.region, args.concurrency):
+            _write_json(record, args.stream)
+            count += 1
+        result = {"status": "success", "result": {"count": count}, "error": None}
+    except Exception as ex:
+        result = {"status": "failed", "result": {"count": count}, "error": str(ex)}
+    return _emit(args, result)
+
+
+def _push_variables(args: argparse.Namespace) -> int:
+    """Create or update every variable in a file"""
+    _prepare(args)
+    from airflow import AirflowUtils
+
+    if args.dry_run:
+        keys = [{"key": key} for key, _ in AirflowUtils._load_variables(args.file)]
+        return _emit(args, _dry_run_result(keys, airflow_environment_name=args.name))
+    return _emit(args, AirflowUtils.bulk_create_variables(
+        args.file, args.environment, args.region, args.name, args.concurrency, args.max_retries
+    ))
+
+
+def _push_connections(args: argparse.Namespace) -> int:
+    """Create every connection in a file"""
+    _prepare(args)
+    from airflow import AirflowUtils
+
+    if args.dry_run:
+        connections = [{"connection_id": payload.get("connection_id"), "conn_type": payload.get("conn_type")}
+                       for payload in AirflowUtils._load_connections(args.file)]
+        return _emit(args, _dry_run_result(connections, airflow_environment_name=args.name))
+    return _emit(args, AirflowUtils.bulk_create_connections(
+        args.file, args.environment, args.region, args.name, args.concurrency, args.max_retries
+    ))
+
+
+def _sync(args: argparse.Namespace) -> int:
+    """Make the variables or connections of an environment match a file"""
+    _prepare(args)
+    from airflow import AirflowUtils
+
+    if args.kind == CliConstants.SYNC_VARIABLES:
+        return _emit(args, AirflowUtils.sync_variables(
+            args.file, args.environment, args.region, args.name, delete_missing=args.delete_missing,
+            dry_run=args.dry_run, max_workers=args.concurrency, max_retries=args.max_retries,
+            overwrite_masked=args.overwrite_masked
+        ))
+    return _emit(args, AirflowUtils.sync_connections(
+        args.file, args.environment, args.region, args.name, delete_missing=args.delete_missing,
+        dry_run=args.dry_run, max_workers=args.concurrency, max_retries=args.max_retries
+    ))
+
+
+def _push_dags(args: argparse.Namespace) -> int:
+    """Upload changed DAG files to the environment's source bucket and delete stale ones"""
+    _prepare(args)
+    from airflow import AirflowDeployUtils
+
+    return _emit(args, AirflowDeployUtils.sync_dags(
+        args.directory, args.environment, args.region, args.name, delete_stale=not args.keep_stale,
+        dry_run=args.dry_run, max_workers=args.concurrency
+    ), "uploaded")
+
+
+def _push_artifacts(args: argparse.Namespace) -> int:
+    """Deploy plugins.zip/requirements.txt, updating the environment only when their content changed"""
+    _prepare(args)
+    from airflow import AirflowDeployUtils
+
+    return _emit(args, AirflowDeployUtils.deploy_artifacts(
+        args.environment, args.region, args.name, plugins_dir=args.plugins,
+        requirements_file=args.requirements, update_environment=not args.no_update, dry_run=args.dry_run
+    ))
+
+
+def _provision(args: argparse.Namespace) -> int:
+    """Create or update the environments described in a spec file, in parallel"""
+    _prepare(args)
+    from airflow import AirflowProvisionUtils
+
+    with open(args.file, encoding="utf-8") as handle:
+        specs = json.load(handle)
+    specs = [dict({"environment": args.environment, "region": args.region}, **spec)
+             for spec in (specs if isinstance(specs, list) else [specs])]
+    return _emit(args, AirflowProvisionUtils.ensure_environments(
+        specs, dry_run=args.dry_run, max_workers=args.concurrency, wait=args.wait, timeout=args.timeout
+    ), "environments")
+
+
+def _wait(args: argparse.Namespace) -> int:
+    """Wait until environments are AVAILABLE (or DELETED); NDJSON prints each one as it finishes"""
+    _prepare(args)
+    from airflow import AirflowWaitUtils
+
+    callback = None
+    if args.output == CliConstants.OUTPUT_NDJSON:
+        def callback(record: Dict[str, Any]) -> None:
+            _write_json(record, args.stream)
+            args.stream.flush()
+
+    result = AirflowWaitUtils.wait_for_environments(
+        [{"environment": args.environment, "region": args.region, "name": name, "target": args.target}
+         for name in args.names],
+        timeout=args.timeout, callback=callback
+    )
+    if callback is not None:
+        # Entries were printed as they finished; end with the summary only
+        return _emit(args, dict(result, result=dict(result["result"] or {}, environments=[])), "environments")
+    return _emit(args, result, "environments")
+
+
+def _parse_time(value: str) -> datetime:
+    """A relative time such as 90s, 15m, 1h or 2d (that long ago), or an ISO 8601 date/time"""
+    unit = value[-1:].lower()
+    if unit in CliConstants.TIME_UNIT_SECONDS and value[:-1].isdigit():
+        return datetime.now() - timedelta(seconds=int(value[:-1]) * CliConstants.TIME_UNIT_SECONDS[unit])
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time {value!r}: use e.g. 30m, 2h, 1d or 2024-01-31T12:00")
+
+
+def _logs(args: argparse.Namespace) -> int:
+    """Print the environment's CloudWatch log events as they are read; --follow tails until interrupted"""
+    _prepare(args)
+    from airflow import AirflowLogUtils
+
+    count = 0
+    events = AirflowLogUtils.iter_log_events(
+        args.environment, args.region, args.name, groups=args.groups, start_time=args.since,
+        end_time=args.until, filter_pattern=args.filter, log_stream_prefix=args.stream_prefix,
+        follow=args.follow
+    )
+    try:
+        for event in events:
+            _write_json(event, args.stream)
+            count += 1
+            if args.follow:
+                args.stream.flush()
+        result = {"status": "success", "result": {"count": count}, "error": None}
+    except KeyboardInterrupt:
+        result = {"status": "success", "result": {"count": count, "interrupted": True}, "error": None}
+    except Exception as ex:
+        result = {"status": "failed", "result": {"count": count}, "error": str(ex)}
+    finally:
+        events.close()
+    _write_json(dict(result, type=CliConstants.SUMMARY_TYPE), args.stream)
+    return CliConstants.EXIT_SUCCESS if result["status"] == "success" else CliConstants.EXIT_FAILED
+
+
+def _snapshot(args: argparse.Namespace) -> int:
+    """Export variables, connections and pools of an environment to a snapshot file"""
+    _prepare(args)
+    from airflow import AirflowSnapshotUtils
+
+    return _emit(args, AirflowSnapshotUtils.export_snapshot(
+        args.environment, args.region, args.name, args.file,
+        include_connection_details=not args.skip_connection_details, max_workers=args.concurrency
+    ))
+
+
+def _restore(args: argparse.Namespace) -> int:
+    """Replay a snapshot file into an environment; --dry-run only reads and verifies the file"""
+    _prepare(args)
+    from airflow import AirflowSnapshotUtils
+
+    if args.dry_run:
+        try:
+            counts: Dict[str, int] = {}
+            for record_type, _ in AirflowSnapshotUtils.iter_snapshot(args.file, verify=not args.skip_verify):
+                if not args.types or record_type in args.types:
+                    counts[record_type] = counts.get(record_type, 0) + 1
+            result = {"status": "success", "result": {"file": args.file, "counts": counts, "dry_run": True},
+                      "error": None}
+        except Exception as ex:
+            result = {"status": "failed", "result": None, "error": str(ex)}
+        return _emit(args, result)
+    return _emit(args, AirflowSnapshotUtils.import_snapshot(
+        args.file, args.environment, args.region, args.name, record_types=args.types,
+        max_in_flight=args.concurrency, max_retries=args.max_retries, verify=not args.skip_verify
+    ), "failures")
+
+
+def _add_target_arguments(parser: argparse.ArgumentParser, with_name: bool = True) -> None:
+    """--environment/--region (and --name) shared by every subcommand"""
+    parser.add_argument("-e", "--environment", required=True, help="Target environment (dev/tst/prd)")
+    parser.add_argument("-r", "--region", required=True, help="Target region (us/eu/jp)")
+    if with_name:
+        parser.add_argument("-n", "--name", required=True, help="MWAA environment name")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the mwaa-migrate argument parser
+
+    Returns:
+        argparse.ArgumentParser: Parser whose parsed namespace carries the subcommand handler as "handler"
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--concurrency", type=int, default=CliConstants.DEFAULT_CONCURRENCY,
+                        help="Maximum concurrent MWAA requests (default: %(default)s)")
+    common.add_argument("--rate", type=float,
+                        help="Maximum MWAA REST API requests per second per environment (default: adaptive)")
+    common.add_argument("--max-retries", type=int, default=CliConstants.DEFAULT_MAX_RETRIES,
+                        help="Retries per item for throttled/5xx responses (default: %(default)s)")
+    common.add_argument("--output", choices=CliConstants.OUTPUT_FORMATS, default=CliConstants.OUTPUT_JSON,
+                        help="Print one JSON document or NDJSON lines (default: %(default)s)")
+    common.add_argument("--log-level", default=CliConstants.DEFAULT_LOG_LEVEL,
+                        help="Log level for stderr, or OFF (default: %(default)s)")
+
+    parser = argparse.ArgumentParser(prog=CliConstants.PROG_NAME, description="Bulk operations on AWS MWAA")
+    subparsers = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    def add_command(name: str, handler: Callable[[argparse.Namespace], int], help_text: str,
+                    with_name: bool = True, dry_run: bool = True) -> argparse.ArgumentParser:
+        command = subparsers.add_parser(name, parents=[common], help=help_text, description=help_text)
+        _add_target_arguments(command, with_name)
+        if dry_run:
+            command.add_argument("--dry-run", action="store_true", help="Report what would be done, change nothing")
+        command.set_defaults(handler=handler)
+        return command
+
+    add_command(CliConstants.LIST_COMMAND, _list, "List MWAA environments with details",
+                with_name=False, dry_run=False)
+
+    push_variables = add_command(CliConstants.PUSH_VARIABLES_COMMAND, _push_variables,
+                                 "Create or update variables from a JSON file")
+    push_variables.add_argument("file", help="Variables JSON (airflow variables export or a list of records)")
+
+    push_connections = add_command(CliConstants.PUSH_CONNECTIONS_COMMAND, _push_connections,
+                                   "Create connections from a JSON or YAML file")
+    push_connections.add_argument("file", help="Connections JSON/YAML (airflow connections export or records)")
+
+    sync = add_command(CliConstants.SYNC_COMMAND, _sync, "Make variables or connections match a file")
+    sync.add_argument("kind", choices=CliConstants.SYNC_KINDS)
+    sync.add_argument("file", help="Desired state, in the push-vars/push-conns file formats")
+    sync.add_argument("--delete-missing", action="store_true", help="Delete items that are not in the file")
+    sync.add_argument("--overwrite-masked", action="store_true",
+                      help="Write sensitive variables whose masked values cannot be compared (vars only); "
+                           "without it they are skipped and the sync exits non-zero")
+
+    push_dags = add_command(CliConstants.PUSH_DAGS_COMMAND, _push_dags,
+                            "Upload changed DAG files to the environment's DagS3Path")
+    push_dags.add_argument("directory", help="Local DAG folder")
+    push_dags.add_argument("--keep-stale", action="store_true", help="Do not delete objects missing locally")
+
+    push_artifacts = add_command(CliConstants.PUSH_ARTIFACTS_COMMAND, _push_artifacts,
+                                 "Deploy plugins.zip and requirements.txt when their content changed")
+    push_artifacts.add_argument("--plugins", metavar="DIR", help="Local plugins folder to zip")
+    push_artifacts.add_argument("--requirements", metavar="FILE", help="Local requirements.txt")
+    push_artifacts.add_argument("--no-update", action="store_true",
+                                help="Upload changed artifacts but do not call UpdateEnvironment")
+
+    provision = add_command(CliConstants.PROVISION_COMMAND, _provision,
+                            "Create or update environments to match their specs", with_name=False)
+    provision.add_argument("file", help="JSON environment spec or list of specs; -e/-r are the defaults "
+                                        "for specs without environment/region")
+    provision.add_argument("--wait", action="store_true",
+                           help="Wait until created/updated environments are AVAILABLE")
+    provision.add_argument("--timeout", type=float, default=CliConstants.DEFAULT_WAIT_TIMEOUT_SECONDS,
+                           help="Seconds to wait per environment (default: %(default)s)")
+
+    wait = add_command(CliConstants.WAIT_COMMAND, _wait, "Wait for environments to finish a transition",
+                       with_name=False, dry_run=False)
+    wait.add_argument("names", nargs="+", metavar="NAME", help="MWAA environment names")
+    wait.add_argument("--target", choices=CliConstants.WAIT_TARGETS, default=CliConstants.WAIT_TARGETS[0],
+                      help="Status to wait for (default: %(default)s)")
+    wait.add_argument("--timeout", type=float, default=CliConstants.DEFAULT_WAIT_TIMEOUT_SECONDS,
+                      help="Seconds to wait per environment (default: %(default)s)")
+
+    logs = add_command(CliConstants.LOGS_COMMAND, _logs,
+                       "Stream CloudWatch log events (one JSON line each, then a summary line)", dry_run=False)
+    logs.add_argument("--groups", nargs="+", choices=CliConstants.LOG_GROUPS, metavar="GROUP",
+                      help=f"Log groups to read: {', '.join(CliConstants.LOG_GROUPS)} (default: all enabled)")
+    logs.add_argument("--since", type=_parse_time, default=CliConstants.DEFAULT_LOG_SINCE,
+                      help="Start time: 30m, 2h, 1d ago or an ISO date/time (default: %(default)s)")
+    logs.add_argument("--until", type=_parse_time, help="End time, same formats as --since (default: now)")
+    logs.add_argument("--filter", help="CloudWatch Logs filter pattern")
+    logs.add_argument("--stream-prefix", help="Only read log streams with this prefix")
+    logs.add_argument("--follow", action="store_true", help="Keep printing new events until interrupted")
+
+    snapshot = add_command(CliConstants.SNAPSHOT_COMMAND, _snapshot,
+                           "Export variables, connections and pools to a snapshot file", dry_run=False)
+    snapshot.add_argument("file", help="Snapshot file to write (*.jsonl.gz)")
+    snapshot.add_argument("--skip-connection-details", action="store_true",
+                          help="Do not re-read each connection for its extra field")
+
+    restore = add_command(CliConstants.RESTORE_COMMAND, _restore, "Replay a snapshot file into an environment")
+    restore.add_argument("file", help="Snapshot file written by the snapshot command")
+    restore.add_argument("--types", nargs="+", metavar="TYPE",
+                         help="Record types to replay: variable, connection, pool (default: all)")
+    restore.add_argument("--skip-verify", action="store_true", help="Skip record and file checksum verification")
+    return parser
+
+
+def main(argv: Optional[Iterable[str]] = None, stream: Optional[TextIO] = None) -> int:
+    """
+    Run mwaa-migrate
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+        stream: Where results are written (default: sys.stdout); logs always go to stderr
+
+    Returns:
+        int: Process exit code (0 success, 1 failed operation, 2 usage error)
+    """
+    try:
+        args = build_parser().parse_args(None if argv is None else list(argv))
+    except SystemExit as exit_request:
+        return exit_request.code if isinstance(exit_request.code, int) else CliConstants.EXIT_USAGE
+    args.stream = stream or sys.stdout
+    try:
+        return args.handler(args)
+    except Exception as ex:
+        _write_json({"status": "failed", "result": None, "error": str(ex)}, args.stream)
+        return CliConstants.EXIT_FAILED
@@ -0,0 +1,11 @@
+"""
+Command line package for bulk MWAA operations (mwaa-migrate)
+Imports only the standard library; AWS and Vault dependencies load per subcommand.
+"""
+
+from .MwaaMigrateCLI import build_parser, main
+
+__all__ = [
+    'build_parser',
+    'main'
+]
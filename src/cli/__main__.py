@@ -0,0 +1,13 @@
+"""
+Run the mwaa-migrate command line:
+
+    python -m cli list -e dev -r us
+"""
+
+import sys
+
+from .MwaaMigrateCLI import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+FakeLogsServer.py - Local stand-in for the CloudWatch Logs operations used to read MWAA logs
+Tech Description: FastAPI app emulating FilterLogEvents (time range, stream prefix/names, substring filter
+                  pattern, paginated with nextToken) and PutLogEvents over the json 1.1 protocol botocore
+                  speaks, with in-memory log groups (created on first put) and per-operation counters
+Pre_requisites: Requires fastapi and FakeServerConstants.py
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+from . import FakeServerConstants
+
+
+def _logs_response(body: Dict[str, Any], status_code: int = 200) -> Response:
+    """json 1.1 response"""
+    return Response(json.dumps(body), status_code=status_code, media_type=FakeServerConstants.LOGS_CONTENT_TYPE)
+
+
+def _logs_error(error_type: str, message: str) -> Response:
+    """json 1.1 error response"""
+    return _logs_response({"__type": error_type, "message": message}, 400)
+
+
+def create_logs_app() -> FastAPI:
+    """
+    Build a fake CloudWatch Logs app
+
+    Returns:
+        FastAPI: App exposing the Logs API plus /_fake/stats and /_fake/reset; events live in
+                 app.state.log_groups as {log group: [event]} sorted by timestamp
+    """
+    app = FastAPI(title="Fake CloudWatch Logs")
+    app.state.lock = threading.Lock()
+    app.state.stats = Counter()
+
+    def reset() -> None:
+        app.state.log_groups: Dict[str, List[Dict[str, Any]]] = {}
+        app.state.stats.clear()
+
+    reset()
+
+    def put_log_events(request_body: Dict[str, Any]) -> Response:
+        now = int(time.time() * 1000)
+        with app.state.lock:
+            events = app.state.log_groups.setdefault(request_body["logGroupName"], [])
+            for event in request_body.get("logEvents", []):
+                events.append({"logStreamName": request_body["logStreamName"], "timestamp": event["timestamp"],
+                               "message": event["message"], "ingestionTime": now, "eventId": uuid.uuid4().hex})
+            events.sort(key=lambda item: (item["timestamp"], item["ingestionTime"]))
+        app.state.stats["events_put"] += len(request_body.get("logEvents", []))
+        return _logs_response({"nextSequenceToken": uuid.uuid4().hex})
+
+    def filter_log_events(request_body: Dict[str, Any]) -> Response:
+        group = request_body.get("logGroupName") or request_body.get("logGroupIdentifier", "").split(":log-group:")[-1]
+        with app.state.lock:
+            if group not in app.state.log_groups:
+                return _logs_error("ResourceNotFoundException", "The specified log group does not exist.")
+            events = list(app.state.log_groups[group])
+        start, end = request_body.get("startTime"), request_body.get("endTime")
+        prefix = request_body.get("logStreamNamePrefix", "")
+        names = set(request_body.get("logStreamNames") or [])
+        pattern = (request_body.get("filterPattern") or "").strip('"')
+        matching = [event for event in events
+                    if (start is None or event["timestamp"] >= start) and (end is None or event["timestamp"] <= end)
+                    and event["logStreamName"].startswith(prefix) and (not names or event["logStreamName"] in names)
+                    and pattern in event["message"]]
+        offset = int(request_body.get("nextToken") or 0)
+        limit = min(int(request_body.get("limit") or FakeServerConstants.LOGS_PAGE_SIZE),
+                    FakeServerConstants.LOGS_PAGE_SIZE)
+        response = {"events": matching[offset:offset + limit], "searchedLogStreams": []}
+        if offset + limit < len(matching):
+            response["nextToken"] = str(offset + limit)
+        app.state.stats["events_returned"] += len(response["events"])
+        return _logs_response(response)
+
+    operations = {"PutLogEvents": put_log_events, "FilterLogEvents": filter_log_events}
+
+    @app.get(FakeServerConstants.FAKE_STATS_PATH)
+    async def get_stats():
+        return dict(app.state.stats)
+
+    @app.post(FakeServerConstants.FAKE_RESET_PATH)
+    async def reset_state():
+        reset()
+        return Response(status_code=204)
+
+    @app.post("/")
+    async def dispatch(request: Request):
+        operation = request.headers.get(FakeServerConstants.LOGS_TARGET_HEADER, "")
+        operation = operation[len(FakeServerConstants.LOGS_TARGET_PREFIX):]
+        if operation not in operations:
+            return _logs_error("UnknownOperationException", f"Unsupported operation {operation}")
+        app.state.stats[operations[operation].__name__] += 1
+        return operations[operation](json.loads(await request.body() or b"{}"))
+
+    return app
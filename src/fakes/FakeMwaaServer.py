@@ -0,0 +1,336 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+FakeMwaaServer.py - Local stand-in for the AWS MWAA API
+Tech Description: FastAPI app emulating ListEnvironments, Get/Create/Update/DeleteEnvironment, TagResource
+                  and InvokeRestApi (for /variables, /connections and /pools) over the rest-json protocol botocore
+                  speaks, backed by in-memory Airflow state, with configurable latency, throttling, error
+                  injection and CREATING/UPDATING/DELETING durations
+Pre_requisites: Requires fastapi and FakeServerConstants.py
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from . import FakeServerConstants
+
+
+def _aws_error(status_code: int, error_type: str, message: str, retry_after: float = 0.0) -> JSONResponse:
+    """AWS rest-json error response, with a Retry-After header when retry_after is set"""
+    headers = {FakeServerConstants.AMZN_ERROR_TYPE_HEADER: error_type}
+    if retry_after:
+        headers[FakeServerConstants.RETRY_AFTER_HEADER] = str(retry_after)
+    return JSONResponse(status_code=status_code, content={"message": message}, headers=headers)
+
+
+def _rest_api_response(status_code: int, body: Any = None, retry_after: float = 0.0) -> JSONResponse:
+    """
+    InvokeRestApi response. 2xx Airflow responses come back as HTTP 200; 4xx/5xx ones as
+    RestApiClientException/RestApiServerException errors carrying the Airflow status (and a
+    Retry-After header when retry_after is set).
+    """
+    content = {"RestApiStatusCode": status_code, "RestApiResponse": body}
+    if status_code < 400:
+        return JSONResponse(status_code=200, content=content)
+    error_type = (FakeServerConstants.REST_API_SERVER_EXCEPTION if status_code >= 500
+                  else FakeServerConstants.REST_API_CLIENT_EXCEPTION)
+    headers = {FakeServerConstants.AMZN_ERROR_TYPE_HEADER: error_type}
+    if retry_after:
+        headers[FakeServerConstants.RETRY_AFTER_HEADER] = str(retry_after)
+    return JSONResponse(status_code=400, content=content, headers=headers)
+
+
+def _fake_environment(name: str, index: int) -> Dict[str, Any]:
+    """A GetEnvironment "Environment" structure for a fake environment"""
+    arn_prefix = f"arn:aws:airflow:us-east-1:{FakeServerConstants.FAKE_ACCOUNT_ID}"
+    log_group = f"arn:aws:logs:us-east-1:{FakeServerConstants.FAKE_ACCOUNT_ID}:log-group:airflow-{name}"
+    return {
+        "Name": name,
+        "Status": "AVAILABLE",
+        "AirflowVersion": FakeServerConstants.FAKE_AIRFLOW_VERSION,
+        "EnvironmentClass": "mw1.small",
+        "MaxWorkers": 10,
+        "MinWorkers": 1,
+        "Schedulers": 2,
+        "WebserverAccessMode": "PUBLIC_ONLY",
+        "CreatedAt": time.time() - 86400 * (index + 1),
+        "SourceBucketArn": f"arn:aws:s3:::local-mwaa-{name.lower()}",
+        "DagS3Path": "dags",
+        "ExecutionRoleArn": f"arn:aws:iam::{FakeServerConstants.FAKE_ACCOUNT_ID}:role/{name}-execution",
+        "ServiceRoleArn": f"arn:aws:iam::{FakeServerConstants.FAKE_ACCOUNT_ID}:role/aws-service-role/airflow",
+        "WebserverUrl": f"{name.lower()}.local",
+        "Arn": f"{arn_prefix}:environment/{name}",
+        "Tags": {"environment-id": "developement"},
+        "WeeklyMaintenanceWindowStart": "SAT:22:00",
+        "RequirementsS3Path": "requirements.txt",
+        "PluginsS3Path": "plugins.zip",
+        "LoggingConfiguration": {
+            log_type: {"CloudWatchLogGroupArn": f"{log_group}-{group}", "Enabled": True, "LogLevel": "INFO"}
+            for log_type, group in (("DagProcessingLogs", "DAGProcessing"), ("SchedulerLogs", "Scheduler"),
+                                    ("TaskLogs", "Task"), ("WebserverLogs", "WebServer"),
+                                    ("WorkerLogs", "Worker"))
+        }
+    }
+
+
+def _apply_environment_input(environment: Dict[str, Any], request_body: Dict[str, Any]) -> None:
+    """Merge a Create/UpdateEnvironment request into an Environment structure"""
+    for key, value in request_body.items():
+        if key == "LoggingConfiguration":
+            logging_configuration = environment.setdefault(key, {})
+            for log_type, settings in value.items():
+                logging_configuration.setdefault(log_type, {}).update(settings)
+        elif key == "NetworkConfiguration":
+            environment.setdefault(key, {}).update(value)
+        else:
+            environment[key] = value
+
+
+class _AirflowState:
+    """In-memory variables, connections and pools of one fake Airflow"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.variables: Dict[str, Dict[str, Any]] = {}
+        self.connections: Dict[str, Dict[str, Any]] = {}
+        self.pools: Dict[str, Dict[str, Any]] = {
+            FakeServerConstants.DEFAULT_POOL["name"]: dict(FakeServerConstants.DEFAULT_POOL)
+        }
+
+    def handle(self, method: str, path: str, query: Dict[str, Any], body: Any) -> Tuple[int, Any]:
+        """Route an Airflow REST API call and return (status, response body)"""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        collections = {
+            "variables": (self.variables, "key", None),
+            "connections": (self.connections, "connection_id", FakeServerConstants.CONNECTION_LIST_FIELDS),
+            "pools": (self.pools, "name", None),
+        }
+        if not parts or parts[0] not in collections or len(parts) > 2:
+            return 404, {"title": "Not Found", "status": 404}
+        items, id_field, list_fields = collections[parts[0]]
+
+        with self.lock:
+            if len(parts) == 1:
+                if method == "GET":
+                    offset = int(query.get("offset", 0))
+                    limit = int(query.get("limit", 100))
+                    page = list(items.values())[offset:offset + limit]
+                    if list_fields:
+                        page = [{field: item.get(field) for field in list_fields} for item in page]
+                    return 200, {parts[0]: [self._public(parts[0], item) for item in page], "total_entries": len(items)}
+                if method == "POST":
+                    if not isinstance(body, dict) or not body.get(id_field):
+                        return 400, {"title": "Bad Request", "detail": f"{id_field} is required", "status": 400}
+                    if parts[0] == "variables":
+                        if "value" not in body:
+                            return 400, {"title": "Bad Request", "detail": "value is required", "status": 400}
+                    elif body[id_field] in items:
+                        return 409, {"title": "Conflict", "detail": f"{body[id_field]} already exists",
+                                     "status": 409}
+                    items[body[id_field]] = dict(body)
+                    return 200, self._public(parts[0], items[body[id_field]])
+                return 405, {"title": "Method Not Allowed", "status": 405}
+
+            identifier = parts[1]
+            if identifier not in items:
+                return 404, {"title": "Not Found", "detail": f"{identifier} not found", "status": 404}
+            if method == "GET":
+                return 200, self._public(parts[0], items[identifier])
+            if method == "PATCH":
+                items[identifier].update(body or {})
+                return 200, self._public(parts[0], items[identifier])
+            if method == "DELETE":
+                del items[identifier]
+                return 204, None
+            return 405, {"title": "Method Not Allowed", "status": 405}
+
+    @staticmethod
+    def _public(collection: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Strip write-only fields and mask sensitive variables, as the Airflow REST API does"""
+        item = {key: value for key, value in item.items() if key not in FakeServerConstants.CONNECTION_SECRET_FIELDS}
+        if collection == "variables" and any(word in item["key"].lower()
+                                             for word in FakeServerConstants.SENSITIVE_VARIABLE_KEY_WORDS):
+            item["value"] = FakeServerConstants.MASKED_VALUE
+        return item
+
+
+def create_mwaa_app(
+    environment_names: Optional[List[str]] = None,
+    environment_count: int = FakeServerConstants.DEFAULT_ENVIRONMENT_COUNT,
+    faults: Optional[Dict[str, float]] = None
+) -> FastAPI:
+    """
+    Build a fake MWAA API app
+
+    Args:
+        environment_names (list): Names of the fake environments (default: generated names)
+        environment_count (int): Number of generated environments when names are not given
+        faults (dict): Initial fault injection settings (see FakeServerConstants.DEFAULT_FAULTS)
+
+    Returns:
+        FastAPI: App exposing the MWAA routes plus /_fake/config, /_fake/stats and /_fake/reset
+    """
+    app = FastAPI(title="Fake MWAA")
+    names = environment_names or [
+        FakeServerConstants.FAKE_ENVIRONMENT_NAME.format(index=index) for index in range(environment_count)
+    ]
+    app.state.faults = dict(FakeServerConstants.DEFAULT_FAULTS, **(faults or {}))
+    app.state.stats = Counter()
+
+    def reset() -> None:
+        app.state.environments = {name: _fake_environment(name, index) for index, name in enumerate(names)}
+        app.state.airflow = {name: _AirflowState() for name in names}
+        app.state.transitions: Dict[str, Tuple[float, Optional[str]]] = {}
+        app.state.stats.clear()
+
+    def settle(name: str) -> Optional[Dict[str, Any]]:
+        """Finish a CREATING/UPDATING/DELETING transition whose duration has passed; None once deleted"""
+        transition = app.state.transitions.get(name)
+        if transition and time.time() >= transition[0]:
+            del app.state.transitions[name]
+            if transition[1] is None:
+                app.state.environments.pop(name, None)
+                app.state.airflow.pop(name, None)
+            else:
+                app.state.environments[name]["Status"] = transition[1]
+                app.state.environments[name]["LastUpdate"]["Status"] = "SUCCESS"
+        return app.state.environments.get(name)
+
+    def begin(name: str, status: str, final_status: Optional[str], update_type: str) -> None:
+        """Put an environment in a transitional status for TRANSITION_SECONDS_KEY seconds"""
+        environment = app.state.environments[name]
+        environment["Status"] = status
+        environment["LastUpdate"] = {"Status": "PENDING", "CreatedAt": time.time(), "Source": update_type}
+        app.state.transitions[name] = (
+            time.time() + app.state.faults[FakeServerConstants.TRANSITION_SECONDS_KEY], final_status)
+        settle(name)
+
+    reset()
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if request.url.path.startswith("/_fake"):
+            return await call_next(request)
+        faults = app.state.faults
+        delay = faults[FakeServerConstants.LATENCY_SECONDS_KEY] + random.uniform(
+            0, faults[FakeServerConstants.LATENCY_JITTER_SECONDS_KEY])
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if random.random() < faults[FakeServerConstants.THROTTLE_RATE_KEY]:
+            app.state.stats["throttled"] += 1
+            return _aws_error(429, FakeServerConstants.THROTTLING_EXCEPTION, "Rate exceeded",
+                              faults[FakeServerConstants.RETRY_AFTER_SECONDS_KEY])
+        if random.random() < faults[FakeServerConstants.ERROR_RATE_KEY]:
+            app.state.stats["errors"] += 1
+            retry_after = faults[FakeServerConstants.RETRY_AFTER_SECONDS_KEY]
+            if request.url.path.startswith("/restapi/"):
+                status_code = int(faults[FakeServerConstants.ERROR_STATUS_CODE_KEY])
+                return _rest_api_response(status_code, {"title": "Injected error", "status": status_code},
+                                          retry_after)
+            return _aws_error(500, FakeServerConstants.INTERNAL_SERVER_EXCEPTION, "Injected error", retry_after)
+        return await call_next(request)
+
+    @app.get("/environments")
+    async def list_environments(MaxResults: int = 25, NextToken: Optional[str] = None):
+        app.state.stats["list_environments"] += 1
+        start = int(NextToken or 0)
+        environments = [name for name in list(app.state.environments) if settle(name)]
+        response = {"Environments": environments[start:start + MaxResults]}
+        if start + MaxResults < len(environments):
+            response["NextToken"] = str(start + MaxResults)
+        return response
+
+    @app.get("/environments/{name}")
+    async def get_environment(name: str):
+        app.state.stats["get_environment"] += 1
+        environment = settle(name)
+        if environment is None:
+            return _aws_error(404, FakeServerConstants.RESOURCE_NOT_FOUND_EXCEPTION, f"Environment {name} not found")
+        return {"Environment": environment}
+
+    @app.put("/environments/{name}")
+    async def create_environment(name: str, request: Request):
+        app.state.stats["create_environment"] += 1
+        if settle(name) is not None:
+            return _aws_error(400, FakeServerConstants.VALIDATION_EXCEPTION, f"Environment {name} already exists")
+        environment = _fake_environment(name, 0)
+        environment["CreatedAt"] = time.time()
+        _apply_environment_input(environment, await request.json())
+        app.state.environments[name] = environment
+        app.state.airflow[name] = _AirflowState()
+        begin(name, "CREATING", "AVAILABLE", "CREATE")
+        return {"Arn": environment["Arn"]}
+
+    @app.patch("/environments/{name}")
+    async def update_environment(name: str, request: Request):
+        app.state.stats["update_environment"] += 1
+        environment = settle(name)
+        if environment is None:
+            return _aws_error(404, FakeServerConstants.RESOURCE_NOT_FOUND_EXCEPTION, f"Environment {name} not found")
+        if environment["Status"] != "AVAILABLE":
+            return _aws_error(400, FakeServerConstants.VALIDATION_EXCEPTION,
+                              f"Environment {name} is {environment['Status']}")
+        _apply_environment_input(environment, await request.json())
+        begin(name, "UPDATING", "AVAILABLE", "UPDATE")
+        return {"Arn": environment["Arn"]}
+
+    @app.delete("/environments/{name}")
+    async def delete_environment(name: str):
+        app.state.stats["delete_environment"] += 1
+        if settle(name) is None:
+            return _aws_error(404, FakeServerConstants.RESOURCE_NOT_FOUND_EXCEPTION, f"Environment {name} not found")
+        begin(name, "DELETING", None, "DELETE")
+        return {}
+
+    @app.post("/tags/{arn:path}")
+    async def tag_resource(arn: str, request: Request):
+        app.state.stats["tag_resource"] += 1
+        for environment in app.state.environments.values():
+            if environment["Arn"] == arn:
+                environment.setdefault("Tags", {}).update((await request.json()).get("Tags") or {})
+                return {}
+        return _aws_error(404, FakeServerConstants.RESOURCE_NOT_FOUND_EXCEPTION, f"Resource {arn} not found")
+
+    @app.post("/restapi/{name}")
+    async def invoke_rest_api(name: str, request: Request):
+        app.state.stats["invoke_rest_api"] += 1
+        if name not in app.state.airflow:
+            return _aws_error(404, FakeServerConstants.RESOURCE_NOT_FOUND_EXCEPTION, f"Environment {name} not found")
+        request_body = await request.json()
+        status_code, body = app.state.airflow[name].handle(
+            request_body.get("Method", "GET").upper(),
+            request_body.get("Path", "/"),
+            request_body.get("QueryParameters") or {},
+            request_body.get("Body")
+        )
+        return _rest_api_response(status_code, body)
+
+    @app.get(FakeServerConstants.FAKE_CONFIG_PATH)
+    async def get_faults():
+        return app.state.faults
+
+    @app.post(FakeServerConstants.FAKE_CONFIG_PATH)
+    async def set_faults(request: Request):
+        app.state.faults.update(await request.json())
+        return app.state.faults
+
+    @app.get(FakeServerConstants.FAKE_STATS_PATH)
+    async def get_stats():
+        return dict(app.state.stats)
+
+    @app.post(FakeServerConstants.FAKE_RESET_PATH)
+    async def reset_state():
+        reset()
+        return Response(status_code=204)
+
+    return app
@@ -0,0 +1,225 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+FakeS3Server.py - Local stand-in for the S3 operations used to deploy to MWAA source buckets
+Tech Description: FastAPI app emulating path-style ListObjectsV2, Put/Get/Head/DeleteObject, DeleteObjects
+                  and multipart uploads over in-memory, always-versioned buckets (created on first use;
+                  Head/GetObject accept versionId), with MD5 / multipart ETags as S3 computes them, user
+                  metadata and per-operation counters
+Pre_requisites: Requires fastapi and FakeServerConstants.py
+"""
+
+import hashlib
+import threading
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+from . import FakeServerConstants
+
+
+def _xml(root: str, body: str, status_code: int = 200) -> Response:
+    """S3 XML response"""
+    return Response(
+        f'<?xml version="1.0" encoding="UTF-8"?><{root} xmlns="{FakeServerConstants.S3_XML_NAMESPACE}">'
+        f"{body}</{root}>",
+        status_code=status_code,
+        media_type="application/xml"
+    )
+
+
+def _s3_error(status_code: int, code: str, message: str) -> Response:
+    """S3 XML error response"""
+    return Response(f'<?xml version="1.0" encoding="UTF-8"?><Error><Code>{code}</Code>'
+                    f"<Message>{escape(message)}</Message></Error>",
+                    status_code=status_code, media_type="application/xml")
+
+
+def _decode_aws_chunked(payload: bytes) -> bytes:
+    """Strip aws-chunked framing (size;ext CRLF data CRLF ... 0 CRLF trailers) from a request body"""
+    data, position = bytearray(), 0
+    while True:
+        line_end = payload.index(b"\r\n", position)
+        size = int(payload[position:line_end].split(b";")[0], 16)
+        if size == 0:
+            return bytes(data)
+        data += payload[line_end + 2:line_end + 2 + size]
+        position = line_end + 2 + size + 2
+
+
+async def _request_body(request: Request) -> bytes:
+    """Request body with any aws-chunked content encoding removed"""
+    payload = await request.body()
+    if "aws-chunked" in request.headers.get("content-encoding", "") or \
+            request.headers.get("x-amz-content-sha256", "").startswith("STREAMING-"):
+        return _decode_aws_chunked(payload)
+    return payload
+
+
+def create_s3_app() -> FastAPI:
+    """
+    Build a fake S3 app (path-style addressing)
+
+    Returns:
+        FastAPI: App exposing the S3 routes plus /_fake/stats and /_fake/reset; buckets live in
+                 app.state.buckets as {bucket: {key: object}}
+    """
+    app = FastAPI(title="Fake S3")
+    app.state.lock = threading.Lock()
+    app.state.stats = Counter()
+
+    def reset() -> None:
+        app.state.buckets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        app.state.uploads: Dict[str, Dict[str, Any]] = {}
+        app.state.versions: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        app.state.stats.clear()
+
+    reset()
+
+    def store(bucket: str, key: str, data: bytes, etag: str, metadata: Dict[str, str]) -> Dict[str, Any]:
+        item = {"data": data, "etag": etag, "version_id": uuid.uuid4().hex, "metadata": metadata}
+        with app.state.lock:
+            app.state.buckets.setdefault(bucket, {})[key] = item
+            app.state.versions[(bucket, key, item["version_id"])] = item
+        return item
+
+    def object_headers(item: Dict[str, Any]) -> Dict[str, str]:
+        headers = {"ETag": f'"{item["etag"]}"', "x-amz-version-id": item["version_id"]}
+        headers.update({f"x-amz-meta-{name}": value for name, value in item["metadata"].items()})
+        return headers
+
+    @app.get(FakeServerConstants.FAKE_STATS_PATH)
+    async def get_stats():
+        return dict(app.state.stats)
+
+    @app.post(FakeServerConstants.FAKE_RESET_PATH)
+    async def reset_state():
+        reset()
+        return {"reset": True}
+
+    @app.put("/{bucket}")
+    async def create_bucket(bucket: str):
+        app.state.stats["create_bucket"] += 1
+        with app.state.lock:
+            app.state.buckets.setdefault(bucket, {})
+        return Response(status_code=200)
+
+    @app.get("/{bucket}")
+    async def list_objects(bucket: str, request: Request):
+        query = request.query_params
+        if "versioning" in query:
+            return _xml("VersioningConfiguration", "<Status>Enabled</Status>")
+        app.state.stats["list_objects"] += 1
+        prefix = query.get("prefix", "")
+        max_keys = int(query.get("max-keys", FakeServerConstants.S3_MAX_KEYS))
+        start_after = query.get("continuation-token") or query.get("start-after") or ""
+        with app.state.lock:
+            keys = sorted(key for key in app.state.buckets.get(bucket, {}) if key.startswith(prefix) and
+                          key > start_after)
+            page = [(key, app.state.buckets[bucket][key]) for key in keys[:max_keys]]
+        truncated = len(keys) > max_keys
+        contents = "".join(
+            f"<Contents><Key>{escape(key)}</Key><ETag>&quot;{item['etag']}&quot;</ETag>"
+            f"<Size>{len(item['data'])}</Size><StorageClass>STANDARD</StorageClass></Contents>"
+            for key, item in page
+        )
+        next_token = f"<NextContinuationToken>{escape(page[-1][0])}</NextContinuationToken>" if truncated else ""
+        return _xml("ListBucketResult",
+                    f"<Name>{bucket}</Name><Prefix>{escape(prefix)}</Prefix><KeyCount>{len(page)}</KeyCount>"
+                    f"<MaxKeys>{max_keys}</MaxKeys><IsTruncated>{str(truncated).lower()}</IsTruncated>"
+                    f"{next_token}{contents}")
+
+    @app.post("/{bucket}")
+    async def delete_objects(bucket: str, request: Request):
+        app.state.stats["delete_objects"] += 1
+        document = ElementTree.fromstring(await _request_body(request))
+        keys = [element.text for element in document.iter() if element.tag.endswith("Key")]
+        with app.state.lock:
+            for key in keys:
+                app.state.buckets.get(bucket, {}).pop(key, None)
+        app.state.stats["objects_deleted"] += len(keys)
+        return _xml("DeleteResult", "".join(f"<Deleted><Key>{escape(key)}</Key></Deleted>" for key in keys))
+
+    @app.put("/{bucket}/{key:path}")
+    async def put_object(bucket: str, key: str, request: Request):
+        data = await _request_body(request)
+        query = request.query_params
+        if "uploadId" in query:
+            app.state.stats["upload_part"] += 1
+            upload = app.state.uploads.get(query["uploadId"])
+            if upload is None:
+                return _s3_error(404, "NoSuchUpload", query["uploadId"])
+            digest = hashlib.md5(data).hexdigest()
+            upload["parts"][int(query["partNumber"])] = (data, digest)
+            return Response(status_code=200, headers={"ETag": f'"{digest}"'})
+
+        app.state.stats["put_object"] += 1
+        app.state.stats["bytes_uploaded"] += len(data)
+        metadata = {name[len("x-amz-meta-"):]: value for name, value in request.headers.items()
+                    if name.startswith("x-amz-meta-")}
+        item = store(bucket, key, data, hashlib.md5(data).hexdigest(), metadata)
+        return Response(status_code=200, headers=object_headers(item))
+
+    @app.post("/{bucket}/{key:path}")
+    async def multipart(bucket: str, key: str, request: Request):
+        query = request.query_params
+        if "uploads" in query:
+            app.state.stats["create_multipart_upload"] += 1
+            upload_id = uuid.uuid4().hex
+            metadata = {name[len("x-amz-meta-"):]: value for name, value in request.headers.items()
+                        if name.startswith("x-amz-meta-")}
+            app.state.uploads[upload_id] = {"bucket": bucket, "key": key, "parts": {}, "metadata": metadata}
+            return _xml("InitiateMultipartUploadResult",
+                        f"<Bucket>{bucket}</Bucket><Key>{escape(key)}</Key><UploadId>{upload_id}</UploadId>")
+
+        upload = app.state.uploads.pop(query.get("uploadId", ""), None)
+        if upload is None:
+            return _s3_error(404, "NoSuchUpload", query.get("uploadId", ""))
+        app.state.stats["complete_multipart_upload"] += 1
+        parts: List = [upload["parts"][number] for number in sorted(upload["parts"])]
+        data = b"".join(part for part, _ in parts)
+        etag = hashlib.md5(b"".join(bytes.fromhex(digest) for _, digest in parts)).hexdigest() + f"-{len(parts)}"
+        app.state.stats["bytes_uploaded"] += len(data)
+        item = store(bucket, key, data, etag, upload["metadata"])
+        return _xml("CompleteMultipartUploadResult",
+                    f"<Bucket>{bucket}</Bucket><Key>{escape(key)}</Key><ETag>&quot;{etag}&quot;</ETag>")
+
+    def find(bucket: str, key: str, version_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with app.state.lock:
+            if version_id:
+                return app.state.versions.get((bucket, key, version_id))
+            return app.state.buckets.get(bucket, {}).get(key)
+
+    @app.head("/{bucket}/{key:path}")
+    async def head_object(bucket: str, key: str, versionId: Optional[str] = None):
+        app.state.stats["head_object"] += 1
+        item = find(bucket, key, versionId)
+        if item is None:
+            return Response(status_code=404)
+        return Response(status_code=200, headers=dict(object_headers(item), **{
+            "Content-Length": str(len(item["data"]))}))
+
+    @app.get("/{bucket}/{key:path}")
+    async def get_object(bucket: str, key: str, versionId: Optional[str] = None):
+        app.state.stats["get_object"] += 1
+        item = find(bucket, key, versionId)
+        if item is None:
+            return _s3_error(404, "NoSuchKey", key)
+        return Response(item["data"], status_code=200, headers=object_headers(item),
+                        media_type="application/octet-stream")
+
+    @app.delete("/{bucket}/{key:path}")
+    async def delete_object(bucket: str, key: str):
+        app.state.stats["delete_object"] += 1
+        with app.state.lock:
+            app.state.buckets.get(bucket, {}).pop(key, None)
+        return Response(status_code=204)
+
+    return app
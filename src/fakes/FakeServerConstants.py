@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+FakeServerConstants.py - Constants for the local MWAA and Vault stand-in servers
+"""
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_MWAA_PORT = 8951
+DEFAULT_VAULT_PORT = 8952
+SERVER_START_TIMEOUT_SECONDS = 10
+
+# Fault injection settings (all may be changed at runtime via POST /_fake/config)
+LATENCY_SECONDS_KEY = "latency_seconds"
+LATENCY_JITTER_SECONDS_KEY = "latency_jitter_seconds"
+THROTTLE_RATE_KEY = "throttle_rate"
+ERROR_RATE_KEY = "error_rate"
+ERROR_STATUS_CODE_KEY = "error_status_code"
+RETRY_AFTER_SECONDS_KEY = "retry_after_seconds"
+TRANSITION_SECONDS_KEY = "transition_seconds"
+DEFAULT_FAULTS = {
+    LATENCY_SECONDS_KEY: 0.0,
+    LATENCY_JITTER_SECONDS_KEY: 0.0,
+    THROTTLE_RATE_KEY: 0.0,
+    ERROR_RATE_KEY: 0.0,
+    ERROR_STATUS_CODE_KEY: 503,
+    RETRY_AFTER_SECONDS_KEY: 0.0,
+    TRANSITION_SECONDS_KEY: 0.0,
+}
+
+# Control endpoints
+FAKE_CONFIG_PATH = "/_fake/config"
+FAKE_STATS_PATH = "/_fake/stats"
+FAKE_RESET_PATH = "/_fake/reset"
+
+# AWS error responses
+AMZN_ERROR_TYPE_HEADER = "x-amzn-ErrorType"
+RETRY_AFTER_HEADER = "Retry-After"
+THROTTLING_EXCEPTION = "ThrottlingException"
+INTERNAL_SERVER_EXCEPTION = "InternalServerException"
+RESOURCE_NOT_FOUND_EXCEPTION = "ResourceNotFoundException"
+VALIDATION_EXCEPTION = "ValidationException"
+REST_API_CLIENT_EXCEPTION = "RestApiClientException"
+REST_API_SERVER_EXCEPTION = "RestApiServerException"
+
+# Fake MWAA defaults
+DEFAULT_ENVIRONMENT_COUNT = 3
+FAKE_ENVIRONMENT_NAME = "MWAA1USVGA00000D{index:03d}"
+FAKE_ACCOUNT_ID = "000000000000"
+FAKE_AIRFLOW_VERSION = "2.10.3"
+DEFAULT_POOL = {"name": "default_pool", "slots": 128, "description": "Default pool", "include_deferred": False}
+CONNECTION_LIST_FIELDS = ["connection_id", "conn_type", "description", "host", "login", "schema", "port"]
+CONNECTION_SECRET_FIELDS = ["password"]
+# Variables whose key contains one of these words are returned masked, like Airflow's secrets masker does
+SENSITIVE_VARIABLE_KEY_WORDS = ["access_token", "api_key", "apikey", "authorization", "passphrase", "passwd",
+                                "password", "private_key", "secret", "token"]
+MASKED_VALUE = "***"
+
+# Fake S3 defaults
+S3_XML_NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+S3_MAX_KEYS = 1000
+
+# Fake CloudWatch Logs defaults
+LOGS_TARGET_HEADER = "x-amz-target"
+LOGS_TARGET_PREFIX = "Logs_20140328."
+LOGS_CONTENT_TYPE = "application/x-amz-json-1.1"
+LOGS_PAGE_SIZE = 100
+
+# Fake Vault defaults
+DEFAULT_TOKEN_TTL_SECONDS = 3600
+DEFAULT_AWS_CREDENTIALS_TTL_SECONDS = 3600
+VAULT_TOKEN_HEADER = "X-Vault-Token"
+FAKE_ROLE_ID = "local-role-id"
+FAKE_SECRET_ID = "local-secret-id"
+FAKE_SECRET_ENGINE = "kv"
+FAKE_ROLE_ARN = "arn:aws:iam::000000000000:role/local-{environment}"
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+FakeServerUtils.py - Helpers to run the local MWAA and Vault stand-ins
+Tech Description: Runs a FastAPI app under uvicorn in a background thread and writes a config.json that
+                  points CommonUtils at the local servers
+Pre_requisites: Requires uvicorn and FakeServerConstants.py
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import uvicorn
+
+from . import FakeServerConstants
+
+
+@contextmanager
+def serve(app, host: str = FakeServerConstants.DEFAULT_HOST, port: int = 0) -> Iterator[str]:
+    """
+    Run an ASGI app in a background thread and yield its base URL (port 0 picks a free port)
+
+    Raises:
+        Exception: If the server does not start within SERVER_START_TIMEOUT_SECONDS
+    """
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + FakeServerConstants.SERVER_START_TIMEOUT_SECONDS
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise Exception(f"Fake server failed to start on {host}:{port}")
+        time.sleep(0.01)
+
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{bound_port}"
+    finally:
+        server.should_exit = True
+        thread.join(FakeServerConstants.SERVER_START_TIMEOUT_SECONDS)
+
+
+def local_config(mwaa_url: str, vault_url: str, environment: str = "dev", region: str = "us",
+                 overrides: Optional[Dict[str, Any]] = None, s3_url: Optional[str] = None,
+                 logs_url: Optional[str] = None) -> Dict[str, Any]:
+    """Return a config.json document pointing CommonUtils at the local servers"""
+    config = {
+        "URL_KEY": vault_url,
+        "NAMESPACE_KEY": "",
+        "ROLE_ID_KEY": FakeServerConstants.FAKE_ROLE_ID,
+        "SECRET_ID_KEY": FakeServerConstants.FAKE_SECRET_ID,
+        "DEV_SECRET_ENGINE": FakeServerConstants.FAKE_SECRET_ENGINE,
+        "TST_SECRET_ENGINE": FakeServerConstants.FAKE_SECRET_ENGINE,
+        "PRD_SECRET_ENGINE": FakeServerConstants.FAKE_SECRET_ENGINE,
+        "dev_environment_role_arn": FakeServerConstants.FAKE_ROLE_ARN.format(environment="dev"),
+        "tst_environment_role_arn": FakeServerConstants.FAKE_ROLE_ARN.format(environment="tst"),
+        "prd_environment_role_arn": FakeServerConstants.FAKE_ROLE_ARN.format(environment="prd"),
+        "environment": environment,
+        "region": region,
+        "AWS_ENDPOINT_URL": mwaa_url,
+    }
+    if s3_url:
+        config["AWS_ENDPOINT_URL_S3"] = s3_url
+    if logs_url:
+        config["AWS_ENDPOINT_URL_LOGS"] = logs_url
+    config.update(overrides or {})
+    return config
+
+
+def write_local_config(path: str, mwaa_url: str, vault_url: str, **kwargs) -> str:
+    """Write local_config(...) to path and return the path"""
+    with open(path, "w") as config_file:
+        json.dump(local_config(mwaa_url, vault_url, **kwargs), config_file, indent=2)
+    return path
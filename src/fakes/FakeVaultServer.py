@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+FakeVaultServer.py - Local stand-in for the HashiCorp Vault endpoints used by CommonUtils
+Tech Description: FastAPI app emulating AppRole login, token renew-self, KV v2 reads/writes and the AWS
+                  secrets engine credential endpoint, with login/renewal/mint counters for benchmarking
+Pre_requisites: Requires fastapi and FakeServerConstants.py
+"""
+
+import uuid
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from . import FakeServerConstants
+
+
+def _vault_error(status_code: int, message: str) -> JSONResponse:
+    """Vault error response"""
+    return JSONResponse(status_code=status_code, content={"errors": [message]})
+
+
+def create_vault_app(
+    secrets: Optional[Dict[str, Dict[str, Any]]] = None,
+    token_ttl: int = FakeServerConstants.DEFAULT_TOKEN_TTL_SECONDS,
+    aws_credentials_ttl: int = FakeServerConstants.DEFAULT_AWS_CREDENTIALS_TTL_SECONDS,
+    role_id: str = FakeServerConstants.FAKE_ROLE_ID,
+    secret_id: str = FakeServerConstants.FAKE_SECRET_ID
+) -> FastAPI:
+    """
+    Build a fake Vault app
+
+    Args:
+        secrets (dict): Initial KV v2 secrets as {"<mount>/<path>": {key: value}}
+        token_ttl (int): Lease duration of issued tokens in seconds
+        aws_credentials_ttl (int): Lease duration of issued AWS credentials in seconds
+        role_id (str): Accepted AppRole role_id
+        secret_id (str): Accepted AppRole secret_id
+
+    Returns:
+        FastAPI: App exposing the Vault routes plus /_fake/stats
+    """
+    app = FastAPI(title="Fake Vault")
+    app.state.secrets = {key.strip("/"): dict(value) for key, value in (secrets or {}).items()}
+    app.state.tokens = set()
+    app.state.stats = Counter()
+
+    def auth_block(token: str, ttl: int) -> Dict[str, Any]:
+        return {"auth": {"client_token": token, "lease_duration": ttl, "renewable": True, "policies": ["default"]}}
+
+    def authorized(request: Request) -> bool:
+        return request.headers.get(FakeServerConstants.VAULT_TOKEN_HEADER) in app.state.tokens
+
+    @app.post("/v1/auth/approle/login")
+    async def approle_login(request: Request):
+        body = await request.json()
+        if body.get("role_id") != role_id or body.get("secret_id") != secret_id:
+            return _vault_error(400, "invalid role or secret ID")
+        app.state.stats["logins"] += 1
+        token = f"s.{uuid.uuid4().hex}"
+        app.state.tokens.add(token)
+        return auth_block(token, token_ttl)
+
+    @app.post("/v1/auth/token/renew-self")
+    async def renew_self(request: Request):
+        if not authorized(request):
+            return _vault_error(403, "permission denied")
+        app.state.stats["renewals"] += 1
+        return auth_block(request.headers[FakeServerConstants.VAULT_TOKEN_HEADER], token_ttl)
+
+    @app.api_route("/v1/{mount}/creds/{name}", methods=["GET", "POST"])
+    async def aws_credentials(mount: str, name: str, request: Request):
+        if not authorized(request):
+            return _vault_error(403, "permission denied")
+        app.state.stats["credential_mints"] += 1
+        return {
+            "lease_id": f"{mount}/creds/{name}/{uuid.uuid4().hex}",
+            "lease_duration": aws_credentials_ttl,
+            "renewable": False,
+            "data": {
+                "access_key": f"ASIA{uuid.uuid4().hex[:16].upper()}",
+                "secret_key": uuid.uuid4().hex,
+                "security_token": uuid.uuid4().hex,
+                "arn": request.query_params.get("role_arn")
+            }
+        }
+
+    @app.get("/v1/{mount}/data/{path:path}")
+    async def read_secret(mount: str, path: str, request: Request):
+        if not authorized(request):
+            return _vault_error(403, "permission denied")
+        app.state.stats["secret_reads"] += 1
+        data = app.state.secrets.get(f"{mount}/{path.strip('/')}")
+        if data is None:
+            return _vault_error(404, f"no secret at {mount}/{path}")
+        return {"data": {"data": data, "metadata": {"version": 1}}}
+
+    @app.api_route("/v1/{mount}/data/{path:path}", methods=["POST", "PUT"])
+    async def write_secret(mount: str, path: str, request: Request):
+        if not authorized(request):
+            return _vault_error(403, "permission denied")
+        body = await request.json()
+        app.state.secrets[f"{mount}/{path.strip('/')}"] = dict(body.get("data", {}))
+        return {"data": {"version": 1}}
+
+    @app.get(FakeServerConstants.FAKE_STATS_PATH)
+    async def get_stats():
+        return dict(app.state.stats)
+
+    return app
@@ -0,0 +1,21 @@
+"""
+Local stand-ins for AWS MWAA, S3, CloudWatch Logs and HashiCorp Vault, for offline testing and benchmarking
+"""
+
+from .FakeMwaaServer import create_mwaa_app
+from .FakeVaultServer import create_vault_app
+from .FakeS3Server import create_s3_app
+from .FakeLogsServer import create_logs_app
+from .FakeServerUtils import serve, local_config, write_local_config
+
+from . import FakeServerConstants
+
+__all__ = [
+    'create_mwaa_app',
+    'create_vault_app',
+    'create_s3_app',
+    'create_logs_app',
+    'serve',
+    'local_config',
+    'write_local_config'
+]
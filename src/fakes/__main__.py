@@ -0,0 +1,45 @@
+"""
+Run the fake MWAA and Vault servers locally:
+
+    python -m fakes --config configs/local_config.json
+
+then point CommonUtils at them with MWAA_CONFIG_FILE=configs/local_config.json.
+"""
+
+import argparse
+import threading
+
+from . import FakeServerConstants, create_mwaa_app, create_vault_app, serve, write_local_config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run local MWAA and Vault stand-in servers")
+    parser.add_argument("--host", default=FakeServerConstants.DEFAULT_HOST)
+    parser.add_argument("--mwaa-port", type=int, default=FakeServerConstants.DEFAULT_MWAA_PORT)
+    parser.add_argument("--vault-port", type=int, default=FakeServerConstants.DEFAULT_VAULT_PORT)
+    parser.add_argument("--environments", type=int, default=FakeServerConstants.DEFAULT_ENVIRONMENT_COUNT)
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per MWAA call in seconds")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of MWAA calls throttled")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of MWAA calls failing")
+    parser.add_argument("--config", help="Write a config.json pointing at the servers to this path")
+    args = parser.parse_args()
+
+    mwaa_app = create_mwaa_app(environment_count=args.environments, faults={
+        FakeServerConstants.LATENCY_SECONDS_KEY: args.latency,
+        FakeServerConstants.THROTTLE_RATE_KEY: args.throttle_rate,
+        FakeServerConstants.ERROR_RATE_KEY: args.error_rate,
+    })
+    with serve(mwaa_app, args.host, args.mwaa_port) as mwaa_url, \
+            serve(create_vault_app(), args.host, args.vault_port) as vault_url:
+        print(f"Fake MWAA:  {mwaa_url}")
+        print(f"Fake Vault: {vault_url}")
+        if args.config:
+            print(f"Config written to {write_local_config(args.config, mwaa_url, vault_url)}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -5,49 +5,248 @@ __author__ = "ZS Associates"
 """
 CommonUtils.py - Essential Common Utilities for Vault and AWS
 Tech Description: Core utilities for Vault authentication and AWS operations
-Pre_requisites: Requires CommonUtilsConstants.py and config.json
+Pre_requisites: Requires CommonUtilsConstants.py, DLPLogSetup.py, MetricsUtils.py and config.json
 """
 
-import boto3
-import hvac
-from typing import Dict, Any, Tuple, Union
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+
+# boto3, botocore and hvac take a few hundred milliseconds to import, so they are imported where a
+# Vault client, credentials or an AWS client is first built rather than at module load
+if TYPE_CHECKING:
+    import boto3
+    from botocore.credentials import RefreshableCredentials
+
+try:
+    from dotenv import dotenv_values
+except ImportError:  # python-dotenv is optional; .env overrides are skipped without it
+    dotenv_values = None
 
 # Import constants
-from . import CommonUtilsConstants
+from . import CommonUtilsConstants, MetricsUtils
+from .DLPLogSetup import get_logger
+
+logger = get_logger(__name__)
+
+
+# Parsed config cached until config.json, .env or the override environment variables change
+_config_lock = threading.Lock()
+_config_cache = None
+_config_signature = None
+_config_checked_at = 0.0
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of a file, or None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
-def get_config() -> Dict[str, Any]:
-    """Load and return configuration from JSON file"""
+def _apply_overrides(config: Dict[str, Any], overrides: Dict[str, str]) -> None:
+    """
+    Apply MWAA_CONFIG_<KEY> overrides to config in place.
+
+    <KEY> matches an existing config key case-insensitively; values replacing non-string
+    settings are decoded as JSON when possible.
+    """
+    keys_by_upper = {key.upper(): key for key in config}
+    for name, value in overrides.items():
+        suffix = name[len(CommonUtilsConstants.CONFIG_ENV_PREFIX):]
+        key = keys_by_upper.get(suffix.upper(), suffix)
+        if key in config and not isinstance(config[key], str):
+            try:
+                value = CommonUtilsConstants.json.loads(value)
+            except ValueError:
+                pass
+        config[key] = value
+
+
+def get_config(force_reload: bool = False) -> Dict[str, Any]:
+    """
+    Load and return configuration from JSON file.
+
+    The parsed file is cached and re-read only when its mtime or size changes (checked at most
+    once per CONFIG_RECHECK_INTERVAL_SECONDS). Values can be overridden with MWAA_CONFIG_<KEY>
+    variables from the environment or the project .env file (environment wins), and
+    MWAA_CONFIG_FILE points at an alternative config file.
+    """
+    global _config_cache, _config_signature, _config_checked_at
     try:
-        with open(CommonUtilsConstants.CONFIG_FILE_PATH) as config_file:
-            return CommonUtilsConstants.json.load(config_file)
+        now = time.monotonic()
+        if (not force_reload and _config_cache is not None
+                and now - _config_checked_at < CommonUtilsConstants.CONFIG_RECHECK_INTERVAL_SECONDS):
+            return dict(_config_cache)
+
+        config_path = os.environ.get(CommonUtilsConstants.CONFIG_FILE_PATH_ENV,
+                                     CommonUtilsConstants.CONFIG_FILE_PATH)
+        env_overrides = {
+            name: value for name, value in os.environ.items()
+            if name.startswith(CommonUtilsConstants.CONFIG_ENV_PREFIX)
+        }
+        signature = (config_path,
+                     _file_signature(config_path),
+                     _file_signature(CommonUtilsConstants.DOTENV_FILE_PATH),
+                     env_overrides)
+
+        with _config_lock:
+            if force_reload or _config_cache is None or signature != _config_signature:
+                with open(config_path) as config_file:
+                    config = CommonUtilsConstants.json.load(config_file)
+
+                overrides = {}
+                if dotenv_values is not None and signature[2] is not None:
+                    overrides.update(
+                        (name, value)
+                        for name, value in dotenv_values(CommonUtilsConstants.DOTENV_FILE_PATH).items()
+                        if name.startswith(CommonUtilsConstants.CONFIG_ENV_PREFIX) and value is not None
+                    )
+                overrides.update(env_overrides)
+                _apply_overrides(config, overrides)
+
+                _config_cache = config
+                _config_signature = signature
+            _config_checked_at = now
+            return dict(_config_cache)
     except Exception as e:
         raise Exception(f"ERROR::Unable to fetch configs: {str(e)}")
 
 
-def client_auth():
-    """Authenticate vault client using AppRole"""
+def get_config_value(key: str, default: Any = None) -> Any:
+    """Return a single config value, or default when it is not set"""
+    return get_config().get(key, default)
+
+
+def get_vault_url() -> str:
+    """Get the Vault server URL from config"""
+    return str(get_config()[CommonUtilsConstants.VAULT_URL_KEY])
+
+
+def get_vault_namespace() -> str:
+    """Get the Vault namespace from config"""
+    return str(get_config()[CommonUtilsConstants.VAULT_NAMESPACE_KEY])
+
+
+def get_approle_credentials() -> Tuple[str, str]:
+    """Get the Vault AppRole (role_id, secret_id) from config"""
+    config = get_config()
+    return (str(config[CommonUtilsConstants.VAULT_ROLE_ID_KEY]),
+            str(config[CommonUtilsConstants.VAULT_SECRET_ID_KEY]))
+
+
+# Process-wide Vault client shared by every caller of client_auth
+_vault_lock = threading.Lock()
+_vault_client = None
+_vault_token_expiry = 0.0
+_vault_token_renewable = False
+_vault_auth_stats = {
+    CommonUtilsConstants.VAULT_LOGINS_KEY: 0,
+    CommonUtilsConstants.VAULT_RENEWALS_KEY: 0,
+    CommonUtilsConstants.VAULT_CACHE_HITS_KEY: 0,
+}
+
+
+def _token_expiry(auth: Dict[str, Any]) -> float:
+    """Return the monotonic expiry time for a Vault auth block (inf when the token never expires)"""
+    lease_duration = auth.get(CommonUtilsConstants.LEASE_DURATION_KEY) or 0
+    if lease_duration <= 0:
+        return float("inf")
+    return time.monotonic() + lease_duration
+
+
+def _vault_login():
+    """Perform a fresh AppRole login and return the authenticated client and its auth block"""
+    config = get_config()
+    role_id, secret_id = get_approle_credentials()
+
+    import hvac
+
+    client = hvac.Client(url=config[CommonUtilsConstants.VAULT_URL_KEY],
+                         namespace=config[CommonUtilsConstants.VAULT_NAMESPACE_KEY])
+
+    auth_response = client.auth.approle.login(
+        role_id=role_id,
+        secret_id=secret_id,
+    )
+
+    auth = auth_response[CommonUtilsConstants.AUTH_KEY]
+    client.token = auth[CommonUtilsConstants.CLIENT_TOKEN_KEY]
+    return client, auth
+
+
+@MetricsUtils.instrumented(CommonUtilsConstants.CLIENT_AUTH_OPERATION, failure_value=False)
+def client_auth(force_login: bool = False):
+    """
+    Return a Vault client authenticated using AppRole.
+
+    The client is cached process-wide and reused until its token lease is close to expiry.
+    Renewable tokens are renewed in place; a new AppRole login happens only when renewal
+    is not possible or fails.
+    """
+    global _vault_client, _vault_token_expiry, _vault_token_renewable
     try:
-        config = get_config()
-        
-        client = hvac.Client(url=config["URL_KEY"],
-                             namespace=config["NAMESPACE_KEY"])
-        
-        auth_response = client.auth.approle.login(
-            role_id=config["ROLE_ID_KEY"],
-            secret_id=config["SECRET_ID_KEY"],
-        )
-        
-        token = auth_response[CommonUtilsConstants.AUTH_KEY][CommonUtilsConstants.CLIENT_TOKEN_KEY]
-        client.token = token
-        
-        print("Authentication successful")
+        with _vault_lock:
+            now = time.monotonic()
+            renew_at = _vault_token_expiry - CommonUtilsConstants.VAULT_TOKEN_RENEW_MARGIN_SECONDS
+
+            if _vault_client is not None and not force_login:
+                if now < renew_at:
+                    _vault_auth_stats[CommonUtilsConstants.VAULT_CACHE_HITS_KEY] += 1
+                    return _vault_client
+
+                if _vault_token_renewable and now < _vault_token_expiry:
+                    try:
+                        renew_response = _vault_client.auth.token.renew_self()
+                        auth = renew_response[CommonUtilsConstants.AUTH_KEY]
+                        _vault_token_expiry = _token_expiry(auth)
+                        _vault_token_renewable = bool(auth.get(CommonUtilsConstants.RENEWABLE_KEY))
+                        _vault_auth_stats[CommonUtilsConstants.VAULT_RENEWALS_KEY] += 1
+                        logger.debug("Vault token renewed")
+                        if time.monotonic() < _vault_token_expiry - CommonUtilsConstants.VAULT_TOKEN_RENEW_MARGIN_SECONDS:
+                            return _vault_client
+                        logger.info("Renewed Vault token is at its max TTL, logging in again")
+                    except Exception as e:
+                        logger.warning("Vault token renewal failed, logging in again: %s", e)
+
+            client, auth = _vault_login()
+            _vault_client = client
+            _vault_token_expiry = _token_expiry(auth)
+            _vault_token_renewable = bool(auth.get(CommonUtilsConstants.RENEWABLE_KEY))
+            _vault_auth_stats[CommonUtilsConstants.VAULT_LOGINS_KEY] += 1
+
+        logger.info("Vault authentication successful")
         return client
     except Exception as e:
-        print("Error occurred while authenticating the client:", e)
+        logger.error("Error occurred while authenticating the client: %s", e)
         return False
 
 
+def get_vault_auth_stats() -> Dict[str, int]:
+    """Return Vault login/renewal counters, including how many logins the cached client saved"""
+    with _vault_lock:
+        stats = dict(_vault_auth_stats)
+    stats[CommonUtilsConstants.VAULT_LOGINS_SAVED_KEY] = (
+        stats[CommonUtilsConstants.VAULT_CACHE_HITS_KEY] + stats[CommonUtilsConstants.VAULT_RENEWALS_KEY]
+    )
+    return stats
+
+
+def reset_vault_client() -> None:
+    """Drop the cached Vault client so the next client_auth call logs in again"""
+    global _vault_client, _vault_token_expiry, _vault_token_renewable
+    with _vault_lock:
+        _vault_client = None
+        _vault_token_expiry = 0.0
+        _vault_token_renewable = False
+
+
 def get_secret_engine(environment: str) -> str:
     """Get secret engine based on environment"""
     try:
@@ -55,37 +254,113 @@ def get_secret_engine(environment: str) -> str:
         env_lower = environment.lower()
         
         if env_lower in CommonUtilsConstants.DEV_ENV_CHK:
-            return config["DEV_SECRET_ENGINE"]
+            return config[CommonUtilsConstants.DEV_SECRET_ENGINE_KEY]
         elif env_lower in CommonUtilsConstants.TST_ENV_CHK:
-            return config["TST_SECRET_ENGINE"]
+            return config[CommonUtilsConstants.TST_SECRET_ENGINE_KEY]
         elif env_lower in CommonUtilsConstants.PRD_ENV_CHK:
-            return config["PRD_SECRET_ENGINE"]
+            return config[CommonUtilsConstants.PRD_SECRET_ENGINE_KEY]
         else:
             raise Exception(f"Invalid environment selection for vault secret engine: {environment}")
     except Exception as ex:
         raise Exception(f"Unable to get secret engine: {str(ex)}")
 
 
-def read_secret(path: str, environment: str) -> Union[Dict[str, Any], bool]:
-    """Read secret from vault"""
+# In-memory secret cache keyed by (mount_point, path, version), least recently used first
+_secret_lock = threading.Lock()
+_secret_cache = OrderedDict()
+_secret_cache_stats = {
+    CommonUtilsConstants.SECRET_CACHE_HITS_KEY: 0,
+    CommonUtilsConstants.SECRET_CACHE_MISSES_KEY: 0,
+}
+
+
+def _get_cached_secret(cache_key: Tuple[str, str, Optional[int]]) -> Optional[Dict[str, Any]]:
+    """Return a fresh cached secret and mark it most recently used, or None"""
+    with _secret_lock:
+        entry = _secret_cache.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            _secret_cache.move_to_end(cache_key)
+            _secret_cache_stats[CommonUtilsConstants.SECRET_CACHE_HITS_KEY] += 1
+            return dict(entry[1])
+        if entry is not None:
+            del _secret_cache[cache_key]
+        _secret_cache_stats[CommonUtilsConstants.SECRET_CACHE_MISSES_KEY] += 1
+        return None
+
+
+def _store_secret(cache_key: Tuple[str, str, Optional[int]], data: Dict[str, Any]) -> None:
+    """Cache a secret for SECRET_CACHE_TTL_SECONDS, evicting the least recently used entries"""
+    with _secret_lock:
+        _secret_cache[cache_key] = (time.monotonic() + CommonUtilsConstants.SECRET_CACHE_TTL_SECONDS, dict(data))
+        _secret_cache.move_to_end(cache_key)
+        while len(_secret_cache) > CommonUtilsConstants.SECRET_CACHE_MAX_ENTRIES:
+            _secret_cache.popitem(last=False)
+
+
+def read_secret(path: str, environment: str, version: Optional[int] = None,
+                use_cache: bool = True) -> Union[Dict[str, Any], bool]:
+    """Read secret from vault, served from the in-memory cache when a fresh copy exists"""
     try:
+        mount_point = get_secret_engine(environment)
+        cache_key = (mount_point, path, version)
+        if use_cache:
+            cached = _get_cached_secret(cache_key)
+            if cached is not None:
+                return cached
+
         client = client_auth()
         if not client:
             return False
             
-        mount_point = get_secret_engine(environment)
         secret_response = client.secrets.kv.v2.read_secret_version(
             path=path,
+            version=version,
             mount_point=mount_point
         )
         
-        return secret_response[CommonUtilsConstants.DATA_KEY][CommonUtilsConstants.DATA_KEY]
+        data = secret_response[CommonUtilsConstants.DATA_KEY][CommonUtilsConstants.DATA_KEY]
+        _store_secret(cache_key, data)
+        return data
         
     except Exception as e:
-        print(f"ERROR::Error fetching secrets from vault: {e}")
+        logger.error("Error fetching secret %s from vault: %s", path, e)
         return False
 
 
+def read_secrets(paths: Iterable[str], environment: str,
+                 max_workers: int = CommonUtilsConstants.DEFAULT_SECRET_READ_CONCURRENCY
+                 ) -> Dict[str, Union[Dict[str, Any], bool]]:
+    """Read several secrets, fetching cache misses concurrently over the shared Vault client"""
+    paths = list(dict.fromkeys(paths))
+    return dict(zip(paths, bounded_map(lambda path: read_secret(path, environment), paths, max_workers)))
+
+
+def invalidate_secret(path: Optional[str] = None, environment: Optional[str] = None) -> int:
+    """
+    Drop cached secrets and return how many entries were removed.
+
+    With no arguments the whole cache is cleared; otherwise only entries matching the
+    given path and/or environment's secret engine are removed.
+    """
+    mount_point = get_secret_engine(environment) if environment else None
+    with _secret_lock:
+        stale = [
+            key for key in _secret_cache
+            if (path is None or key[1] == path) and (mount_point is None or key[0] == mount_point)
+        ]
+        for key in stale:
+            del _secret_cache[key]
+        return len(stale)
+
+
+def get_secret_cache_stats() -> Dict[str, int]:
+    """Return secret cache hit/miss counters and current size"""
+    with _secret_lock:
+        stats = dict(_secret_cache_stats)
+        stats[CommonUtilsConstants.SECRET_CACHE_SIZE_KEY] = len(_secret_cache)
+    return stats
+
+
 def get_aws_region(region: str) -> str:
     """Get AWS region from region code"""
     try:
@@ -105,63 +380,262 @@ def get_aws_region(region: str) -> str:
         raise Exception(f"ERROR::Unable to get aws region: {str(ex)}")
 
 
-def assume_cross_account_role(environment: str) -> Tuple[str, str, str]:
-    """Assume cross-account role and return credentials"""
-    try:
-        config = get_config()
-        
-        # Get role ARN based on environment using your constants
-        if environment == CommonUtilsConstants.DEV_ENV_KEY:
-            role_arn = config[CommonUtilsConstants.DEV_ENV_ARN]
-        elif environment == CommonUtilsConstants.TST_ENV_KEY:
-            role_arn = config[CommonUtilsConstants.TST_ENV_ARN]
-        elif environment == CommonUtilsConstants.PRD_ENV_KEY:
-            role_arn = config[CommonUtilsConstants.PRD_ENV_ARN]
-        else:
-            raise Exception(f"Invalid environment selection while assume role: {environment}")
-                
-        # Get credentials from Vault
-        client = client_auth()
+# Pooled AWS credentials, sessions and clients, keyed by environment (account) and region.
+# _aws_lock only guards the dictionaries; minting and client building run under a per-key
+# lock so that one slow Vault call never blocks callers for other environments or regions.
+_aws_lock = threading.RLock()
+_aws_key_locks = {}
+_aws_credentials = {}
+_aws_sessions = {}
+_aws_clients = {}
+_aws_refresh_timers = {}
+_aws_pool_stats = {
+    CommonUtilsConstants.CREDENTIAL_MINTS_KEY: 0,
+    CommonUtilsConstants.CLIENTS_CREATED_KEY: 0,
+    CommonUtilsConstants.CLIENT_CACHE_HITS_KEY: 0,
+}
+
+
+def get_role_arn(environment: str) -> str:
+    """Get the cross-account role ARN for the environment"""
+    config = get_config()
+
+    if environment == CommonUtilsConstants.DEV_ENV_KEY:
+        return config[CommonUtilsConstants.DEV_ENV_ARN]
+    elif environment == CommonUtilsConstants.TST_ENV_KEY:
+        return config[CommonUtilsConstants.TST_ENV_ARN]
+    elif environment == CommonUtilsConstants.PRD_ENV_KEY:
+        return config[CommonUtilsConstants.PRD_ENV_ARN]
+    else:
+        raise Exception(f"Invalid environment selection while assume role: {environment}")
+
+
+def _refresh_windows(lease_duration: int) -> Tuple[int, int]:
+    """Return the (advisory, mandatory) refresh windows for a credential lease"""
+    advisory = min(CommonUtilsConstants.AWS_CREDENTIALS_ADVISORY_REFRESH_SECONDS, lease_duration // 4)
+    mandatory = min(CommonUtilsConstants.AWS_CREDENTIALS_MANDATORY_REFRESH_SECONDS, lease_duration // 8)
+    return advisory, mandatory
+
+
+def _mint_aws_credentials(environment: str) -> Dict[str, Any]:
+    """Generate new STS credentials for the environment from the Vault AWS secrets engine"""
+    role_arn = get_role_arn(environment)
 
+    client = client_auth()
+    if not client:
+        raise Exception("Vault authentication failed")
+
+    with MetricsUtils.track(CommonUtilsConstants.MINT_CREDENTIALS_OPERATION, environment):
         response = client.secrets.aws.generate_credentials(
             name=CommonUtilsConstants.KEY_ASSUME_ROLE,
             role_arn=role_arn
         )
-        aws_access_key = response[CommonUtilsConstants.DATA_KEY][CommonUtilsConstants.ACCESS_KEY]
-        aws_secret_key = response[CommonUtilsConstants.DATA_KEY][CommonUtilsConstants.SECRET_KEY]
-        aws_session_token = response[CommonUtilsConstants.DATA_KEY][CommonUtilsConstants.SECURITY_TOKEN_KEY]
-        
-        return aws_access_key, aws_secret_key, aws_session_token
-        
+    lease_duration = (response.get(CommonUtilsConstants.LEASE_DURATION_KEY)
+                      or CommonUtilsConstants.DEFAULT_AWS_CREDENTIALS_TTL_SECONDS)
+    expiry_time = datetime.now(timezone.utc) + timedelta(seconds=lease_duration)
+
+    with _aws_lock:
+        _aws_pool_stats[CommonUtilsConstants.CREDENTIAL_MINTS_KEY] += 1
+    _schedule_credentials_refresh(environment, lease_duration)
+
+    return {
+        "access_key": response[CommonUtilsConstants.DATA_KEY][CommonUtilsConstants.ACCESS_KEY],
+        "secret_key": response[CommonUtilsConstants.DATA_KEY][CommonUtilsConstants.SECRET_KEY],
+        "token": response[CommonUtilsConstants.DATA_KEY][CommonUtilsConstants.SECURITY_TOKEN_KEY],
+        "expiry_time": expiry_time.isoformat(),
+        "lease_duration": lease_duration,
+    }
+
+
+def _schedule_credentials_refresh(environment: str, lease_duration: int) -> None:
+    """
+    Schedule a background refresh that fires just inside the advisory window, so that
+    callers keep using valid credentials instead of blocking on a mandatory refresh.
+    """
+    advisory, _ = _refresh_windows(lease_duration)
+    timer = threading.Timer(max(lease_duration - advisory + 1, 1), _background_refresh, args=(environment,))
+    timer.daemon = True
+    with _aws_lock:
+        previous = _aws_refresh_timers.pop(environment, None)
+        if previous is not None:
+            previous.cancel()
+        _aws_refresh_timers[environment] = timer
+    timer.start()
+
+
+def _background_refresh(environment: str) -> None:
+    """Trigger an advisory refresh of the pooled credentials for the environment"""
+    with _aws_lock:
+        credentials = _aws_credentials.get(environment)
+    if credentials is None:
+        return
+    try:
+        credentials.get_frozen_credentials()
+    except Exception as e:
+        logger.warning("Background refresh of AWS credentials for %s failed: %s", environment, e)
+
+
+def _aws_key_lock(key: Tuple) -> threading.Lock:
+    """Return the lock serializing the creation of one pooled credential, session or client"""
+    with _aws_lock:
+        lock = _aws_key_locks.get(key)
+        if lock is None:
+            lock = _aws_key_locks[key] = threading.Lock()
+        return lock
+
+
+def _get_pooled_credentials(environment: str) -> "RefreshableCredentials":
+    """Return the refreshable credentials for the environment, minting them on first use"""
+    from botocore.credentials import RefreshableCredentials
+
+    with _aws_lock:
+        credentials = _aws_credentials.get(environment)
+    if credentials is not None:
+        return credentials
+
+    with _aws_key_lock((CommonUtilsConstants.CREDENTIALS_LOCK_KEY, environment)):
+        # Another caller may have minted while this one waited for the key lock
+        with _aws_lock:
+            credentials = _aws_credentials.get(environment)
+        if credentials is None:
+            metadata = _mint_aws_credentials(environment)
+            advisory, mandatory = _refresh_windows(metadata["lease_duration"])
+            credentials = RefreshableCredentials.create_from_metadata(
+                metadata=metadata,
+                refresh_using=lambda: _mint_aws_credentials(environment),
+                method=CommonUtilsConstants.VAULT_CREDENTIALS_METHOD,
+                advisory_timeout=advisory,
+                mandatory_timeout=mandatory,
+            )
+            with _aws_lock:
+                _aws_credentials[environment] = credentials
+        return credentials
+
+
+@MetricsUtils.instrumented(CommonUtilsConstants.ASSUME_ROLE_OPERATION)
+def assume_cross_account_role(environment: str) -> Tuple[str, str, str]:
+    """Assume cross-account role and return credentials, reusing pooled credentials until they near expiry"""
+    try:
+        credentials = _get_pooled_credentials(environment).get_frozen_credentials()
+        return credentials.access_key, credentials.secret_key, credentials.token
+
     except Exception as ex:
         raise Exception(f"ERROR::Unable to assume cross account role: {str(ex)}")
 
 
+def _get_pooled_session(environment: str) -> "boto3.session.Session":
+    """
+    Return the boto3 session for the environment's account, sharing one botocore session per account.
+    Callers must hold the session's key lock while building clients from it (Session.client is not
+    thread-safe).
+    """
+    import boto3.session
+    import botocore.session
+
+    with _aws_lock:
+        session = _aws_sessions.get(environment)
+    if session is not None:
+        return session
+
+    credentials = _get_pooled_credentials(environment)
+    with _aws_key_lock((CommonUtilsConstants.SESSION_LOCK_KEY, environment)):
+        with _aws_lock:
+            session = _aws_sessions.get(environment)
+        if session is None:
+            botocore_session = botocore.session.get_session()
+            # botocore has no public setter for refreshable credentials on a session
+            botocore_session._credentials = credentials
+            session = boto3.session.Session(botocore_session=botocore_session)
+            with _aws_lock:
+                _aws_sessions[environment] = session
+        return session
+
+
+def get_aws_credentials(environment: str) -> "RefreshableCredentials":
+    """
+    Return the refreshable credentials of the environment's pooled session. They renew themselves before
+    the STS lease runs out, so long-lived callers should keep this object and freeze it per request.
+    """
+    return _get_pooled_session(environment).get_credentials()
+
+
+@MetricsUtils.instrumented(CommonUtilsConstants.GET_BOTO3_CLIENT_OPERATION)
 def get_boto3_client(resource: str, environment: str, region: str):
-    """Get boto3 client with assumed role credentials"""
+    """Get boto3 client with assumed role credentials, pooled per (service, environment, region)"""
     try:
-        region = get_aws_region(region)
-        access_key, secret_key, session_token = assume_cross_account_role(environment)
-        
-        aws_client = boto3.client(
-            resource,
-            aws_access_key_id=access_key,
-            aws_secret_access_key=secret_key,
-            aws_session_token=session_token,
-            region_name=region
-        )
-        
+        aws_region = get_aws_region(region)
+        key = (resource, environment, aws_region)
+
+        with _aws_lock:
+            aws_client = _aws_clients.get(key)
+            if aws_client is not None:
+                _aws_pool_stats[CommonUtilsConstants.CLIENT_CACHE_HITS_KEY] += 1
+                return aws_client
+
+        # Credentials are minted (a Vault call on first use) before any lock on this key is taken
+        session = _get_pooled_session(environment)
+        with _aws_key_lock((environment, aws_region)):
+            with _aws_lock:
+                aws_client = _aws_clients.get(key)
+            if aws_client is not None:
+                with _aws_lock:
+                    _aws_pool_stats[CommonUtilsConstants.CLIENT_CACHE_HITS_KEY] += 1
+                return aws_client
+
+            # A configured endpoint (e.g. a local stand-in; AWS_ENDPOINT_URL_<SERVICE> wins over
+            # AWS_ENDPOINT_URL) takes every request, so the per-operation host prefixes
+            # ("api.", "env.") must not be injected and S3 buckets are addressed by path
+            endpoint_url = get_config_value(
+                f"{CommonUtilsConstants.AWS_ENDPOINT_URL_KEY}_{resource.upper()}",
+                get_config_value(CommonUtilsConstants.AWS_ENDPOINT_URL_KEY)
+            ) or None
+
+            from botocore.config import Config as BotoConfig
+
+            # Session.client is not thread-safe, so clients of one account are built under its session lock
+            with _aws_key_lock((CommonUtilsConstants.SESSION_LOCK_KEY, environment)):
+                aws_client = session.client(
+                    resource,
+                    region_name=aws_region,
+                    endpoint_url=endpoint_url,
+                    config=BotoConfig(max_pool_connections=CommonUtilsConstants.AWS_MAX_POOL_CONNECTIONS,
+                                      inject_host_prefix=endpoint_url is None,
+                                      s3={"addressing_style": "path"} if endpoint_url else None)
+                )
+            MetricsUtils.instrument_client(aws_client, environment, region)
+            with _aws_lock:
+                _aws_clients[key] = aws_client
+                _aws_pool_stats[CommonUtilsConstants.CLIENTS_CREATED_KEY] += 1
+
         return aws_client
-        
+
     except Exception as ex:
         raise Exception(f"ERROR::Unable to create boto3 client: {str(ex)}")
 
 
+def get_client_pool_stats() -> Dict[str, int]:
+    """Return STS credential mint and boto3 client pool counters"""
+    with _aws_lock:
+        return dict(_aws_pool_stats)
+
+
+def clear_client_pool() -> None:
+    """Drop all pooled AWS credentials, sessions and clients"""
+    with _aws_lock:
+        for timer in _aws_refresh_timers.values():
+            timer.cancel()
+        _aws_refresh_timers.clear()
+        _aws_clients.clear()
+        _aws_sessions.clear()
+        _aws_credentials.clear()
+        _aws_key_locks.clear()
+
+
 def get_current_environment() -> str:
     """Get current environment from config"""
     try:
         config = get_config()
-        print("Fetching current environment")
+        logger.debug("Fetching current environment")
         return config[CommonUtilsConstants.ENVIRONMENT_KEY]
     except Exception as ex:
         raise Exception(f"ERROR::Unable to fetch current environment: {str(ex)}")
@@ -171,7 +645,25 @@ def get_current_region() -> str:
     """Get current region from config"""
     try:
         config = get_config()
-        print("Fetching current region")
+        logger.debug("Fetching current region")
         return config[CommonUtilsConstants.REGION_KEY]
     except Exception as ex:
         raise Exception(f"ERROR::Unable to fetch current region: {str(ex)}")
+
+
+def bounded_map(func: Callable[[Any], Any], items: Iterable[Any], max_workers: int) -> Iterator[Any]:
+    """
+    Apply func to items on a thread pool and yield results in input order.
+
+    At most max_workers calls are in flight at any time and items are consumed lazily,
+    so arbitrarily long iterables are processed with bounded memory.
+    """
+    max_workers = max(1, int(max_workers))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, item))
+        while pending:
+            yield pending.popleft().result()
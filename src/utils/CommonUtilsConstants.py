@@ -1,7 +1,9 @@
 import json
 import os
 
-CONFIG_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "configs", "config.json")
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+CONFIG_FILE_PATH = os.path.join(PROJECT_ROOT_PATH, "configs", "config.json")
+DOTENV_FILE_PATH = os.path.join(PROJECT_ROOT_PATH, ".env")
 
 AUTH_KEY = "auth"
 CLIENT_TOKEN_KEY = "client_token"
@@ -325,3 +327,86 @@ OKTA_JWKS_URL = f"{OKTA_ISSUER}/v1/keys"
 
 TEC_ACCOUNT_KEY = "tec_account_id"
 
+
+# Vault token caching
+LEASE_DURATION_KEY = "lease_duration"
+RENEWABLE_KEY = "renewable"
+VAULT_TOKEN_RENEW_MARGIN_SECONDS = 60
+VAULT_LOGINS_KEY = "logins"
+VAULT_RENEWALS_KEY = "renewals"
+VAULT_CACHE_HITS_KEY = "cache_hits"
+VAULT_LOGINS_SAVED_KEY = "logins_saved"
+
+# AWS credential and client pooling
+DEFAULT_AWS_CREDENTIALS_TTL_SECONDS = 3600
+AWS_CREDENTIALS_ADVISORY_REFRESH_SECONDS = 600
+AWS_CREDENTIALS_MANDATORY_REFRESH_SECONDS = 120
+AWS_MAX_POOL_CONNECTIONS = 50
+VAULT_CREDENTIALS_METHOD = "vault-assumerole"
+CREDENTIALS_LOCK_KEY = "credentials"
+SESSION_LOCK_KEY = "session"
+CREDENTIAL_MINTS_KEY = "credential_mints"
+CLIENTS_CREATED_KEY = "clients_created"
+CLIENT_CACHE_HITS_KEY = "client_cache_hits"
+
+# Config loading and overrides
+CONFIG_FILE_PATH_ENV = "MWAA_CONFIG_FILE"
+CONFIG_ENV_PREFIX = "MWAA_CONFIG_"
+CONFIG_RECHECK_INTERVAL_SECONDS = 1.0
+VAULT_URL_KEY = "URL_KEY"
+VAULT_NAMESPACE_KEY = "NAMESPACE_KEY"
+VAULT_ROLE_ID_KEY = "ROLE_ID_KEY"
+VAULT_SECRET_ID_KEY = "SECRET_ID_KEY"
+DEV_SECRET_ENGINE_KEY = "DEV_SECRET_ENGINE"
+TST_SECRET_ENGINE_KEY = "TST_SECRET_ENGINE"
+PRD_SECRET_ENGINE_KEY = "PRD_SECRET_ENGINE"
+
+# Secret caching
+SECRET_CACHE_TTL_SECONDS = 300
+SECRET_CACHE_MAX_ENTRIES = 256
+SECRET_CACHE_HITS_KEY = "hits"
+SECRET_CACHE_MISSES_KEY = "misses"
+SECRET_CACHE_SIZE_KEY = "size"
+DEFAULT_SECRET_READ_CONCURRENCY = 8
+
+# Optional AWS endpoint override (e.g. the local fake MWAA server)
+AWS_ENDPOINT_URL_KEY = "AWS_ENDPOINT_URL"
+
+# Logging
+LOGGER_ROOT_NAME = "dlp"
+LOG_LEVEL_ENV = "DLP_LOG_LEVEL"
+LOG_FORMAT_ENV = "DLP_LOG_FORMAT"
+LOG_CLOUDWATCH_GROUP_ENV = "DLP_LOG_CLOUDWATCH_GROUP"
+LOG_CLOUDWATCH_STREAM_ENV = "DLP_LOG_CLOUDWATCH_STREAM"
+DEFAULT_LOG_LEVEL = "INFO"
+LOG_LEVEL_OFF = "OFF"
+LOG_FORMAT_TEXT = "text"
+LOG_FORMAT_JSON = "json"
+LOG_TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+LOG_REDACTED_VALUE = "***"
+LOG_REDACTED_FIELDS = (
+    "password", "secret_key", "security_token", "session_token", "client_token", "secret_id",
+    "x-api-key", "aws_secret_access_key", "aws_session_token", "token"
+)
+LOG_QUEUE_SIZE = 10000
+
+# Metrics
+METRICS_ENABLED_ENV = "DLP_METRICS_ENABLED"
+METRICS_PREFIX = "dlp"
+METRICS_EMF_NAMESPACE = "DLP/Automation"
+METRICS_LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CLIENT_AUTH_OPERATION = "client_auth"
+ASSUME_ROLE_OPERATION = "assume_cross_account_role"
+GET_BOTO3_CLIENT_OPERATION = "get_boto3_client"
+MINT_CREDENTIALS_OPERATION = "vault.generate_aws_credentials"
+
+# Client-side rate limiting
+RATE_LIMIT_INCREASE_STEP = 0.1
+RATE_LIMIT_SLOW_START_FACTOR = 1.1
+RATE_LIMIT_DECREASE_FACTOR = 0.5
+RATE_LIMIT_DECREASE_COOLDOWN_SECONDS = 1.0
+RETRY_AFTER_MAX_SECONDS = 60.0
+RETRY_AFTER_HEADER = "retry-after"
+
+# Streaming JSON
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
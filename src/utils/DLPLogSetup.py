@@ -0,0 +1,228 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+DLPLogSetup.py - Logger setup for the automation utilities
+Tech Description: Configures the "dlp" logger hierarchy once: level gating (DLP_LOG_LEVEL, OFF disables all
+                  output), text or JSON lines (DLP_LOG_FORMAT), redaction of secret fields in messages and
+                  arguments, and an optional CloudWatch handler (DLP_LOG_CLOUDWATCH_GROUP) fed through a
+                  queue so callers never wait on the network. Messages use %-style arguments so nothing is
+                  formatted for records below the configured level.
+Pre_requisites: Requires CommonUtilsConstants.py; watchtower for the CloudWatch handler
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional, TextIO
+
+# Import constants
+from . import CommonUtilsConstants
+
+
+_setup_lock = threading.Lock()
+_configured = False
+_listener = None
+
+_REDACTED_FIELDS = frozenset(field.lower() for field in CommonUtilsConstants.LOG_REDACTED_FIELDS)
+_FIELD_PATTERN = "|".join(re.escape(field) for field in CommonUtilsConstants.LOG_REDACTED_FIELDS)
+# "password": "...", 'password': '...' (JSON / dict reprs) and password=... (query strings, key=value pairs)
+_QUOTED_SECRET_RE = re.compile(
+    r"""(?P<key>["'](?:%s)["']\s*:\s*)(?P<quote>["'])(?:\\.|(?!(?P=quote)).)*(?P=quote)""" % _FIELD_PATTERN,
+    re.IGNORECASE
+)
+_ASSIGNED_SECRET_RE = re.compile(r"(?P<key>\b(?:%s)=)[^\s&,;]+" % _FIELD_PATTERN, re.IGNORECASE)
+_STANDARD_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message"}
+
+
+def redact(value: Any) -> Any:
+    """
+    Return value with secret fields masked
+
+    Dicts have the values of secret keys replaced (recursively, through lists and tuples too); strings have
+    "key": "value" and key=value occurrences of secret keys masked. Other values are returned unchanged.
+    """
+    if isinstance(value, dict):
+        return {
+            key: CommonUtilsConstants.LOG_REDACTED_VALUE
+            if isinstance(key, str) and key.lower() in _REDACTED_FIELDS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return type(value)(redact(item) for item in value)
+    if isinstance(value, str):
+        value = _QUOTED_SECRET_RE.sub(
+            lambda match: f"{match.group('key')}{match.group('quote')}"
+                          f"{CommonUtilsConstants.LOG_REDACTED_VALUE}{match.group('quote')}",
+            value
+        )
+        return _ASSIGNED_SECRET_RE.sub(lambda match: match.group("key") + CommonUtilsConstants.LOG_REDACTED_VALUE,
+                                       value)
+    return value
+
+
+class RedactingFilter(logging.Filter):
+    """Handler filter masking secret fields; runs only for records that are actually emitted"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "_redacted", False):
+            if record.args:
+                record.args = redact(record.args)
+            if isinstance(record.msg, str):
+                record.msg = redact(record.msg)
+            record._redacted = True
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with timestamp, level, logger, message and any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        document = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        document.update({
+            key: value for key, value in vars(record).items()
+            if key not in _STANDARD_RECORD_ATTRIBUTES and not key.startswith("_")
+        })
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_level(level: Optional[str]) -> int:
+    """Map a level name (or OFF) to a logging level"""
+    level = (level or CommonUtilsConstants.DEFAULT_LOG_LEVEL).upper()
+    if level == CommonUtilsConstants.LOG_LEVEL_OFF:
+        return logging.CRITICAL + 1
+    parsed = logging.getLevelName(level)
+    if not isinstance(parsed, int):
+        raise Exception(f"ERROR::Invalid log level: {level}")
+    return parsed
+
+
+def _cloudwatch_handler(log_group: str, log_stream: Optional[str], formatter: logging.Formatter,
+                        boto3_client=None) -> Optional[logging.Handler]:
+    """CloudWatch handler behind a queue, or None if watchtower is not installed"""
+    global _listener
+    try:
+        import watchtower
+    except ImportError:
+        logging.getLogger(CommonUtilsConstants.LOGGER_ROOT_NAME).warning(
+            "watchtower is not installed, CloudWatch logging to %s is disabled", log_group
+        )
+        return None
+
+    options = {"log_group_name": log_group, "boto3_client": boto3_client}
+    if log_stream:
+        options["log_stream_name"] = log_stream
+    cloudwatch = watchtower.CloudWatchLogHandler(**options)
+    cloudwatch.setFormatter(formatter)
+
+    log_queue = queue.Queue(CommonUtilsConstants.LOG_QUEUE_SIZE)
+    _listener = QueueListener(log_queue, cloudwatch, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+    return _NonBlockingQueueHandler(log_queue)
+
+
+def _stop_listener() -> None:
+    """Flush and stop the CloudWatch queue listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    cloudwatch_log_group: Optional[str] = None,
+    cloudwatch_log_stream: Optional[str] = None,
+    stream: Optional[TextIO] = None,
+    boto3_client=None
+) -> logging.Logger:
+    """
+    (Re)configure the "dlp" logger hierarchy. Arguments default to the DLP_LOG_* environment variables.
+
+    Args:
+        level (str): Level name, or OFF to disable all output (default: INFO)
+        log_format (str): "text" or "json" (default: text)
+        cloudwatch_log_group (str): Also ship records to this CloudWatch log group
+        cloudwatch_log_stream (str): CloudWatch log stream name (default: watchtower's)
+        stream: Console stream (default: sys.stdout)
+        boto3_client: CloudWatch Logs client for the CloudWatch handler (default: watchtower's)
+
+    Returns:
+        logging.Logger: The configured root "dlp" logger
+    """
+    global _configured
+    level = level or os.environ.get(CommonUtilsConstants.LOG_LEVEL_ENV)
+    log_format = (log_format or os.environ.get(CommonUtilsConstants.LOG_FORMAT_ENV)
+                  or CommonUtilsConstants.LOG_FORMAT_TEXT).lower()
+    cloudwatch_log_group = cloudwatch_log_group or os.environ.get(CommonUtilsConstants.LOG_CLOUDWATCH_GROUP_ENV)
+    cloudwatch_log_stream = cloudwatch_log_stream or os.environ.get(CommonUtilsConstants.LOG_CLOUDWATCH_STREAM_ENV)
+
+    with _setup_lock:
+        logger = logging.getLogger(CommonUtilsConstants.LOGGER_ROOT_NAME)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        _stop_listener()
+
+        logger.setLevel(_parse_level(level))
+        logger.propagate = False
+        formatter = (JsonFormatter() if log_format == CommonUtilsConstants.LOG_FORMAT_JSON
+                     else logging.Formatter(CommonUtilsConstants.LOG_TEXT_FORMAT))
+
+        handlers = [logging.StreamHandler(stream or sys.stdout)]
+        if cloudwatch_log_group:
+            handlers.append(_cloudwatch_handler(cloudwatch_log_group, cloudwatch_log_stream, formatter,
+                                                boto3_client))
+        for handler in filter(None, handlers):
+            handler.setFormatter(formatter)
+            handler.addFilter(RedactingFilter())
+            logger.addHandler(handler)
+
+        _configured = True
+        return logger
+
+
+def get_logger(name: Optional[str] = None) -> logging.Logger:
+    """
+    Get a logger under the "dlp" hierarchy, configuring the hierarchy from the environment on first use
+
+    Args:
+        name (str): Logger name, usually __name__ (default: the root "dlp" logger)
+
+    Returns:
+        logging.Logger: Logger for the given name
+    """
+    if not _configured:
+        configure_logging()
+    if not name:
+        return logging.getLogger(CommonUtilsConstants.LOGGER_ROOT_NAME)
+    return logging.getLogger(f"{CommonUtilsConstants.LOGGER_ROOT_NAME}.{name}")
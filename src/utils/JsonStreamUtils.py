@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+JsonStreamUtils.py - Incremental JSON parsing of large response bodies
+Tech Description: Parses a top-level JSON object from a stream of chunks (e.g. a botocore StreamingBody)
+                  and yields the elements of one array member as soon as each is complete, so only the
+                  element being decoded is held in memory. Other top-level members (such as a listing's
+                  total_entries) are collected into a caller-supplied dict.
+Pre_requisites: Requires CommonUtilsConstants.py
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+# Import constants
+from . import CommonUtilsConstants
+
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _ChunkBuffer:
+    """Text buffer over an iterator of bytes/str chunks that discards everything already consumed"""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk (dropping consumed text); False at end of stream"""
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            tail = self._utf8.decode(b"", final=True)
+        else:
+            tail = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        self.text = self.text[self.pos:] + tail
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at end of stream"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consume and return the next non-whitespace character, which must be one of characters"""
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"Invalid JSON stream: expected one of {characters!r}, got {character!r}")
+        self.pos += 1
+        return character
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A value ending exactly at the buffer end may be a truncated number or literal
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_json_array(
+    chunks: Iterable[Union[bytes, str]],
+    array_key: str,
+    fields: Optional[Dict[str, Any]] = None
+) -> Iterator[Any]:
+    """
+    Lazily yield the elements of the array member array_key of a streamed top-level JSON object
+
+    Args:
+        chunks: Iterable of UTF-8 bytes or str pieces of the document, in order
+        array_key (str): Member whose array elements are yielded
+        fields (dict): Filled with the other top-level members as they are parsed; members after the
+                       array are available once the generator is exhausted
+
+    Yields:
+        Any: Each element of the array, decoded
+
+    Raises:
+        ValueError: If the stream is not a JSON object or is truncated
+    """
+    buffer = _ChunkBuffer(chunks)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        key = buffer.value()
+        buffer.expect(":")
+        if key == array_key and buffer.peek() == "[":
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                buffer.expect("]")
+            else:
+                while True:
+                    yield buffer.value()
+                    if buffer.expect(",]") == "]":
+                        break
+        else:
+            value = buffer.value()
+            if fields is not None:
+                fields[key] = value
+        if buffer.expect(",}") == "}":
+            return
+
+
+def iter_json_response(
+    payload: Any,
+    array_key: str,
+    fields: Optional[Dict[str, Any]] = None,
+    chunk_size: int = CommonUtilsConstants.JSON_STREAM_CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    Yield the elements of array_key from an already-parsed dict, a JSON str/bytes or a streaming body
+
+    Streaming bodies (anything with iter_chunks() or read()) are parsed incrementally with iter_json_array.
+    """
+    if payload is None:
+        return
+    if isinstance(payload, dict):
+        if fields is not None:
+            fields.update((key, value) for key, value in payload.items() if key != array_key)
+        yield from payload.get(array_key) or []
+    elif isinstance(payload, (str, bytes)):
+        yield from iter_json_array([payload], array_key, fields)
+    elif hasattr(payload, "iter_chunks"):
+        yield from iter_json_array(payload.iter_chunks(chunk_size), array_key, fields)
+    else:
+        yield from iter_json_array(iter(lambda: payload.read(chunk_size), b""), array_key, fields)
@@ -0,0 +1,415 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+MetricsUtils.py - Per-call instrumentation for Vault and AWS calls
+Tech Description: Records call counts, errors, retries, latency histograms and request/response sizes per
+                  (operation, environment, region), from the instrumented() decorator, the track() context
+                  manager and botocore events on pooled clients. Exports as a dict, Prometheus text format or
+                  CloudWatch EMF documents, and passes each call to registered hooks. Disabled by default
+                  (enable_metrics() or DLP_METRICS_ENABLED=1); when disabled every entry point returns after
+                  a single flag check.
+Pre_requisites: Requires CommonUtilsConstants.py and DLPLogSetup.py
+"""
+
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Import constants
+from . import CommonUtilsConstants
+from .DLPLogSetup import get_logger
+
+logger = get_logger(__name__)
+
+_enabled = os.environ.get(CommonUtilsConstants.METRICS_ENABLED_ENV, "").lower() in ("1", "true", "yes")
+_metrics_lock = threading.Lock()
+_metrics: Dict[Tuple[str, Optional[str], Optional[str]], Dict[str, Any]] = {}
+_hooks: List[Callable[[Dict[str, Any]], None]] = []
+_client_labels = weakref.WeakKeyDictionary()
+_BUCKETS = CommonUtilsConstants.METRICS_LATENCY_BUCKETS_SECONDS
+_NO_FAILURE_VALUE = object()
+_CALL_CONTEXT_KEY = "dlp_metrics_call"
+
+
+def enable_metrics() -> None:
+    """Start recording metrics"""
+    global _enabled
+    _enabled = True
+
+
+def disable_metrics() -> None:
+    """Stop recording metrics (already recorded values are kept)"""
+    global _enabled
+    _enabled = False
+
+
+def metrics_enabled() -> bool:
+    """True if metrics are being recorded"""
+    return _enabled
+
+
+def add_metrics_hook(hook: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Call hook(event) after every recorded call. The event has operation, environment, region,
+    elapsed_seconds, success, retries, request_bytes, response_bytes and error.
+    """
+    with _metrics_lock:
+        _hooks.append(hook)
+
+
+def remove_metrics_hook(hook: Callable[[Dict[str, Any]], None]) -> None:
+    """Unregister a hook added with add_metrics_hook"""
+    with _metrics_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def reset_metrics() -> None:
+    """Drop all recorded metrics"""
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def record_call(
+    operation: str,
+    environment: Optional[str],
+    region: Optional[str],
+    elapsed_seconds: float,
+    success: bool = True,
+    retries: int = 0,
+    request_bytes: int = 0,
+    response_bytes: int = 0,
+    error: Optional[str] = None
+) -> None:
+    """Record one completed call (no-op when metrics are disabled)"""
+    if not _enabled:
+        return
+    key = (operation, environment, region)
+    with _metrics_lock:
+        entry = _metrics.get(key)
+        if entry is None:
+            entry = _metrics[key] = {
+                "calls": 0, "errors": 0, "retries": 0, "latency_sum": 0.0, "latency_max": 0.0,
+                "buckets": [0] * (len(_BUCKETS) + 1), "request_bytes": 0, "response_bytes": 0
+            }
+        entry["calls"] += 1
+        entry["errors"] += 0 if success else 1
+        entry["retries"] += retries
+        entry["latency_sum"] += elapsed_seconds
+        entry["latency_max"] = max(entry["latency_max"], elapsed_seconds)
+        entry["buckets"][bisect.bisect_left(_BUCKETS, elapsed_seconds)] += 1
+        entry["request_bytes"] += request_bytes
+        entry["response_bytes"] += response_bytes
+        hooks = list(_hooks)
+
+    if hooks:
+        event = {
+            "operation": operation, "environment": environment, "region": region,
+            "elapsed_seconds": elapsed_seconds, "success": success, "retries": retries,
+            "request_bytes": request_bytes, "response_bytes": response_bytes, "error": error
+        }
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                logger.warning("Metrics hook %r failed: %s", hook, e)
+
+
+class _CallTracker:
+    """Context manager timing one call; set retries/request_bytes/response_bytes or call fail() inside it"""
+
+    __slots__ = ("operation", "environment", "region", "retries", "request_bytes", "response_bytes", "error",
+                 "_started")
+
+    def __init__(self, operation: str, environment: Optional[str], region: Optional[str]):
+        self.operation = operation
+        self.environment = environment
+        self.region = region
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.error = None
+
+    def fail(self, error: Any) -> None:
+        """Mark the call as failed without raising"""
+        self.error = str(error)
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.error = str(exc)
+        record_call(self.operation, self.environment, self.region, time.perf_counter() - self._started,
+                    self.error is None, self.retries, self.request_bytes, self.response_bytes, self.error)
+        return False
+
+
+class _NoopTracker:
+    """Shared stand-in for _CallTracker while metrics are disabled"""
+
+    __slots__ = ()
+    retries = request_bytes = response_bytes = 0
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+    def fail(self, error: Any) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_TRACKER = _NoopTracker()
+
+
+def track(operation: str, environment: Optional[str] = None, region: Optional[str] = None):
+    """
+    Context manager recording one call of operation
+
+    Example:
+        with track("invoke_rest_api", "dev", "us") as call:
+            call.request_bytes = len(body)
+            ...
+    """
+    if not _enabled:
+        return _NOOP_TRACKER
+    return _CallTracker(operation, environment, region)
+
+
+def instrumented(operation: str, failure_value: Any = _NO_FAILURE_VALUE) -> Callable:
+    """
+    Decorator recording each call of the wrapped function. Its "environment" and "region" arguments, if
+    any, become labels; raising, or returning failure_value, counts as an error.
+    """
+    def decorator(func: Callable) -> Callable:
+        parameters = list(inspect.signature(func).parameters)
+        label_positions = {name: parameters.index(name) if name in parameters else None
+                           for name in ("environment", "region")}
+
+        def label(name: str, args: tuple, kwargs: dict) -> Optional[str]:
+            position = label_positions[name]
+            if position is None:
+                return None
+            return args[position] if position < len(args) else kwargs.get(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _CallTracker(operation, label("environment", args, kwargs), label("region", args, kwargs)) as call:
+                result = func(*args, **kwargs)
+                if failure_value is not _NO_FAILURE_VALUE and result is failure_value:
+                    call.fail(f"{func.__name__} returned {failure_value!r}")
+                return result
+
+        return wrapper
+    return decorator
+
+
+def _before_call(model, params, context, **kwargs) -> None:
+    """botocore before-call handler: remember operation, start time and request size"""
+    if _enabled:
+        from botocore import xform_name  # already loaded: this handler only runs inside botocore
+
+        body = params.get("body") or b""
+        context[_CALL_CONTEXT_KEY] = (
+            f"{model.service_model.service_name}.{xform_name(model.name)}",
+            time.perf_counter(),
+            len(body) if isinstance(body, (bytes, str)) else 0
+        )
+
+
+def _record_api_call(context, success: bool, retries: int, response_bytes: int, error: Optional[str],
+                     client_labels: Tuple[Optional[str], Optional[str]]) -> None:
+    """Record a botocore API call that went through _before_call"""
+    call = context.pop(_CALL_CONTEXT_KEY, None)
+    if call is None:
+        return
+    operation, started, request_bytes = call
+    environment, region = client_labels
+    record_call(operation, environment, region, time.perf_counter() - started, success, retries, request_bytes,
+                response_bytes, error)
+
+
+def instrument_client(client, environment: Optional[str] = None, region: Optional[str] = None):
+    """
+    Record every API call made with a boto3 client as "<service>.<operation>" (e.g. mwaa.invoke_rest_api),
+    including botocore-level retries. Handlers are cheap no-ops while metrics are disabled.
+
+    Returns:
+        The same client
+    """
+    labels = (environment, region)
+    _client_labels[client] = labels
+
+    def after_call(http_response, parsed, model, context, **kwargs):
+        if _enabled:
+            metadata = parsed.get("ResponseMetadata", {}) if isinstance(parsed, dict) else {}
+            success = http_response.status_code < 300
+            error = None if success else str(parsed.get("Error", {}).get("Code") or http_response.status_code)
+            _record_api_call(context, success, metadata.get("RetryAttempts", 0),
+                             len(http_response.content or b""), error, labels)
+
+    def after_call_error(exception, context, **kwargs):
+        _record_api_call(context, False, 0, 0, str(exception), labels)
+
+    client.meta.events.register("before-call", _before_call)
+    client.meta.events.register("after-call", after_call)
+    client.meta.events.register("after-call-error", after_call_error)
+    return client
+
+
+def record_client_retry(client, operation: str) -> None:
+    """Count an application-level retry of operation made with an instrumented client"""
+    if not _enabled:
+        return
+    environment, region = _client_labels.get(client, (None, None))
+    key = (operation, environment, region)
+    with _metrics_lock:
+        if key in _metrics:
+            _metrics[key]["retries"] += 1
+
+
+def _quantile(buckets: List[int], count: int, quantile: float) -> Optional[float]:
+    """Upper bound of the histogram bucket holding the quantile (None for the +Inf bucket)"""
+    if not count:
+        return None
+    rank, seen = quantile * count, 0
+    for index, bucket_count in enumerate(buckets):
+        seen += bucket_count
+        if seen >= rank:
+            return _BUCKETS[index] if index < len(_BUCKETS) else None
+    return None
+
+
+def _snapshot() -> List[Tuple[Tuple[str, Optional[str], Optional[str]], Dict[str, Any]]]:
+    """Consistent copy of the recorded metrics, sorted by key"""
+    with _metrics_lock:
+        items = [(key, dict(entry, buckets=list(entry["buckets"]))) for key, entry in _metrics.items()]
+    return sorted(items, key=lambda item: tuple(part or "" for part in item[0]))
+
+
+def get_metrics() -> Dict[str, Any]:
+    """
+    Recorded metrics as a dict
+
+    Returns:
+        dict: {"enabled": bool, "operations": [{operation, environment, region, calls, errors, retries,
+               request_bytes, response_bytes, latency_seconds: {sum, mean, max, p50, p95, p99, buckets}}]}
+               where percentiles are histogram bucket upper bounds
+    """
+    operations = []
+    for (operation, environment, region), entry in _snapshot():
+        calls = entry["calls"]
+        operations.append({
+            "operation": operation,
+            "environment": environment,
+            "region": region,
+            "calls": calls,
+            "errors": entry["errors"],
+            "retries": entry["retries"],
+            "request_bytes": entry["request_bytes"],
+            "response_bytes": entry["response_bytes"],
+            "latency_seconds": {
+                "sum": round(entry["latency_sum"], 6),
+                "mean": round(entry["latency_sum"] / calls, 6) if calls else None,
+                "max": round(entry["latency_max"], 6),
+                "p50": _quantile(entry["buckets"], calls, 0.50),
+                "p95": _quantile(entry["buckets"], calls, 0.95),
+                "p99": _quantile(entry["buckets"], calls, 0.99),
+                "buckets": dict(zip([str(bound) for bound in _BUCKETS] + ["+Inf"], entry["buckets"])),
+            },
+        })
+    return {"enabled": _enabled, "operations": operations}
+
+
+def _prometheus_labels(operation: str, environment: Optional[str], region: Optional[str], **extra: str) -> str:
+    """Render a Prometheus label set"""
+    labels = {"operation": operation, "environment": environment or "", "region": region or "", **extra}
+    escaped = (
+        name + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def get_prometheus_metrics() -> str:
+    """Recorded metrics in the Prometheus text exposition format"""
+    prefix = CommonUtilsConstants.METRICS_PREFIX
+    snapshot = _snapshot()
+    counters = (
+        ("calls", "calls_total", "Calls per operation"),
+        ("errors", "call_errors_total", "Failed calls per operation"),
+        ("retries", "call_retries_total", "Retries per operation"),
+        ("request_bytes", "request_bytes_total", "Request payload bytes per operation"),
+        ("response_bytes", "response_bytes_total", "Response payload bytes per operation"),
+    )
+    lines = []
+    for field, name, description in counters:
+        lines += [f"# HELP {prefix}_{name} {description}", f"# TYPE {prefix}_{name} counter"]
+        lines += [f"{prefix}_{name}{_prometheus_labels(*key)} {entry[field]}" for key, entry in snapshot]
+
+    name = f"{prefix}_call_duration_seconds"
+    lines += [f"# HELP {name} Call latency per operation", f"# TYPE {name} histogram"]
+    for key, entry in snapshot:
+        cumulative = 0
+        for bound, bucket_count in zip([str(bound) for bound in _BUCKETS] + ["+Inf"], entry["buckets"]):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_prometheus_labels(*key, le=bound)} {cumulative}")
+        lines.append(f"{name}_sum{_prometheus_labels(*key)} {entry['latency_sum']}")
+        lines.append(f"{name}_count{_prometheus_labels(*key)} {entry['calls']}")
+    return "\n".join(lines) + "\n"
+
+
+def get_emf_metrics(namespace: str = CommonUtilsConstants.METRICS_EMF_NAMESPACE) -> List[str]:
+    """
+    Recorded metrics as CloudWatch Embedded Metric Format documents, one JSON string per
+    (operation, environment, region), ready to be written to a CloudWatch Logs stream
+    """
+    timestamp = int(time.time() * 1000)
+    documents = []
+    for (operation, environment, region), entry in _snapshot():
+        dimensions = {"Operation": operation}
+        if environment:
+            dimensions["Environment"] = environment
+        if region:
+            dimensions["Region"] = region
+        values = {
+            "Calls": (entry["calls"], "Count"),
+            "Errors": (entry["errors"], "Count"),
+            "Retries": (entry["retries"], "Count"),
+            "LatencyAverage": (entry["latency_sum"] / entry["calls"] * 1000 if entry["calls"] else 0,
+                               "Milliseconds"),
+            "LatencyMax": (entry["latency_max"] * 1000, "Milliseconds"),
+            "RequestBytes": (entry["request_bytes"], "Bytes"),
+            "ResponseBytes": (entry["response_bytes"], "Bytes"),
+        }
+        document = {
+            "_aws": {
+                "Timestamp": timestamp,
+                "CloudWatchMetrics": [{
+                    "Namespace": namespace,
+                    "Dimensions": [list(dimensions)],
+                    "Metrics": [{"Name": name, "Unit": unit} for name, (_, unit) in values.items()],
+                }],
+            },
+            **dimensions,
+            **{name: value for name, (value, _) in values.items()},
+        }
+        documents.append(json.dumps(document))
+    return documents
@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+__author__ = "ZS Associates"
+
+"""
+RateLimitUtils.py - Shared client-side rate limiting
+Tech Description: Adaptive token bucket shared by every thread and coroutine calling the same endpoint. The
+                  refill rate grows multiplicatively on success until the first throttle (slow start), then
+                  additively, and is cut multiplicatively (at most once per cooldown) on throttling; a
+                  Retry-After pauses the whole bucket. reserve() never blocks, so
+                  the same limiter serves blocking callers (time.sleep) and asyncio callers (asyncio.sleep).
+Pre_requisites: Requires CommonUtilsConstants.py
+"""
+
+import email.utils
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Optional
+
+# Import constants
+from . import CommonUtilsConstants
+
+
+_limiters_lock = threading.Lock()
+_limiters: Dict[Hashable, "AdaptiveRateLimiter"] = {}
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate adapts to throttling signals
+
+    Until the first throttle every success multiplies the rate by slow_start_factor, so an endpoint that never
+    throttles reaches max_rate within a few dozen requests; afterwards the rate follows additive increase,
+    multiplicative decrease.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        min_rate: float,
+        max_rate: float,
+        increase_step: float = CommonUtilsConstants.RATE_LIMIT_INCREASE_STEP,
+        decrease_factor: float = CommonUtilsConstants.RATE_LIMIT_DECREASE_FACTOR,
+        decrease_cooldown: float = CommonUtilsConstants.RATE_LIMIT_DECREASE_COOLDOWN_SECONDS,
+        slow_start_factor: float = CommonUtilsConstants.RATE_LIMIT_SLOW_START_FACTOR
+    ):
+        self._lock = threading.Lock()
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.slow_start_factor = slow_start_factor
+        self._slow_start = True
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._stats = {"acquired": 0, "throttles": 0, "rate_decreases": 0, "waited_seconds": 0.0}
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time since the last update; nothing accrues while paused (_updated in the future)"""
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, self._updated - now) + max(0.0, -self._tokens) / self.rate
+            self._stats["acquired"] += 1
+            self._stats["waited_seconds"] += wait
+            return wait
+
+    def acquire(self) -> None:
+        """Block until a token is available"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """Probe for more throughput after an unthrottled response"""
+        with self._lock:
+            if self._slow_start:
+                self.rate = min(self.max_rate, self.rate * self.slow_start_factor)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Slow down after a throttled (429/503) response
+
+        The first throttle ends slow start. The rate is cut at most once per decrease_cooldown, so a burst of
+        in-flight requests hitting the same throttle counts once. A Retry-After pauses every caller of this
+        limiter until it has passed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._slow_start = False
+            self._stats["throttles"] += 1
+            if now - self._last_decrease >= self.decrease_cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self._last_decrease = now
+                self._stats["rate_decreases"] += 1
+            if retry_after:
+                resume_at = now + retry_after
+                if resume_at > self._updated:
+                    self._updated = resume_at
+                    self._tokens = min(self._tokens, 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current rate and counters"""
+        with self._lock:
+            return dict(self._stats, rate=round(self.rate, 3), slow_start=self._slow_start, waited_seconds=round(self._stats["waited_seconds"], 3))
+
+
+def get_rate_limiter(key: Hashable, rate: float, burst: float, min_rate: float, max_rate: float,
+                     **options) -> AdaptiveRateLimiter:
+    """
+    Return the limiter shared by all callers of key, creating it with the given settings on first use
+
+    Args:
+        key: Identifies the rate-limited endpoint (e.g. (aws_region, mwaa_environment_name))
+        rate (float): Initial requests per second
+        burst (float): Bucket size
+        min_rate (float): Floor for the adapted rate
+        max_rate (float): Ceiling for the adapted rate
+        options: increase_step, decrease_factor, decrease_cooldown, slow_start_factor
+
+    Returns:
+        AdaptiveRateLimiter: The shared limiter
+    """
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(key)
+            if limiter is None:
+                limiter = _limiters[key] = AdaptiveRateLimiter(rate, burst, min_rate, max_rate, **options)
+    return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Current rate and counters of every shared limiter, keyed by str(key)"""
+    with _limiters_lock:
+        limiters = list(_limiters.items())
+    return {str(key): limiter.stats() for key, limiter in limiters}
+
+
+def reset_rate_limiters() -> None:
+    """Forget all shared limiters (they are re-created at their initial rate)"""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header value (delta-seconds or HTTP-date), capped at
+    RETRY_AFTER_MAX_SECONDS; None if absent or unparseable
+    """
+    if value is None or value == "":
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        try:
+            retry_at = email.utils.parsedate_to_datetime(str(value))
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), CommonUtilsConstants.RETRY_AFTER_MAX_SECONDS)
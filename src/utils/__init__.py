@@ -1,39 +1,125 @@
 """
 Utils package for automation project
 Contains common utilities for Vault, AWS, and general automation tasks
+
+Names are imported from their modules on first access (module __getattr__), so importing the
+package, its constants or the logger does not load boto3 or hvac.
 """
 
-from .CommonUtils import (
-    get_config,
-    client_auth,
-    read_secret,
-    get_boto3_client,
-    get_aws_region,
-    assume_cross_account_role,
-    get_current_environment,
-    get_current_region,
-    get_secret_engine
-)
+import importlib
+
+# Public name -> module that defines it
+_LAZY_ATTRIBUTES = {
+    **dict.fromkeys([
+        'get_config',
+        'get_config_value',
+        'get_vault_url',
+        'get_vault_namespace',
+        'get_approle_credentials',
+        'get_role_arn',
+        'client_auth',
+        'get_vault_auth_stats',
+        'reset_vault_client',
+        'read_secret',
+        'read_secrets',
+        'invalidate_secret',
+        'get_secret_cache_stats',
+        'get_boto3_client',
+        'get_client_pool_stats',
+        'clear_client_pool',
+        'get_aws_region',
+        'assume_cross_account_role',
+        'get_current_environment',
+        'get_current_region',
+        'get_secret_engine',
+        'bounded_map'
+    ], 'CommonUtils'),
+    **dict.fromkeys([
+        'enable_metrics',
+        'disable_metrics',
+        'metrics_enabled',
+        'add_metrics_hook',
+        'remove_metrics_hook',
+        'reset_metrics',
+        'track',
+        'get_metrics',
+        'get_prometheus_metrics',
+        'get_emf_metrics'
+    ], 'MetricsUtils'),
+    **dict.fromkeys(['get_rate_limiter_stats', 'reset_rate_limiters'], 'RateLimitUtils'),
+    **dict.fromkeys(['iter_json_array', 'iter_json_response'], 'JsonStreamUtils'),
+    **dict.fromkeys(['get_logger', 'configure_logging'], 'DLPLogSetup'),
+}
+
+_SUBMODULES = ['CommonUtils', 'CommonUtilsConstants', 'DLPLogSetup', 'JsonStreamUtils', 'MetricsUtils',
+               'RateLimitUtils']
+
+
+def __getattr__(name):
+    """Import a public name (or submodule) on first access and cache it on the package"""
+    if name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
-from . import CommonUtilsConstants
 
-# from .DLPLogSetup import get_logger
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     # CommonUtils functions
     'get_config',
+    'get_config_value',
+    'get_vault_url',
+    'get_vault_namespace',
+    'get_approle_credentials',
+    'get_role_arn',
     'client_auth',
+    'get_vault_auth_stats',
+    'reset_vault_client',
     'read_secret',
+    'read_secrets',
+    'invalidate_secret',
+    'get_secret_cache_stats',
     'get_boto3_client',
+    'get_client_pool_stats',
+    'clear_client_pool',
     'get_aws_region',
     'assume_cross_account_role',
     'get_current_environment',
     'get_current_region',
     'get_secret_engine',
+    'bounded_map',
+
+    # MetricsUtils functions
+    'enable_metrics',
+    'disable_metrics',
+    'metrics_enabled',
+    'add_metrics_hook',
+    'remove_metrics_hook',
+    'reset_metrics',
+    'track',
+    'get_metrics',
+    'get_prometheus_metrics',
+    'get_emf_metrics',
+
+    # RateLimitUtils functions
+    'get_rate_limiter_stats',
+    'reset_rate_limiters',
+
+    # JsonStreamUtils functions
+    'iter_json_array',
+    'iter_json_response',
     
     # Constants module
     'CommonUtilsConstants',
     
-    # Logger (uncomment when you add it)
-    # 'get_logger'
+    # Logger
+    'get_logger',
+    'configure_logging'
 ]
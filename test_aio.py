@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the asyncio MWAA helpers (airflow.aio) against the local fake MWAA and Vault servers
+Run this from the project root directory (pytest or directly)
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from itertools import count
+
+import httpx
+from botocore.credentials import RefreshableCredentials
+
+# Add src to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fakes import create_mwaa_app, create_vault_app, serve, write_local_config
+from utils import CommonUtils, CommonUtilsConstants, RateLimitUtils
+from airflow import aio
+
+MWAA_ENVIRONMENT_NAME = "MWAA1USVGA00000D000"
+
+_stack = ExitStack()
+_mwaa_app = create_mwaa_app(environment_count=30)
+
+
+def setup_module(module=None):
+    """Start the fake servers and point CommonUtils at them"""
+    mwaa_url = _stack.enter_context(serve(_mwaa_app))
+    vault_url = _stack.enter_context(serve(create_vault_app()))
+    config_dir = _stack.enter_context(tempfile.TemporaryDirectory())
+    os.environ[CommonUtilsConstants.CONFIG_FILE_PATH_ENV] = write_local_config(
+        os.path.join(config_dir, "config.json"), mwaa_url, vault_url
+    )
+    CommonUtils.get_config(force_reload=True)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+    RateLimitUtils.reset_rate_limiters()
+
+
+def teardown_module(module=None):
+    """Stop the fake servers"""
+    os.environ.pop(CommonUtilsConstants.CONFIG_FILE_PATH_ENV, None)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+    RateLimitUtils.reset_rate_limiters()
+    _stack.close()
+
+
+def test_list_environments():
+    """Every page is listed and every environment's details are fetched"""
+    result = asyncio.run(aio.list_environments("dev", "us", max_concurrency=5))
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result.get("error")
+    assert result["result"]["count"] == 30
+    assert all(environment.get("status") != "UNKNOWN" for environment in result["result"]["environments"])
+    assert asyncio.run(aio.list_environments("dev", "xx"))["status"] == CommonUtilsConstants.FAILED_KEY
+
+
+def test_create_variable_and_connection():
+    """Single variable and connection writes succeed"""
+    result = asyncio.run(aio.create_variable("aio_var", "value", "dev", "us", MWAA_ENVIRONMENT_NAME))
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    result = asyncio.run(aio.create_connection(
+        "aio_conn", "postgres", "Async connection", "db.example.com", "user", "password",
+        "public", 5432, "{}", "dev", "us", MWAA_ENVIRONMENT_NAME
+    ))
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    airflow = _mwaa_app.state.airflow[MWAA_ENVIRONMENT_NAME]
+    assert airflow.variables["aio_var"]["value"] == "value"
+    assert airflow.connections["aio_conn"]["host"] == "db.example.com"
+
+
+def test_bulk_variables_and_connections():
+    """Bulk writes share one client and report every item"""
+    variables = {f"aio_bulk_{index}": str(index) for index in range(25)}
+    result = asyncio.run(aio.bulk_create_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME, max_in_flight=5))
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert result["result"]["succeeded"] == 25 and result["result"]["retries"] == 0
+
+    connections = {f"aio_conn_{index}": {"conn_type": "http", "host": "example.com"} for index in range(10)}
+    result = asyncio.run(aio.bulk_create_connections(connections, "dev", "us", MWAA_ENVIRONMENT_NAME))
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert {item["connection_id"] for item in result["result"]["items"]} == set(connections)
+
+
+def test_throttled_writes_are_retried_after_retry_after():
+    """Throttles carrying Retry-After slow the shared limiter and are retried until they succeed"""
+    RateLimitUtils.reset_rate_limiters()
+    _mwaa_app.state.faults.update(throttle_rate=0.3, retry_after_seconds=0.05)
+    try:
+        variables = {f"aio_throttled_{index}": str(index) for index in range(15)}
+        result = asyncio.run(aio.bulk_create_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME,
+                                                       max_retries=10))
+    finally:
+        _mwaa_app.state.faults.update(throttle_rate=0.0, retry_after_seconds=0.0)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    stats = next(iter(RateLimitUtils.get_rate_limiter_stats().values()))
+    assert stats["throttles"] == result["result"]["retries"] > 0
+
+
+def test_retry_after_on_server_error_is_honored():
+    """A 500 carrying Retry-After delays each retry of the async path too"""
+    _mwaa_app.state.faults.update(error_rate=1.0, error_status_code=500, retry_after_seconds=0.2)
+    try:
+        started = time.monotonic()
+        result = asyncio.run(aio.create_variable("aio_error", "1", "dev", "us", MWAA_ENVIRONMENT_NAME,
+                                                 max_retries=2))
+        elapsed = time.monotonic() - started
+    finally:
+        _mwaa_app.state.faults.update(error_rate=0.0, error_status_code=503, retry_after_seconds=0.0)
+    assert result["status"] == CommonUtilsConstants.FAILED_KEY and result["error"] == "API returned status 500"
+    assert elapsed >= 0.4, elapsed
+
+
+def test_long_fan_out_signs_with_renewed_credentials():
+    """Credentials renewed during a fan-out are used for the requests that follow"""
+    serial = count()
+
+    def mint():
+        return {"access_key": f"ASIARENEWED{next(serial):05d}", "secret_key": "secret", "token": "token",
+                "expiry_time": (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat()}
+
+    # Inside the advisory window from the start, so every freeze renews the credentials
+    credentials = RefreshableCredentials.create_from_metadata(mint(), mint, "test", advisory_timeout=3600,
+                                                              mandatory_timeout=0)
+    signed_with = []
+
+    async def record(request):
+        signed_with.append(request.headers["Authorization"].split("Credential=")[1].split("/")[0])
+
+    async def run():
+        async with httpx.AsyncClient(event_hooks={"request": [record]}) as client:
+            variables = {f"aio_renewed_{index}": str(index) for index in range(5)}
+            return await aio.bulk_create_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME,
+                                                   http_client=client)
+
+    get_aws_credentials = CommonUtils.get_aws_credentials
+    CommonUtils.get_aws_credentials = lambda environment: credentials
+    try:
+        result = asyncio.run(run())
+    finally:
+        CommonUtils.get_aws_credentials = get_aws_credentials
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert len(signed_with) == 5 and len(set(signed_with)) == 5, signed_with
+
+
+def main():
+    """Run all tests"""
+    tests = [
+        test_list_environments,
+        test_create_variable_and_connection,
+        test_bulk_variables_and_connections,
+        test_throttled_writes_are_retried_after_retry_after,
+        test_retry_after_on_server_error_is_honored,
+        test_long_fan_out_signs_with_renewed_credentials,
+    ]
+    setup_module()
+    passed = 0
+    try:
+        for test in tests:
+            try:
+                test()
+                print(f"✅ {test.__name__}")
+                passed += 1
+            except AssertionError as e:
+                print(f"❌ {test.__name__}: {e}")
+    finally:
+        teardown_module()
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
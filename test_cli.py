@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the mwaa-migrate command line against the local fake MWAA and Vault servers
+Run this from the project root directory (pytest or directly)
+"""
+
+import sys
+import os
+import io
+import json
+import subprocess
+import tempfile
+from contextlib import ExitStack
+
+# Add src to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from cli import main
+from fakes import create_mwaa_app, create_vault_app, serve, write_local_config
+
+MWAA_ENVIRONMENT_NAME = "MWAA1USVGA00000D000"
+TARGET = ["-e", "dev", "-r", "us", "-n", MWAA_ENVIRONMENT_NAME]
+
+_stack = ExitStack()
+_mwaa_app = create_mwaa_app()
+_work_dir = None
+
+
+def setup_module(module=None):
+    """Start the fake servers and point the utilities at them"""
+    global _work_dir
+    from utils import CommonUtils, CommonUtilsConstants
+    mwaa_url = _stack.enter_context(serve(_mwaa_app))
+    vault_url = _stack.enter_context(serve(create_vault_app()))
+    _work_dir = _stack.enter_context(tempfile.TemporaryDirectory())
+    os.environ[CommonUtilsConstants.CONFIG_FILE_PATH_ENV] = write_local_config(
+        os.path.join(_work_dir, "config.json"), mwaa_url, vault_url
+    )
+    CommonUtils.get_config(force_reload=True)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+
+
+def teardown_module(module=None):
+    """Stop the fake servers"""
+    from utils import CommonUtils, CommonUtilsConstants, RateLimitUtils
+    from airflow import AirflowUtils
+    AirflowUtils.set_mwaa_rate_limit()
+    RateLimitUtils.reset_rate_limiters()
+    os.environ.pop(CommonUtilsConstants.CONFIG_FILE_PATH_ENV, None)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+    _stack.close()
+
+
+def _run(*argv):
+    """Run the CLI in-process and return (exit code, output)"""
+    stream = io.StringIO()
+    return main(list(argv) + ["--log-level", "OFF"], stream), stream.getvalue()
+
+
+def test_help_does_not_import_aws_libraries():
+    """--help and usage errors never load boto3, hvac or the utilities"""
+    script = ("import sys; sys.argv = ['mwaa-migrate', 'list', '--help']; from cli import main\n"
+              "try:\n    main()\nexcept SystemExit:\n    pass\n"
+              "print(sorted(m for m in ('boto3', 'hvac', 'utils', 'airflow') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                            cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')).stdout
+    assert output.strip().endswith("[]"), output
+    assert main(["push-vars"], io.StringIO()) == 2
+
+
+def test_push_sync_and_list():
+    """push-vars writes every variable, sync --dry-run then reports nothing to change"""
+    variables_file = os.path.join(_work_dir, "variables.json")
+    with open(variables_file, "w", encoding="utf-8") as handle:
+        json.dump({f"cli_{index}": str(index) for index in range(5)}, handle)
+
+    code, output = _run("push-vars", variables_file, *TARGET, "--output", "ndjson", "--rate", "50")
+    lines = [json.loads(line) for line in output.splitlines()]
+    assert code == 0 and len(lines) == 6 and lines[-1]["type"] == "summary"
+
+    code, output = _run("sync", "vars", variables_file, *TARGET, "--dry-run")
+    result = json.loads(output)
+    assert code == 0 and result["result"]["dry_run"] and result["result"]["unchanged"] == 5
+
+    code, output = _run("list", "-e", "dev", "-r", "us", "--output", "ndjson")
+    assert code == 0 and len(output.splitlines()) == len(_mwaa_app.state.environments) + 1
+
+
+def test_sync_masked_variables_needs_overwrite():
+    """sync exits non-zero while a masked variable is left unwritten, and --overwrite-masked writes it"""
+    variables_file = os.path.join(_work_dir, "secrets.json")
+    with open(variables_file, "w", encoding="utf-8") as handle:
+        json.dump({"cli_api_key": "first"}, handle)
+    code, output = _run("sync", "vars", variables_file, *TARGET)
+    assert code == 0, output
+
+    with open(variables_file, "w", encoding="utf-8") as handle:
+        json.dump({"cli_api_key": "second"}, handle)
+    code, output = _run("sync", "vars", variables_file, *TARGET)
+    assert code == 1 and json.loads(output)["result"]["masked"] == ["cli_api_key"]
+    code, output = _run("sync", "vars", variables_file, *TARGET, "--overwrite-masked")
+    assert code == 0, output
+    assert _mwaa_app.state.airflow[MWAA_ENVIRONMENT_NAME].variables["cli_api_key"]["value"] == "second"
+
+
+def test_snapshot_and_restore_dry_run():
+    """A snapshot written by the CLI can be verified without touching the target"""
+    snapshot_file = os.path.join(_work_dir, "snapshot.jsonl.gz")
+    code, output = _run("snapshot", snapshot_file, *TARGET)
+    assert code == 0, output
+    calls = _mwaa_app.state.stats["invoke_rest_api"]
+    code, output = _run("restore", snapshot_file, *TARGET, "--dry-run", "--types", "pool")
+    assert code == 0 and json.loads(output)["result"]["counts"] == {"pool": 1}
+    assert _mwaa_app.state.stats["invoke_rest_api"] == calls
+
+
+def main_tests():
+    """Run all tests"""
+    tests = [test_help_does_not_import_aws_libraries, test_push_sync_and_list, test_sync_masked_variables_needs_overwrite,
+             test_snapshot_and_restore_dry_run]
+    setup_module()
+    passed = 0
+    try:
+        for test in tests:
+            try:
+                test()
+                print(f"✅ {test.__name__}")
+                passed += 1
+            except AssertionError as e:
+                print(f"❌ {test.__name__}: {e}")
+    finally:
+        teardown_module()
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main_tests()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Offline tests for AirflowDeployUtils against the local fake MWAA, S3 and Vault servers
+Run this from the project root directory (pytest or directly)
+"""
+
+import sys
+import os
+import tempfile
+from contextlib import ExitStack
+
+# Add src to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fakes import create_mwaa_app, create_s3_app, create_vault_app, serve, write_local_config
+from utils import CommonUtils, CommonUtilsConstants
+from airflow import AirflowDeployUtils
+
+MWAA_ENVIRONMENT_NAME = "MWAA1USVGA00000D000"
+
+_stack = ExitStack()
+_mwaa_app = create_mwaa_app()
+_s3_app = create_s3_app()
+_work_dir = None
+
+
+def setup_module(module=None):
+    """Start the fake servers and point CommonUtils at them"""
+    global _work_dir
+    mwaa_url = _stack.enter_context(serve(_mwaa_app))
+    vault_url = _stack.enter_context(serve(create_vault_app()))
+    s3_url = _stack.enter_context(serve(_s3_app))
+    _work_dir = _stack.enter_context(tempfile.TemporaryDirectory())
+    os.environ[CommonUtilsConstants.CONFIG_FILE_PATH_ENV] = write_local_config(
+        os.path.join(_work_dir, "config.json"), mwaa_url, vault_url, s3_url=s3_url
+    )
+    CommonUtils.get_config(force_reload=True)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+
+
+def teardown_module(module=None):
+    """Stop the fake servers"""
+    os.environ.pop(CommonUtilsConstants.CONFIG_FILE_PATH_ENV, None)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+    _stack.close()
+
+
+def _write(path, content):
+    """Write a file, creating its folder"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.write(content)
+
+
+def test_sync_dags_uploads_only_changes():
+    """A repeat push uploads nothing; edits, additions and removals move only those files"""
+    dag_dir = os.path.join(_work_dir, "dags")
+    for index in range(30):
+        _write(os.path.join(dag_dir, f"team_{index % 3}", f"dag_{index}.py"), f"# dag {index}\n".encode())
+    _write(os.path.join(dag_dir, "data", "large.bin"), os.urandom(9 * 1024 * 1024))
+    _write(os.path.join(dag_dir, "__pycache__", "dag_0.cpython-311.pyc"), b"compiled")
+
+    result = AirflowDeployUtils.sync_dags(dag_dir, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert len(result["result"]["uploaded"]) == 31 and result["result"]["prefix"] == "dags/"
+    assert _s3_app.state.stats["complete_multipart_upload"] == 1
+
+    _s3_app.state.stats.clear()
+    result = AirflowDeployUtils.sync_dags(dag_dir, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert result["result"]["uploaded"] == [] and result["result"]["unchanged"] == 31
+    assert not _s3_app.state.stats["put_object"] and not _s3_app.state.stats["upload_part"]
+
+    _write(os.path.join(dag_dir, "team_0", "dag_0.py"), b"# changed\n")
+    _write(os.path.join(dag_dir, "team_1", "dag_new.py"), b"# new\n")
+    os.remove(os.path.join(dag_dir, "team_2", "dag_2.py"))
+    dry_run = AirflowDeployUtils.sync_dags(dag_dir, "dev", "us", MWAA_ENVIRONMENT_NAME, dry_run=True)
+    result = AirflowDeployUtils.sync_dags(dag_dir, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert dry_run["result"]["uploaded"] == result["result"]["uploaded"]
+    assert sorted(result["result"]["uploaded"]) == ["team_0/dag_0.py", "team_1/dag_new.py"]
+    assert result["result"]["deleted"] == ["team_2/dag_2.py"]
+
+
+def test_failed_upload_is_retried_next_run():
+    """A file whose upload failed is not recorded as uploaded, so the next sync uploads it"""
+    dag_dir = os.path.join(_work_dir, "retry_dags")
+    _write(os.path.join(dag_dir, "dag.py"), b"# version 1\n")
+    assert AirflowDeployUtils.sync_dags(dag_dir, "dev", "us", MWAA_ENVIRONMENT_NAME)["status"] == \
+        CommonUtilsConstants.SUCCESS_KEY
+
+    _write(os.path.join(dag_dir, "dag.py"), b"# version 2\n")
+    upload = AirflowDeployUtils._upload
+
+    def failing_upload(*args, **kwargs):
+        raise Exception("injected upload failure")
+
+    AirflowDeployUtils._upload = failing_upload
+    try:
+        result = AirflowDeployUtils.sync_dags(dag_dir, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    finally:
+        AirflowDeployUtils._upload = upload
+    assert result["status"] == CommonUtilsConstants.FAILED_KEY and result["result"]["failed"][0]["path"] == "dag.py"
+
+    result = AirflowDeployUtils.sync_dags(dag_dir, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert result["result"]["uploaded"] == ["dag.py"] and result["result"]["unchanged"] == 0, result
+
+
+def test_manifest_covers_non_md5_etags():
+    """An object whose ETag is not its MD5 (e.g. SSE-KMS) is matched through the manifest"""
+    local = {"size": 3, "md5": "a" * 32, "etag": "a" * 32}
+    remote = {"size": 3, "etag": "kms-etag"}
+    assert not AirflowDeployUtils._unchanged(local, remote, None)
+    assert AirflowDeployUtils._unchanged(local, remote, {"md5": "a" * 32, "etag": "kms-etag"})
+    assert not AirflowDeployUtils._unchanged(local, remote, {"md5": "b" * 32, "etag": "kms-etag"})
+
+
+def test_plugins_zip_is_reproducible():
+    """Rebuilding unchanged plugins gives identical bytes and hash, whatever the file timestamps"""
+    plugins_dir = os.path.join(_work_dir, "zip_plugins")
+    _write(os.path.join(plugins_dir, "operators", "custom.py"), b"# operator\n")
+    _write(os.path.join(plugins_dir, "__init__.py"), b"")
+    first = AirflowDeployUtils.build_plugins_zip(plugins_dir, os.path.join(_work_dir, "first.zip"))
+    os.utime(os.path.join(plugins_dir, "__init__.py"), (1, 1))
+    second = AirflowDeployUtils.build_plugins_zip(plugins_dir, os.path.join(_work_dir, "second.zip"))
+    assert first["sha256"] == second["sha256"] and first["files"] == 2
+    with open(first["path"], "rb") as one, open(second["path"], "rb") as two:
+        assert one.read() == two.read()
+
+
+def test_deploy_artifacts_skips_unchanged_content():
+    """A repeat deploy uploads nothing and does not update the environment; a change updates only its fields"""
+    plugins_dir = os.path.join(_work_dir, "plugins")
+    requirements = os.path.join(_work_dir, "requirements.txt")
+    _write(os.path.join(plugins_dir, "hooks", "hook.py"), b"# hook\n")
+    _write(requirements, b"apache-airflow-providers-amazon\n")
+
+    result = AirflowDeployUtils.deploy_artifacts("dev", "us", MWAA_ENVIRONMENT_NAME, plugins_dir, requirements)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert result["result"]["environment_updated"]
+    assert set(result["result"]["update_fields"]) == {"PluginsS3Path", "PluginsS3ObjectVersion",
+                                                      "RequirementsS3Path", "RequirementsS3ObjectVersion"}
+    environment = _mwaa_app.state.environments[MWAA_ENVIRONMENT_NAME]
+    assert environment["PluginsS3ObjectVersion"] == result["result"]["plugins"]["version"]
+
+    _s3_app.state.stats.clear()
+    _mwaa_app.state.stats.clear()
+    result = AirflowDeployUtils.deploy_artifacts("dev", "us", MWAA_ENVIRONMENT_NAME, plugins_dir, requirements)
+    assert result["result"]["plugins"]["action"] == result["result"]["requirements"]["action"] == "unchanged"
+    assert not result["result"]["environment_updated"] and not result["result"]["update_fields"]
+    assert not _s3_app.state.stats["put_object"] and not _mwaa_app.state.stats["update_environment"]
+
+    _write(os.path.join(plugins_dir, "hooks", "hook.py"), b"# hook v2\n")
+    result = AirflowDeployUtils.deploy_artifacts("dev", "us", MWAA_ENVIRONMENT_NAME, plugins_dir, requirements)
+    assert result["result"]["plugins"]["action"] == "uploaded"
+    assert set(result["result"]["update_fields"]) == {"PluginsS3Path", "PluginsS3ObjectVersion"}
+    assert _mwaa_app.state.stats["update_environment"] == 1
+
+
+def main():
+    """Run all tests"""
+    tests = [test_sync_dags_uploads_only_changes, test_failed_upload_is_retried_next_run,
+             test_manifest_covers_non_md5_etags,
+             test_plugins_zip_is_reproducible, test_deploy_artifacts_skips_unchanged_content]
+    setup_module()
+    passed = 0
+    try:
+        for test in tests:
+            try:
+                test()
+                print(f"✅ {test.__name__}")
+                passed += 1
+            except AssertionError as e:
+                print(f"❌ {test.__name__}: {e}")
+    finally:
+        teardown_module()
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
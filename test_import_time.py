@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for the utils and airflow packages, measured with python -X importtime
+Run this from the project root directory (pytest or directly)
+"""
+
+import sys
+import os
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+HEAVY_MODULES = ("boto3", "botocore", "hvac", "yaml", "httpx")
+
+# Measured around 16ms and 35ms; the budgets leave headroom for slower CI machines
+CONSTANTS_BUDGET_MS = 60
+AIRFLOW_UTILS_BUDGET_MS = 100
+RUNS = 3
+
+
+def _import_times(statement):
+    """Self time in microseconds of every module imported by running statement in a fresh interpreter"""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True,
+                            text=True, check=True, cwd=SRC_DIR).stderr
+    times = {}
+    for line in stderr.splitlines():
+        fields = line[len("import time:"):].split("|") if line.startswith("import time:") else []
+        if len(fields) == 3 and fields[0].strip().isdigit():
+            times[fields[2].strip()] = int(fields[0])
+    return times
+
+
+def _measure(statement):
+    """(milliseconds spent importing modules beyond interpreter startup, modules imported), best of RUNS"""
+    startup = _import_times("pass")
+    best = None
+    for _ in range(RUNS):
+        added = {name: micros for name, micros in _import_times(statement).items() if name not in startup}
+        if best is None or sum(added.values()) < sum(best.values()):
+            best = added
+    return sum(best.values()) / 1000, set(best)
+
+
+def test_constants_and_logger_are_cheap():
+    """Constants, the logger and get_aws_region never load the AWS or Vault SDKs"""
+    elapsed_ms, modules = _measure(
+        "from airflow import AirflowUtilsConstants; from utils import CommonUtilsConstants, get_logger, "
+        "get_aws_region"
+    )
+    assert not [name for name in modules if name.split(".")[0] in HEAVY_MODULES], sorted(modules)
+    assert elapsed_ms < CONSTANTS_BUDGET_MS, f"{elapsed_ms}ms"
+
+
+def test_airflow_utils_defers_sdks():
+    """AirflowUtils loads boto3/botocore/hvac only when the first client is built"""
+    elapsed_ms, modules = _measure("from airflow import AirflowUtils, create_variable")
+    assert not [name for name in modules if name.split(".")[0] in HEAVY_MODULES], sorted(modules)
+    assert elapsed_ms < AIRFLOW_UTILS_BUDGET_MS, f"{elapsed_ms}ms"
+
+
+def main():
+    """Run all tests"""
+    tests = [test_constants_and_logger_are_cheap, test_airflow_utils_defers_sdks]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
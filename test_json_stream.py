@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for JsonStreamUtils: incremental parsing of streamed JSON listings
+Run this from the project root directory (pytest or directly)
+"""
+
+import sys
+import os
+import io
+import json
+import tracemalloc
+
+# Add src to path so we can import our utils
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.JsonStreamUtils import iter_json_array, iter_json_response
+
+
+def _listing(count):
+    """An Airflow-style variables listing"""
+    return {"variables": [{"key": f"key_{index}", "value": f"välue {index}"} for index in range(count)],
+            "total_entries": count}
+
+
+def test_chunk_boundaries():
+    """Items and trailing members decode identically whatever the chunk size (including mid-character)"""
+    listing = _listing(50)
+    raw = json.dumps(listing, ensure_ascii=False).encode("utf-8")
+    for size in (1, 3, 64, len(raw)):
+        fields = {}
+        chunks = [raw[start:start + size] for start in range(0, len(raw), size)]
+        assert list(iter_json_array(chunks, "variables", fields)) == listing["variables"], size
+        assert fields == {"total_entries": 50}, size
+    assert list(iter_json_response(io.BytesIO(raw), "variables")) == listing["variables"]
+    assert list(iter_json_response(listing, "variables")) == listing["variables"]
+
+
+def test_truncated_stream_raises():
+    """A cut-off body is an error, not a short listing"""
+    raw = json.dumps(_listing(10)).encode("utf-8")
+    try:
+        list(iter_json_array([raw[:len(raw) // 2]], "variables"))
+    except ValueError:
+        return
+    raise AssertionError("truncated stream was accepted")
+
+
+def test_memory_stays_bounded():
+    """Parsing a large streamed listing holds only the current chunk and item"""
+    count = 20000
+
+    def chunks():
+        yield b'{"variables": ['
+        for index in range(count):
+            yield (b"," if index else b"") + json.dumps({"key": f"key_{index}", "value": "x" * 64}).encode()
+        yield b'], "total_entries": %d}' % count
+
+    tracemalloc.start()
+    try:
+        seen = sum(1 for _ in iter_json_array(chunks(), "variables"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert seen == count
+    assert peak < 256 * 1024, f"peak {peak} bytes"
+
+
+def main():
+    """Run all tests"""
+    tests = [test_chunk_boundaries, test_truncated_stream_raises, test_memory_stays_bounded]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
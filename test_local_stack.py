@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Offline tests for CommonUtils and AirflowUtils against the local fake MWAA and Vault servers.
+No network, Vault or AWS credentials needed. Run from the project root (pytest or directly).
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+# Add src to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fakes import create_mwaa_app, create_vault_app, serve, write_local_config
+from utils import CommonUtils, CommonUtilsConstants, RateLimitUtils
+from airflow import AirflowUtils, AirflowUtilsConstants
+
+MWAA_ENVIRONMENT_NAME = "MWAA1USVGA00000D000"
+
+_stack = ExitStack()
+_mwaa_app = create_mwaa_app(environment_count=30)
+_vault_app = create_vault_app(secrets={"kv/ODPE/harness": {"x-api-key": "local-key"}})
+
+
+def setup_module(module=None):
+    """Start the fake servers and point CommonUtils at them"""
+    mwaa_url = _stack.enter_context(serve(_mwaa_app))
+    vault_url = _stack.enter_context(serve(_vault_app))
+    config_dir = _stack.enter_context(tempfile.TemporaryDirectory())
+    os.environ[CommonUtilsConstants.CONFIG_FILE_PATH_ENV] = write_local_config(
+        os.path.join(config_dir, "config.json"), mwaa_url, vault_url
+    )
+    CommonUtils.get_config(force_reload=True)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+    RateLimitUtils.reset_rate_limiters()
+
+
+def teardown_module(module=None):
+    """Stop the fake servers"""
+    os.environ.pop(CommonUtilsConstants.CONFIG_FILE_PATH_ENV, None)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+    _stack.close()
+
+
+def test_vault_login_is_cached():
+    """Repeated client_auth calls reuse one Vault login"""
+    for _ in range(5):
+        assert CommonUtils.client_auth()
+    assert _vault_app.state.stats["logins"] == 1
+    assert CommonUtils.get_vault_auth_stats()[CommonUtilsConstants.VAULT_LOGINS_SAVED_KEY] >= 4
+
+
+def test_read_secret_cached():
+    """Secrets are read once and then served from the cache"""
+    CommonUtils.invalidate_secret()
+    reads = _vault_app.state.stats["secret_reads"]
+    for _ in range(3):
+        assert CommonUtils.read_secret(CommonUtilsConstants.HARNESS_SECRET_PATH, "dev") == {"x-api-key": "local-key"}
+    assert _vault_app.state.stats["secret_reads"] == reads + 1
+    assert CommonUtils.read_secret("ODPE/missing", "dev") is False
+
+
+def test_list_all_mwaa_environments():
+    """Listing follows pagination and keeps order"""
+    response = AirflowUtils.list_all_mwaa_environments("dev", "us")
+    assert response["status"] == CommonUtilsConstants.SUCCESS_KEY
+    names = [env["name"] for env in response["result"]["environments"]]
+    assert names == list(_mwaa_app.state.environments)
+    assert response["result"]["environments"][0]["status"] == "AVAILABLE"
+    assert _mwaa_app.state.stats["list_environments"] >= 2
+
+
+def test_clients_and_credentials_are_pooled():
+    """Many calls share one credential mint and one client per (service, environment, region)"""
+    mints = _vault_app.state.stats["credential_mints"]
+    for _ in range(5):
+        CommonUtils.get_boto3_client("mwaa", "dev", "us")
+    assert _vault_app.state.stats["credential_mints"] == mints
+    assert CommonUtils.get_client_pool_stats()[CommonUtilsConstants.CLIENTS_CREATED_KEY] >= 1
+
+
+def test_slow_mint_does_not_block_other_environments():
+    """A credential mint in progress for one environment holds no lock another environment needs"""
+    CommonUtils.clear_client_pool()
+    mint = CommonUtils._mint_aws_credentials
+    dev_minting, release_dev = threading.Event(), threading.Event()
+
+    def slow_mint(environment):
+        if environment == "dev":
+            dev_minting.set()
+            release_dev.wait(10)
+        return mint(environment)
+
+    CommonUtils._mint_aws_credentials = slow_mint
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            dev_clients = [pool.submit(CommonUtils.get_boto3_client, "mwaa", "dev", "us") for _ in range(3)]
+            assert dev_minting.wait(5)
+            started = time.monotonic()
+            CommonUtils.get_boto3_client("mwaa", "tst", "us")
+            assert time.monotonic() - started < 2.0 and not release_dev.is_set()
+            release_dev.set()
+            assert len({id(future.result()) for future in dev_clients}) == 1
+    finally:
+        release_dev.set()
+        CommonUtils._mint_aws_credentials = mint
+    assert CommonUtils.get_client_pool_stats()[CommonUtilsConstants.CREDENTIAL_MINTS_KEY] >= 2
+
+
+def test_create_variable_and_connection():
+    """Single variable and connection writes succeed"""
+    result = AirflowUtils.create_variable("test_key", "test_value", "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY
+    result = AirflowUtils.create_connection(
+        "test_conn_01", "postgres", "Test connection", "db.example.com", "user", "password",
+        "public", 5432, "", "dev", "us", MWAA_ENVIRONMENT_NAME
+    )
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY
+    stored = _mwaa_app.state.airflow[MWAA_ENVIRONMENT_NAME].connections["test_conn_01"]
+    assert stored["host"] == "db.example.com"
+
+
+def test_bulk_and_sync_variables():
+    """Bulk push creates everything; a repeat sync sends no writes"""
+    variables = {f"bulk_{index}": {"index": index} for index in range(50)}
+    result = AirflowUtils.bulk_create_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME, max_in_flight=10)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY
+    assert result["result"]["succeeded"] == 50
+
+    calls = _mwaa_app.state.stats["invoke_rest_api"]
+    result = AirflowUtils.sync_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY
+    assert result["result"]["created"] == [] and result["result"]["updated"] == []
+    assert _mwaa_app.state.stats["invoke_rest_api"] - calls == 1
+
+
+def test_sync_leaves_masked_variables_alone():
+    """Sensitive variables come back masked; sync reports them as unverified instead of re-sending them every run"""
+    variables = {"db_password": "s3cret", "plain_setting": "1"}
+    result = AirflowUtils.sync_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert sorted(result["result"]["created"]) == sorted(variables)
+
+    calls = _mwaa_app.state.stats["invoke_rest_api"]
+    result = AirflowUtils.sync_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.FAILED_KEY and "masked" in result["error"]
+    assert result["result"]["updated"] == [] and result["result"]["masked"] == ["db_password"]
+    assert result["result"]["unchanged"] == 1 and result["result"]["failed"] == 0
+    assert _mwaa_app.state.stats["invoke_rest_api"] - calls == 1
+
+
+def test_sync_overwrites_changed_masked_value_on_request():
+    """A changed value of a masked variable is only written with overwrite_masked"""
+    variables = {"db_password": "rotated", "plain_setting": "1"}
+    stored = _mwaa_app.state.airflow[MWAA_ENVIRONMENT_NAME].variables
+    result = AirflowUtils.sync_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.FAILED_KEY
+    assert result["result"]["masked"] == ["db_password"] and stored["db_password"]["value"] == "s3cret"
+
+    result = AirflowUtils.sync_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME, overwrite_masked=True)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert result["result"]["updated"] == ["db_password"] and result["result"]["masked"] == []
+    assert stored["db_password"]["value"] == "rotated"
+
+
+def test_listing_follows_pagination():
+    """Collections larger than a page are listed completely, one request per page"""
+    variables = {f"page_{index}": str(index) for index in range(23)}
+    AirflowUtils.bulk_create_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME)
+    mwaa_client = CommonUtils.get_boto3_client("mwaa", "dev", "us")
+    calls = _mwaa_app.state.stats["invoke_rest_api"]
+    listed = {variable["key"] for variable in AirflowUtils._iter_rest_collection(
+        mwaa_client, MWAA_ENVIRONMENT_NAME, "/variables", "variables", page_size=5)}
+    assert set(variables) <= listed
+    assert _mwaa_app.state.stats["invoke_rest_api"] - calls == len(listed) // 5 + 1
+
+
+def test_bulk_connections_retry_throttling():
+    """Throttled connection writes are retried until they succeed"""
+    connections = {f"conn_{index}": {"conn_type": "http", "host": "example.com"} for index in range(10)}
+    _mwaa_app.state.faults["throttle_rate"] = 0.2
+    try:
+        result = AirflowUtils.bulk_create_connections(connections, "dev", "us", MWAA_ENVIRONMENT_NAME,
+                                                      max_workers=5, max_retries=10)
+    finally:
+        _mwaa_app.state.faults["throttle_rate"] = 0.0
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert result["result"]["succeeded"] == 10
+
+
+def test_retry_after_slows_shared_limiter():
+    """A throttle with Retry-After cuts the environment's rate and pauses it before the next request"""
+    RateLimitUtils.reset_rate_limiters()
+    limiter = RateLimitUtils.AdaptiveRateLimiter(rate=10, burst=1, min_rate=1, max_rate=10)
+    limiter.on_throttle(retry_after=0.3)
+    limiter.on_throttle(retry_after=0.3)
+    assert limiter.rate == 5 and limiter.stats()["rate_decreases"] == 1
+    assert limiter.reserve() >= 0.25
+    assert RateLimitUtils.parse_retry_after("2") == 2.0 and RateLimitUtils.parse_retry_after("soon") is None
+
+    _mwaa_app.state.faults.update(throttle_rate=0.3, retry_after_seconds=0.05)
+    try:
+        variables = {f"limited_{index}": str(index) for index in range(10)}
+        result = AirflowUtils.bulk_create_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME, max_retries=10)
+    finally:
+        _mwaa_app.state.faults.update(throttle_rate=0.0, retry_after_seconds=0.0)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    stats = RateLimitUtils.get_rate_limiter_stats()
+    assert len(stats) == 1
+    assert next(iter(stats.values()))["acquired"] >= 10
+
+
+def test_retry_after_on_server_error_is_honored():
+    """A 500 carrying Retry-After delays the retry even though it does not slow the shared limiter"""
+    RateLimitUtils.reset_rate_limiters()
+    _mwaa_app.state.faults.update(error_rate=1.0, error_status_code=500, retry_after_seconds=0.2)
+    try:
+        started = time.monotonic()
+        result = AirflowUtils.create_variable("server_error", "1", "dev", "us", MWAA_ENVIRONMENT_NAME,
+                                              max_retries=2)
+        elapsed = time.monotonic() - started
+    finally:
+        _mwaa_app.state.faults.update(error_rate=0.0, error_status_code=503, retry_after_seconds=0.0)
+    assert result["status"] == CommonUtilsConstants.FAILED_KEY
+    assert elapsed >= 0.4, elapsed
+    assert next(iter(RateLimitUtils.get_rate_limiter_stats().values()))["throttles"] == 0
+
+
+def test_unthrottled_bulk_run_is_not_rate_limited():
+    """Without throttling the limiter slow-starts to its ceiling instead of crawling up additively"""
+    RateLimitUtils.reset_rate_limiters()
+    limiter = RateLimitUtils.AdaptiveRateLimiter(rate=20, burst=20, min_rate=0.5, max_rate=200)
+    for _ in range(30):
+        limiter.on_success()
+    assert limiter.rate == 200 and limiter.stats()["slow_start"]
+    limiter.on_throttle()
+    limiter.on_success()
+    assert limiter.rate == 100 + limiter.increase_step and not limiter.stats()["slow_start"]
+
+    variables = {f"unthrottled_{index}": str(index) for index in range(200)}
+    started = time.monotonic()
+    result = AirflowUtils.bulk_create_variables(variables, "dev", "us", MWAA_ENVIRONMENT_NAME, max_in_flight=10)
+    elapsed = time.monotonic() - started
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    stats = next(iter(RateLimitUtils.get_rate_limiter_stats().values()))
+    assert stats["throttles"] == 0 and stats["rate"] == AirflowUtilsConstants.MWAA_RATE_LIMIT_MAX
+    # With additive increase alone 200 requests would have taken roughly 6 seconds at about 20 per second
+    assert elapsed < 3.0, elapsed
+
+
+def test_metrics_per_operation():
+    """Instrumented calls are recorded per operation and target and exported in every format"""
+    from utils import MetricsUtils
+    events = []
+    MetricsUtils.reset_metrics()
+    MetricsUtils.add_metrics_hook(events.append)
+    MetricsUtils.enable_metrics()
+    try:
+        AirflowUtils.list_all_mwaa_environments("dev", "us")
+        AirflowUtils.create_variable("metrics_key", "value", "dev", "us", MWAA_ENVIRONMENT_NAME)
+    finally:
+        MetricsUtils.disable_metrics()
+        MetricsUtils.remove_metrics_hook(events.append)
+
+    operations = {(entry["operation"], entry["environment"], entry["region"]): entry
+                  for entry in MetricsUtils.get_metrics()["operations"]}
+    assert operations[("mwaa.get_environment", "dev", "us")]["calls"] == len(_mwaa_app.state.environments)
+    assert operations[("mwaa.invoke_rest_api", "dev", "us")]["request_bytes"] > 0
+    assert operations[("get_boto3_client", "dev", "us")]["errors"] == 0
+    assert events and {"operation", "elapsed_seconds", "success"} <= set(events[0])
+    assert 'dlp_calls_total{operation="mwaa.list_environments",environment="dev",region="us"}' in \
+        MetricsUtils.get_prometheus_metrics()
+    assert any('"Operation": "mwaa.invoke_rest_api"' in document for document in MetricsUtils.get_emf_metrics())
+
+    recorded = MetricsUtils.get_metrics()
+    AirflowUtils.create_variable("metrics_key", "value", "dev", "us", MWAA_ENVIRONMENT_NAME)
+    assert MetricsUtils.get_metrics() == recorded
+
+
+def main():
+    """Run all tests"""
+    tests = [
+        test_vault_login_is_cached,
+        test_read_secret_cached,
+        test_list_all_mwaa_environments,
+        test_clients_and_credentials_are_pooled,
+        test_slow_mint_does_not_block_other_environments,
+        test_create_variable_and_connection,
+        test_bulk_and_sync_variables,
+        test_sync_leaves_masked_variables_alone,
+        test_sync_overwrites_changed_masked_value_on_request,
+        test_listing_follows_pagination,
+        test_bulk_connections_retry_throttling,
+        test_retry_after_slows_shared_limiter,
+        test_retry_after_on_server_error_is_honored,
+        test_unthrottled_bulk_run_is_not_rate_limited,
+        test_metrics_per_operation,
+    ]
+    setup_module()
+    passed = 0
+    try:
+        for test in tests:
+            try:
+                test()
+                print(f"✅ {test.__name__}")
+                passed += 1
+            except AssertionError as e:
+                print(f"❌ {test.__name__}: {e}")
+    finally:
+        teardown_module()
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
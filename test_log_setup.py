@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the DLPLogSetup logger layer: redaction, JSON output and level gating
+Run this from the project root directory
+"""
+
+import sys
+import os
+import io
+import json
+
+# Add src to path so we can import our utils
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.DLPLogSetup import configure_logging, get_logger, redact
+
+
+class _ExplodingRepr:
+    """Fails the test if a log call formats its arguments"""
+
+    def __str__(self):
+        raise AssertionError("argument was formatted while logging was disabled")
+
+    __repr__ = __str__
+
+
+def test_redact():
+    """Secret fields are masked in dicts and in rendered strings"""
+    payload = {"connection_id": "db", "password": "hunter2", "extra": [{"Secret_Key": "abc"}]}
+    assert redact(payload) == {"connection_id": "db", "password": "***", "extra": [{"Secret_Key": "***"}]}
+    assert payload["password"] == "hunter2"
+    assert redact('{"password": "p\\"w", "host": "h"}') == '{"password": "***", "host": "h"}'
+    assert redact("login=u&password=hunter2") == "login=u&password=***"
+
+
+def test_logged_payloads_are_redacted():
+    """Payloads passed as log arguments never reach the output unmasked"""
+    stream = io.StringIO()
+    configure_logging(level="DEBUG", log_format="json", stream=stream)
+    get_logger("test").debug("payload %s", {"login": "u", "password": "hunter2"}, extra={"target": "dev"})
+    record = json.loads(stream.getvalue())
+    assert "hunter2" not in record["message"]
+    assert record["level"] == "DEBUG" and record["target"] == "dev"
+
+
+def test_disabled_logging_does_no_formatting():
+    """With logging OFF, nothing is formatted or written"""
+    stream = io.StringIO()
+    configure_logging(level="OFF", stream=stream)
+    logger = get_logger("test")
+    logger.error("value %s", _ExplodingRepr())
+    logger.debug("value %s", _ExplodingRepr())
+    assert stream.getvalue() == ""
+    configure_logging()
+
+
+def main():
+    """Run all tests"""
+    tests = [test_redact, test_logged_payloads_are_redacted, test_disabled_logging_does_no_formatting]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Offline tests for AirflowLogUtils against the local fake MWAA, CloudWatch Logs and Vault servers
+Run this from the project root directory (pytest or directly)
+"""
+
+import sys
+import os
+import io
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+# Add src to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fakes import create_logs_app, create_mwaa_app, create_vault_app, serve, write_local_config
+from utils import CommonUtils, CommonUtilsConstants
+from airflow import AirflowLogUtils, AirflowUtilsConstants
+from cli import main as cli_main
+
+MWAA_ENVIRONMENT_NAME = "MWAA1USVGA00000D000"
+EVENTS_PER_GROUP = 250
+
+_stack = ExitStack()
+_logs_app = create_logs_app()
+
+
+def setup_module(module=None):
+    """Start the fake servers, point CommonUtils at them and write an hour of logs to every group"""
+    mwaa_url = _stack.enter_context(serve(create_mwaa_app()))
+    vault_url = _stack.enter_context(serve(create_vault_app()))
+    logs_url = _stack.enter_context(serve(_logs_app))
+    work_dir = _stack.enter_context(tempfile.TemporaryDirectory())
+    os.environ[CommonUtilsConstants.CONFIG_FILE_PATH_ENV] = write_local_config(
+        os.path.join(work_dir, "config.json"), mwaa_url, vault_url, logs_url=logs_url
+    )
+    CommonUtils.get_config(force_reload=True)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+
+    now = int(time.time() * 1000)
+    for group in AirflowUtilsConstants.LOG_GROUPS:
+        for stream in ("stream-a", "stream-b"):
+            _put(group, stream, [(now - 3000 * 1000 + index * 1000, f"{group} {stream} {index}")
+                                 for index in range(EVENTS_PER_GROUP // 2)])
+        _put(group, "stream-a", [(now - 2 * 3600 * 1000, "too old")])
+
+
+def teardown_module(module=None):
+    """Stop the fake servers"""
+    os.environ.pop(CommonUtilsConstants.CONFIG_FILE_PATH_ENV, None)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+    _stack.close()
+
+
+def _put(group, stream, events):
+    """Write (timestamp, message) events to a log group of the test environment"""
+    CommonUtils.get_boto3_client("logs", "dev", "us").put_log_events(
+        logGroupName=f"airflow-{MWAA_ENVIRONMENT_NAME}-{group}", logStreamName=stream,
+        logEvents=[{"timestamp": timestamp, "message": message} for timestamp, message in events]
+    )
+
+
+def test_reads_all_groups_in_parallel():
+    """An hour of logs from the five groups streams through a small buffer, each group in time order"""
+    events = list(AirflowLogUtils.iter_log_events("dev", "us", MWAA_ENVIRONMENT_NAME, buffer_size=10))
+    assert len(events) == EVENTS_PER_GROUP * len(AirflowUtilsConstants.LOG_GROUPS)
+    assert not [event for event in events if event["message"] == "too old"]
+    for group in AirflowUtilsConstants.LOG_GROUPS:
+        timestamps = [event["timestamp"] for event in events if event["group"] == group]
+        assert timestamps == sorted(timestamps)
+
+
+def _next(events):
+    """Next event of a followed generator, failing instead of blocking forever"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        return executor.submit(next, events).result(timeout=10)
+    finally:
+        executor.shutdown(wait=False)
+
+
+def test_follow_tracks_seen_events():
+    """Tailing yields new events once, including late ones sharing or preceding the last timestamp"""
+    now = int(time.time() * 1000)
+    _put("Scheduler", "tail", [(now, "first"), (now + 1, "second")])
+    events = AirflowLogUtils.iter_log_events("dev", "us", MWAA_ENVIRONMENT_NAME, groups=["Scheduler"],
+                                             start_time=now, follow=True, poll_seconds=0.05)
+    try:
+        assert [_next(events)["message"] for _ in range(2)] == ["first", "second"]
+        _put("Scheduler", "tail", [(now + 1, "same timestamp"), (now + 2, "third")])
+        _put("Scheduler", "other", [(now, "late stream")])
+        received = sorted(_next(events)["message"] for _ in range(3))
+        assert received == ["late stream", "same timestamp", "third"]
+        _put("Scheduler", "tail", [(now + 3, "fourth")])
+        assert _next(events)["message"] == "fourth"
+        _put("Scheduler", "tail", [(now + 1, "late in stream")])
+        assert _next(events)["message"] == "late in stream"
+    finally:
+        events.close()
+
+
+def test_cli_logs():
+    """mwaa-migrate logs prints one JSON line per event and a summary"""
+    stream = io.StringIO()
+    exit_code = cli_main(["logs", "-e", "dev", "-r", "us", "-n", MWAA_ENVIRONMENT_NAME, "--groups", "Task",
+                          "--filter", "stream-b", "--since", "2h"], stream)
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert exit_code == 0 and lines[-1]["type"] == "summary"
+    assert lines[-1]["result"]["count"] == len(lines) - 1 == EVENTS_PER_GROUP // 2
+
+
+def main():
+    """Run all tests"""
+    tests = [test_reads_all_groups_in_parallel, test_follow_tracks_seen_events, test_cli_logs]
+    setup_module()
+    passed = 0
+    try:
+        for test in tests:
+            try:
+                test()
+                print(f"✅ {test.__name__}")
+                passed += 1
+            except AssertionError as e:
+                print(f"❌ {test.__name__}: {e}")
+    finally:
+        teardown_module()
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
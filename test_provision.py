@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Offline tests for AirflowProvisionUtils against the local fake MWAA and Vault servers
+Run this from the project root directory (pytest or directly)
+"""
+
+import sys
+import os
+import tempfile
+import time
+from contextlib import ExitStack
+
+# Add src to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fakes import FakeServerConstants, create_mwaa_app, create_vault_app, serve, write_local_config
+from utils import CommonUtils, CommonUtilsConstants
+from airflow import AirflowProvisionUtils, AirflowUtilsConstants, AirflowWaitUtils
+
+EXISTING_ENVIRONMENT_NAME = "MWAA1USVGA00000D000"
+
+_stack = ExitStack()
+_mwaa_app = create_mwaa_app()
+
+
+def setup_module(module=None):
+    """Start the fake servers and point CommonUtils at them"""
+    mwaa_url = _stack.enter_context(serve(_mwaa_app))
+    vault_url = _stack.enter_context(serve(create_vault_app()))
+    work_dir = _stack.enter_context(tempfile.TemporaryDirectory())
+    os.environ[CommonUtilsConstants.CONFIG_FILE_PATH_ENV] = write_local_config(
+        os.path.join(work_dir, "config.json"), mwaa_url, vault_url
+    )
+    CommonUtils.get_config(force_reload=True)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+
+
+def teardown_module(module=None):
+    """Stop the fake servers"""
+    os.environ.pop(CommonUtilsConstants.CONFIG_FILE_PATH_ENV, None)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+    _stack.close()
+
+
+def _new_spec(apms_id, size="medium"):
+    """Spec of an environment the fake does not have yet"""
+    return {"environment": "dev", "region": "us", "size": size, "apms_id": f"APMS-{apms_id}", "sequence": "001",
+            "execution_role_arn": "arn:aws:iam::000000000000:role/mwaa-execution",
+            "source_bucket_arn": f"arn:aws:s3:::mwaa-{apms_id}", "tags": {"apms-id": apms_id}}
+
+
+def test_request_built_from_constants():
+    """Size, network, logging, maintenance window and access mode come from the constants"""
+    request = AirflowProvisionUtils.build_environment_request(_new_spec("12345", "large"))
+    assert request["Name"] == "MWAA1USVGA12345D001"
+    assert request["EnvironmentClass"] == "mw1.large"
+    network = AirflowUtilsConstants.REGION_DETAILS["us"]["network_configuration"]["dev"]
+    assert request["NetworkConfiguration"] == network
+    assert request["LoggingConfiguration"] == AirflowUtilsConstants.LOGGING_CONFIGURATIONS
+    assert request["WeeklyMaintenanceWindowStart"] == AirflowUtilsConstants.WEEKLY_MAINTENANCE_WINDOW_START
+    assert request["DagS3Path"] == "dags"
+
+
+def test_ensure_environments_sends_only_changes():
+    """New environments are created, an existing one gets only its differing fields, a rerun sends nothing"""
+    existing = {"environment": "dev", "region": "us", "size": "small", "name": EXISTING_ENVIRONMENT_NAME}
+    specs = [_new_spec("11111"), _new_spec("22222"), existing]
+
+    result = AirflowProvisionUtils.ensure_environments(specs)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert (result["result"]["created"], result["result"]["updated"]) == (2, 1)
+    update = result["result"]["environments"][2]
+    security_groups = AirflowUtilsConstants.REGION_DETAILS["us"]["network_configuration"]["dev"]["SecurityGroupIds"]
+    assert update["changes"] == {"MinWebservers": 2, "MaxWebservers": 2,
+                                 "NetworkConfiguration": {"SecurityGroupIds": security_groups}}
+    assert update["create_only_differences"] == ["SubnetIds"]
+    assert _mwaa_app.state.environments["MWAA1USVGA11111D001"]["Tags"] == {"apms-id": "11111"}
+
+    _mwaa_app.state.stats.clear()
+    result = AirflowProvisionUtils.ensure_environments(specs)
+    assert result["result"]["unchanged"] == 3, result
+    assert not _mwaa_app.state.stats["create_environment"] and not _mwaa_app.state.stats["update_environment"]
+    assert not _mwaa_app.state.stats["tag_resource"]
+
+
+def test_waiter_tracks_many_environments():
+    """Creates, a delete and a timed-out update are tracked together with few status calls"""
+    _mwaa_app.state.faults[FakeServerConstants.TRANSITION_SECONDS_KEY] = 0.4
+    try:
+        created = AirflowProvisionUtils.ensure_environments([_new_spec("33333"), _new_spec("44444")])
+        assert created["result"]["created"] == 2, created
+        updated = AirflowProvisionUtils.ensure_environment(
+            {"environment": "dev", "region": "us", "size": "large", "name": "MWAA1USVGA00000D001"})
+        assert updated["result"]["action"] == AirflowUtilsConstants.PROVISION_UPDATED, updated
+        CommonUtils.get_boto3_client("mwaa", "dev", "us").delete_environment(Name="MWAA1USVGA00000D002")
+
+        finished = []
+        _mwaa_app.state.stats.clear()
+        waiter = AirflowWaitUtils.EnvironmentWaiter(min_poll_seconds=0.05, max_poll_seconds=0.2)
+        for result in created["result"]["environments"]:
+            waiter.add("dev", "us", result["name"], callback=finished.append)
+        waiter.add("dev", "us", "MWAA1USVGA00000D001", timeout=0.1, callback=finished.append)
+        waiter.add("dev", "us", "MWAA1USVGA00000D002", target=AirflowUtilsConstants.STATUS_DELETED,
+                   callback=finished.append)
+        result = waiter.wait()
+    finally:
+        _mwaa_app.state.faults[FakeServerConstants.TRANSITION_SECONDS_KEY] = 0.0
+
+    assert (result["result"]["succeeded"], result["result"]["timed_out"]) == (3, 1), result
+    assert [entry["name"] for entry in finished][0] == "MWAA1USVGA00000D001"
+    assert "MWAA1USVGA00000D002" not in _mwaa_app.state.environments
+    # Deletions are settled from the listing, and polls back off while statuses stay the same
+    assert _mwaa_app.state.stats["get_environment"] <= 20 and _mwaa_app.state.stats["list_environments"] >= 1
+
+
+def test_waiter_requires_transition_after_update():
+    """A stale AVAILABLE is not success for an update that has not started; a finished one is"""
+    waiter = AirflowWaitUtils.EnvironmentWaiter(min_poll_seconds=0.05, max_poll_seconds=0.1)
+    waiter.add("dev", "us", EXISTING_ENVIRONMENT_NAME, timeout=0.3, require_transition=True, since=time.time())
+    waiter.add("dev", "us", EXISTING_ENVIRONMENT_NAME, timeout=0.3)
+    result = waiter.wait()
+    outcomes = [entry["outcome"] for entry in result["result"]["environments"]]
+    assert sorted(outcomes) == [AirflowUtilsConstants.WAIT_SUCCEEDED, AirflowUtilsConstants.WAIT_TIMED_OUT]
+
+    # The update finishes instantly in the fake, before the first poll: LastUpdate.CreatedAt shows it ran
+    spec = {"environment": "dev", "region": "us", "size": "medium", "name": EXISTING_ENVIRONMENT_NAME}
+    result = AirflowProvisionUtils.ensure_environments([spec], wait=True, timeout=5)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert result["result"]["updated"] == 1 and result["result"]["wait"]["succeeded"] == 1
+
+
+def test_busy_environment_is_not_tagged():
+    """Missing tags of an environment that is not AVAILABLE are deferred instead of sent"""
+    spec = {"environment": "dev", "region": "us", "size": "medium", "name": EXISTING_ENVIRONMENT_NAME,
+            "tags": {"owner": "provision-test"}}
+    _mwaa_app.state.environments[EXISTING_ENVIRONMENT_NAME]["Status"] = AirflowUtilsConstants.STATUS_UPDATING
+    _mwaa_app.state.stats.clear()
+    try:
+        result = AirflowProvisionUtils.ensure_environment(spec)
+    finally:
+        _mwaa_app.state.environments[EXISTING_ENVIRONMENT_NAME]["Status"] = "AVAILABLE"
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert result["result"]["tags"] == {} and result["result"]["deferred_tags"] == {"owner": "provision-test"}
+    assert not _mwaa_app.state.stats["tag_resource"]
+
+    result = AirflowProvisionUtils.ensure_environment(spec)
+    assert result["result"]["tags"] == {"owner": "provision-test"} and _mwaa_app.state.stats["tag_resource"] == 1
+
+
+def main():
+    """Run all tests"""
+    tests = [test_request_built_from_constants, test_ensure_environments_sends_only_changes,
+             test_waiter_tracks_many_environments, test_waiter_requires_transition_after_update,
+             test_busy_environment_is_not_tagged]
+    setup_module()
+    passed = 0
+    try:
+        for test in tests:
+            try:
+                test()
+                print(f"✅ {test.__name__}")
+                passed += 1
+            except AssertionError as e:
+                print(f"❌ {test.__name__}: {e}")
+    finally:
+        teardown_module()
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Offline tests for AirflowSnapshotUtils against the local fake MWAA and Vault servers
+Run this from the project root directory (pytest or directly)
+"""
+
+import sys
+import os
+import gzip
+import hashlib
+import json
+import tempfile
+from contextlib import ExitStack
+
+# Add src to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fakes import create_mwaa_app, create_vault_app, serve, write_local_config
+from utils import CommonUtils, CommonUtilsConstants
+from airflow import AirflowSnapshotUtils, AirflowUtils
+
+SOURCE_ENVIRONMENT_NAME = "MWAA1USVGA00000D000"
+TARGET_ENVIRONMENT_NAME = "MWAA1USVGA00001D000"
+SENSITIVE_VARIABLE_KEY = "db_password"
+
+_stack = ExitStack()
+_mwaa_app = create_mwaa_app(environment_names=[SOURCE_ENVIRONMENT_NAME, TARGET_ENVIRONMENT_NAME])
+_work_dir = None
+_snapshot_file = None
+
+
+def setup_module(module=None):
+    """Start the fake servers, seed the source environment and export it once"""
+    global _work_dir, _snapshot_file
+    mwaa_url = _stack.enter_context(serve(_mwaa_app))
+    vault_url = _stack.enter_context(serve(create_vault_app()))
+    _work_dir = _stack.enter_context(tempfile.TemporaryDirectory())
+    os.environ[CommonUtilsConstants.CONFIG_FILE_PATH_ENV] = write_local_config(
+        os.path.join(_work_dir, "config.json"), mwaa_url, vault_url
+    )
+    CommonUtils.get_config(force_reload=True)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+
+    variables = {f"snapshot_{index}": str(index) for index in range(20)}
+    variables[SENSITIVE_VARIABLE_KEY] = "source-secret"
+    result = AirflowUtils.bulk_create_variables(variables, "dev", "us", SOURCE_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    connections = {f"snapshot_conn_{index}": {"conn_type": "http", "host": "example.com"} for index in range(3)}
+    result = AirflowUtils.bulk_create_connections(connections, "dev", "us", SOURCE_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    _snapshot_file = os.path.join(_work_dir, "source.jsonl.gz")
+    result = AirflowSnapshotUtils.export_snapshot("dev", "us", SOURCE_ENVIRONMENT_NAME, _snapshot_file)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+
+
+def teardown_module(module=None):
+    """Stop the fake servers"""
+    os.environ.pop(CommonUtilsConstants.CONFIG_FILE_PATH_ENV, None)
+    CommonUtils.reset_vault_client()
+    CommonUtils.clear_client_pool()
+    _stack.close()
+
+
+def _rewrite(name, edit):
+    """Copy the exported snapshot with its lines passed through edit; return the new path"""
+    with gzip.open(_snapshot_file, "rt", encoding="utf-8") as source:
+        lines = source.readlines()
+    path = os.path.join(_work_dir, name)
+    with gzip.open(path, "wt", encoding="utf-8") as target:
+        target.writelines(edit(lines))
+    return path
+
+
+def _target_variables():
+    """Variables currently stored in the fake target environment"""
+    return dict(_mwaa_app.state.airflow[TARGET_ENVIRONMENT_NAME].variables)
+
+
+def test_import_replays_snapshot():
+    """A verified snapshot is replayed into another environment"""
+    assert AirflowSnapshotUtils.verify_snapshot(_snapshot_file)["variable"] == 20
+    result = AirflowSnapshotUtils.import_snapshot(_snapshot_file, "dev", "us", TARGET_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert result["result"]["counts"]["variable"] == {"succeeded": 20, "failed": 0}
+    assert result["result"]["counts"]["connection"] == {"succeeded": 3, "failed": 0}
+    assert result["result"]["counts"]["pool"]["succeeded"] == 1
+    assert _target_variables()["snapshot_7"]["value"] == "7"
+
+
+def test_repeat_restore_updates_existing_records():
+    """Restoring the same snapshot again updates the connections and pools it created the first time"""
+    connections = _mwaa_app.state.airflow[TARGET_ENVIRONMENT_NAME].connections
+    connections["snapshot_conn_0"]["host"] = "changed.example.com"
+    result = AirflowSnapshotUtils.import_snapshot(_snapshot_file, "dev", "us", TARGET_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert result["result"]["counts"]["connection"] == {"succeeded": 3, "failed": 0}
+    assert connections["snapshot_conn_0"]["host"] == "example.com"
+
+
+def test_masked_variables_are_not_exported():
+    """A sensitive variable read back masked is listed in the footer instead of being exported"""
+    with gzip.open(_snapshot_file, "rt", encoding="utf-8") as snapshot:
+        records = [json.loads(line) for line in snapshot]
+    assert records[-1]["masked"] == [SENSITIVE_VARIABLE_KEY]
+    assert all(record["data"]["key"] != SENSITIVE_VARIABLE_KEY for record in records[1:-1]
+               if record["type"] == "variable")
+
+
+def test_masked_values_never_overwrite_secrets():
+    """Restoring a snapshot holding a masked value leaves the target's secret unchanged and reports it"""
+    def add_masked(lines):
+        data = {"key": SENSITIVE_VARIABLE_KEY, "value": "***"}
+        records = [lines[1], json.dumps({"type": "variable", "data": data,
+                                         "sha256": AirflowSnapshotUtils._checksum(data)}) + "\n"] + lines[2:-1]
+        footer = json.loads(lines[-1])
+        footer["counts"]["variable"] += 1
+        footer["sha256"] = hashlib.sha256("".join(records).encode("utf-8")).hexdigest()
+        return [lines[0]] + records + [json.dumps(footer) + "\n"]
+
+    with_masked = _rewrite("masked.jsonl.gz", add_masked)
+    result = AirflowUtils.create_variable(SENSITIVE_VARIABLE_KEY, "target-secret", "dev", "us", TARGET_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    result = AirflowSnapshotUtils.import_snapshot(with_masked, "dev", "us", TARGET_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.SUCCESS_KEY, result["error"]
+    assert result["result"]["masked"] == [SENSITIVE_VARIABLE_KEY]
+    assert result["result"]["counts"]["variable"] == {"succeeded": 20, "failed": 0}
+    assert _target_variables()[SENSITIVE_VARIABLE_KEY]["value"] == "target-secret"
+
+
+def test_truncated_snapshot_is_rejected_before_writing():
+    """A snapshot cut off before its footer writes nothing and reports empty partial counts"""
+    truncated = _rewrite("truncated.jsonl.gz", lambda lines: lines[:-5])
+    _mwaa_app.state.airflow[TARGET_ENVIRONMENT_NAME].variables.clear()
+    result = AirflowSnapshotUtils.import_snapshot(truncated, "dev", "us", TARGET_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.FAILED_KEY and "truncated" in result["error"]
+    assert result["result"]["counts"]["variable"] == {"succeeded": 0, "failed": 0}
+    assert _target_variables() == {}
+
+
+def test_tampered_snapshot_is_rejected_before_writing():
+    """A record edited after export fails its checksum and nothing is written"""
+    def tamper(lines):
+        record = json.loads(lines[-2])
+        record["data"]["name"] = "tampered"
+        return lines[:-2] + [json.dumps(record) + "\n", lines[-1]]
+
+    tampered = _rewrite("tampered.jsonl.gz", tamper)
+    _mwaa_app.state.airflow[TARGET_ENVIRONMENT_NAME].variables.clear()
+    result = AirflowSnapshotUtils.import_snapshot(tampered, "dev", "us", TARGET_ENVIRONMENT_NAME)
+    assert result["status"] == CommonUtilsConstants.FAILED_KEY and "Checksum mismatch" in result["error"]
+    assert _target_variables() == {}
+
+
+def main():
+    """Run all tests"""
+    tests = [
+        test_import_replays_snapshot,
+        test_repeat_restore_updates_existing_records,
+        test_masked_variables_are_not_exported,
+        test_masked_values_never_overwrite_secrets,
+        test_truncated_snapshot_is_rejected_before_writing,
+        test_tampered_snapshot_is_rejected_before_writing,
+    ]
+    setup_module()
+    passed = 0
+    try:
+        for test in tests:
+            try:
+                test()
+                print(f"✅ {test.__name__}")
+                passed += 1
+            except AssertionError as e:
+                print(f"❌ {test.__name__}: {e}")
+    finally:
+        teardown_module()
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()